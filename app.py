@@ -1,5 +1,7 @@
 import streamlit as st
 
+from core.assets import LOGO_WIDTH, PROFILE_WIDTH, image_bytes
+
 def main():
     # Configure Page
     st.set_page_config(
@@ -9,14 +11,14 @@ def main():
         initial_sidebar_state="expanded",
     )
     
-    st.logo("images/rudra.png")
+    st.logo(image_bytes("images/rudra.png", LOGO_WIDTH))
     st.balloons()
 
     big_col1, big_col2 = st.columns([1, 2])
 
     with big_col1:
         # Display the image below the name
-        st.image("images/rudra.png", width=250, use_container_width=False)
+        st.image(image_bytes("images/rudra.png", PROFILE_WIDTH), width=PROFILE_WIDTH)
 
         # Profile Section
         st.markdown("""
@@ -0,0 +1,6 @@
+"""
+Standalone benchmarks. Run them from the repository root, e.g.
+``python -m benchmarks.classify_3v``,
+``python -m benchmarks.suite --output results.json --baseline baseline.json`` or
+``python -m benchmarks.coldstart --output coldstart.json``.
+"""
@@ -0,0 +1,122 @@
+"""
+Throughput of the batched 3x3 classifiers (float SVD and exact fraction-free) against the
+original per-system function.
+
+Both classifiers must agree with the original function on the integer systems, and the
+float one also on float rank-deficient systems (consistent and inconsistent, of rank 1 and
+2); the script exits with status 1 on any disagreement.
+
+The float classifier takes three batched SVDs per call (see `core.planes`). On a laptop it
+classifies about 150k systems/s, roughly 5x the original function; the exact one about
+450k/s. Throughput drops for batches that no longer fit in the CPU caches.
+
+Usage
+-----
+python -m benchmarks.classify_3v --sizes 1000 10000 100000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from core.exact import classify_exact
+from core.kinds import INFINITE_SOLUTIONS, NO_SOLUTION, ONE_SOLUTION
+from core.planes import classify_planes
+
+
+def determine_solution_3v_reference(system: np.ndarray) -> int:
+    """
+    The original two-``matrix_rank`` classification of one (3, 4) system.
+    """
+    A = system[:, :3]
+    rank_A = np.linalg.matrix_rank(A)
+    rank_AB = np.linalg.matrix_rank(system)
+    if rank_A < rank_AB:
+        return NO_SOLUTION
+    elif rank_A == 3:
+        return ONE_SOLUTION
+    else:
+        return INFINITE_SOLUTIONS
+
+
+def random_systems(n: int, seed: int = 0) -> np.ndarray:
+    """
+    Integer systems in [-5, 5] where about a third have a dependent third row.
+    """
+    rng = np.random.default_rng(seed)
+    systems = rng.integers(-5, 6, size=(n, 3, 4)).astype(float)
+    dependent = rng.random(n) < 1 / 3
+    mix = rng.integers(-2, 3, size=(n, 2, 1))
+    combined = (systems[:, :2, :] * mix).sum(axis=1)
+    systems[dependent, 2, :3] = combined[dependent, :3]
+    return systems
+
+
+def rank_deficient_float_systems(n: int, seed: int = 0) -> np.ndarray:
+    """
+    Float systems in [-5, 5] of rank 2 or 1, a quarter of each consistent and inconsistent.
+
+    The dependent rows are built in floating point, so their coefficients carry rounding
+    error of the size the rank tolerance has to absorb.
+    """
+    rng = np.random.default_rng(seed)
+    systems = rng.uniform(-5, 5, size=(n, 3, 4))
+    mix = rng.uniform(-2, 2, size=(n, 2))
+    systems[:, 2] = mix[:, :1] * systems[:, 0] + mix[:, 1:] * systems[:, 1]
+    rank_one = rng.random(n) < 1 / 2
+    systems[rank_one, 1] = mix[rank_one, 1:] * systems[rank_one, 0]
+    inconsistent = rng.random(n) < 1 / 2
+    systems[inconsistent, 2, 3] += rng.choice((-1.0, 1.0), size=int(inconsistent.sum()))
+    return systems
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--reference-limit", type=int, default=10_000,
+                        help="Largest batch to run through the per-system reference loop.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    mismatches = 0
+    print(f"{'corpus':>10} {'N':>8} {'svd agree':>10} {'exact agree':>12}")
+    for name, systems in (("integer", random_systems(args.reference_limit)),
+                          ("float", rank_deficient_float_systems(args.reference_limit))):
+        expected = np.array([determine_solution_3v_reference(s) for s in systems])
+        svd_mismatches = np.count_nonzero(classify_planes(systems).kind != expected)
+        line = f"{name:>10} {len(systems):>8} {1 - svd_mismatches / len(systems):>10.2%}"
+        mismatches += svd_mismatches
+        if name == "integer":
+            exact_mismatches = np.count_nonzero(classify_exact(systems).kind != expected)
+            line += f" {1 - exact_mismatches / len(systems):>12.2%}"
+            mismatches += exact_mismatches
+        print(line)
+    print()
+
+    print(f"{'N':>10} {'svd/s':>14} {'exact/s':>14} {'reference/s':>14} {'speedup':>9} {'agree':>7}")
+    for n in args.sizes:
+        systems = random_systems(n)
+        batched = best_of(lambda: classify_planes(systems), args.repeat)
+        exact = best_of(lambda: classify_exact(systems), args.repeat)
+        line = f"{n:>10} {n / batched:>14,.0f} {n / exact:>14,.0f}"
+        if n <= args.reference_limit:
+            reference = best_of(lambda: [determine_solution_3v_reference(s) for s in systems], 1)
+            expected = np.array([determine_solution_3v_reference(s) for s in systems])
+            agree = np.mean(classify_exact(systems).kind == expected)
+            line += f" {n / reference:>14,.0f} {reference / batched:>8.1f}x {agree:>7.2%}"
+        print(line)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Cold-start and first-paint time of every page, each measured in a fresh Python process.
+
+A child process imports Streamlit's testing harness and then runs one page through
+`AppTest` twice:
+- the first run pays for the page's own imports and is the cold start;
+- the second run is warm.
+
+First paint is the time from the start of the first run until the page sends its first
+element. The report also lists which heavy libraries each page loaded, so an eager import
+that sneaks back in shows up even before it shows up in the timings.
+
+Usage
+-----
+python -m benchmarks.coldstart --repeat 5 --output coldstart.json
+python -m benchmarks.coldstart --output coldstart.json --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = {
+    "home": ROOT / "app.py",
+    "lines": ROOT / "pages" / "1_🧮_Linear Systems as Lines.py",
+    "planes": ROOT / "pages" / "2_🎏_System of Equations as Planes (3x3).py",
+    "how_to": ROOT / "pages" / "3_🙋‍♂️_How to use.py",
+    "contact": ROOT / "pages" / "4_🔗_Contact.py",
+}
+HEAVY_MODULES = ("matplotlib", "plotly.graph_objects", "pandas", "pyarrow")
+METRICS = ("process_s", "harness_s", "first_paint_s", "cold_run_s", "warm_run_s")
+
+
+def measure_child(page: str) -> dict:
+    """
+    Runs in the child process: times the harness import and a cold and a warm run of ``page``.
+    """
+    start = time.perf_counter()
+    import logging
+
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+    from streamlit.testing.v1 import AppTest
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    harness = time.perf_counter()
+    loaded_before = {name for name in HEAVY_MODULES if name in sys.modules}
+
+    first_element = []
+    enqueue = ForwardMsgQueue.enqueue
+
+    def timed_enqueue(queue, msg):
+        if not first_element and msg.HasField("delta"):
+            first_element.append(time.perf_counter())
+        return enqueue(queue, msg)
+
+    ForwardMsgQueue.enqueue = timed_enqueue
+    at = AppTest.from_file(str(PAGES[page]), default_timeout=60)
+    cold_start = time.perf_counter()
+    at.run()
+    cold_end = time.perf_counter()
+    at.run()
+    warm_end = time.perf_counter()
+    return {
+        "harness_s": harness - start,
+        "first_paint_s": (first_element[0] if first_element else cold_end) - cold_start,
+        "cold_run_s": cold_end - cold_start,
+        "warm_run_s": warm_end - cold_end,
+        "failed": bool(at.exception),
+        "loaded": sorted({name for name in HEAVY_MODULES if name in sys.modules} - loaded_before),
+    }
+
+
+def run_child(page: str) -> dict:
+    """
+    Measures ``page`` in a fresh interpreter and adds the wall time of the whole process.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.coldstart", "--child", page],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    entry = json.loads(result.stdout.strip().splitlines()[-1])
+    entry["process_s"] = time.perf_counter() - start
+    return entry
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=list(PAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh processes per page; the median is reported.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Earlier --output file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative growth of any time (default: 0.25).")
+    parser.add_argument("--child", choices=sorted(PAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_child(args.child)))
+        return 0
+
+    results = {}
+    print(f"{'page':<10} {'process':>9} {'harness':>9} {'paint':>9} {'cold':>9} {'warm':>9}  loaded")
+    for page in args.pages:
+        runs = [run_child(page) for _ in range(args.repeat)]
+        entry = results[page] = {metric: statistics.median(run[metric] for run in runs) for metric in METRICS}
+        entry["failed"] = any(run["failed"] for run in runs)
+        entry["loaded"] = runs[-1]["loaded"]
+        times = " ".join(f"{entry[metric] * 1000:>7.0f}ms" for metric in METRICS)
+        print(f"{page:<10} {times}  {', '.join(entry['loaded']) or '-'}{'  FAILED' if entry['failed'] else ''}")
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    failed = any(entry["failed"] for entry in results.values())
+    if args.baseline:
+        # Imported here: the suite loads the core package, which must stay cold in the children.
+        from benchmarks.suite import compare
+
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold, METRICS)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Load test: N simulated sessions clicking through the app in one process, without a network.
+
+Each session is a thread that drives its own `AppTest` through a realistic script (presets,
+coefficient edits, color changes, toggles) with random think time between interactions.
+All sessions share the process, and so its caches and memory, as they would on a single
+server. The report gives throughput, p50/p95/p99 rerun latency per page and action, and
+the resident set size (RSS) sampled over the run, which shows leaks as steady growth.
+
+Streamlit's testing harness installs a process-global mock runtime for every run, so
+reruns are executed one at a time under a lock. This matches a server whose reruns are
+CPU-bound under the GIL. Latency is measured from the moment a session asks for a rerun,
+so it includes the time spent waiting behind other sessions. Service time excludes it.
+
+Usage
+-----
+python -m benchmarks.load --sessions 20 --actions 30 --think 0.5 --output load.json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = {
+    "home": ROOT / "app.py",
+    "lines": ROOT / "pages" / "1_🧮_Linear Systems as Lines.py",
+    "planes": ROOT / "pages" / "2_🎏_System of Equations as Planes (3x3).py",
+}
+COLORS = ("#5e17eb", "#ff3b3b", "#1bff00", "#0077ff", "#ffaa00", "#222222")
+
+_RUN_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Sample:
+    """
+    One rerun: when it was requested, how long it waited and how long it ran.
+    """
+
+    session: int
+    page: str
+    action: str
+    requested: float
+    latency: float
+    service: float
+    failed: bool
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size of this process (peak RSS where /proc is unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def pick_action(at, page: str, rng: random.Random):
+    """
+    Applies one random interaction to ``at`` and returns its name, or "rerun" when the page has none.
+    """
+    choices = []
+    if at.button:
+        choices.append("preset")
+    if page != "home" and at.number_input:
+        choices.append("edit")
+    if at.color_picker:
+        choices.append("color")
+    if at.toggle:
+        choices.append("toggle")
+    if not choices:
+        return "rerun"
+    action = rng.choice(choices)
+    if action == "preset":
+        rng.choice(at.button).click()
+    elif action == "edit":
+        widget = rng.choice([w for w in at.number_input if (w.key or "").startswith("coef_")] or list(at.number_input))
+        widget.set_value((widget.value or 0) + rng.choice((-2, -1, 1, 2)))
+    elif action == "color":
+        rng.choice(at.color_picker).set_value(rng.choice(COLORS))
+    else:
+        toggle = rng.choice(at.toggle)
+        toggle.set_value(not toggle.value)
+    return action
+
+
+def run_session(session: int, pages: list[str], actions: int, think: float, seed: int, start: float, samples: list[Sample]) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session)
+    page = rng.choice(pages)
+    at = AppTest.from_file(str(PAGES[page]), default_timeout=60)
+    action = "open"
+    for step in range(actions + 1):
+        if step:
+            time.sleep(rng.expovariate(1 / think) if think > 0 else 0)
+            action = pick_action(at, page, rng)
+        requested = time.perf_counter()
+        with _RUN_LOCK:
+            began = time.perf_counter()
+            try:
+                at.run()
+                failed = bool(at.exception)
+            except Exception:
+                failed = True
+            finished = time.perf_counter()
+        samples.append(Sample(session, page, action, requested - start, finished - requested, finished - began, failed))
+
+
+def percentiles(values) -> dict:
+    values = np.asarray(values) * 1000
+    if not len(values):
+        return {}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"count": len(values), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": values.max()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="Simulated concurrent sessions.")
+    parser.add_argument("--actions", type=int, default=20, help="Interactions per session after opening its page.")
+    parser.add_argument("--think", type=float, default=0.5, help="Mean think time between interactions, in seconds.")
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=["lines", "planes"], help="Pages the sessions open.")
+    parser.add_argument("--interval", type=float, default=0.5, help="RSS sampling interval in seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write samples, RSS timeline and summary as JSON.")
+    args = parser.parse_args(argv)
+
+    import streamlit  # noqa: F401  (creates its loggers, which are quieted below)
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    samples: list[Sample] = []
+    memory: list[tuple[float, int]] = []
+    done = threading.Event()
+    start = time.perf_counter()
+
+    def sample_memory():
+        while not done.is_set():
+            memory.append((time.perf_counter() - start, rss_bytes()))
+            done.wait(args.interval)
+
+    sampler = threading.Thread(target=sample_memory, daemon=True)
+    sampler.start()
+    os.chdir(ROOT)  # The pages load images relative to the repository root.
+    sessions = [
+        threading.Thread(target=run_session, args=(i, args.pages, args.actions, args.think, args.seed, start, samples))
+        for i in range(args.sessions)
+    ]
+    for thread in sessions:
+        thread.start()
+    for thread in sessions:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    memory.append((elapsed, rss_bytes()))
+
+    summary = {
+        "sessions": args.sessions,
+        "reruns": len(samples),
+        "failed": sum(s.failed for s in samples),
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(samples) / elapsed,
+        "latency": percentiles([s.latency for s in samples]),
+        "service": percentiles([s.service for s in samples]),
+        "by_action": {
+            f"{page}/{action}": percentiles([s.latency for s in samples if (s.page, s.action) == (page, action)])
+            for page, action in sorted({(s.page, s.action) for s in samples})
+        },
+        "rss_start_mb": memory[0][1] / 2**20,
+        "rss_peak_mb": max(m[1] for m in memory) / 2**20,
+        "rss_end_mb": memory[-1][1] / 2**20,
+    }
+
+    print(f"{summary['reruns']} reruns ({summary['failed']} failed) from {args.sessions} sessions in {elapsed:.1f} s: "
+          f"{summary['throughput_per_s']:.1f} reruns/s")
+    print(f"{'':<20} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in [("latency", summary["latency"]), ("service", summary["service"]), *summary["by_action"].items()]:
+        print(f"{name:<20} {stats['count']:>6} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+    print(f"RSS: {summary['rss_start_mb']:.1f} MB at start, {summary['rss_peak_mb']:.1f} MB peak, {summary['rss_end_mb']:.1f} MB at end")
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "summary": summary,
+            "rss": [{"t": t, "bytes": b} for t, b in memory],
+            "samples": [asdict(s) for s in samples],
+        }, indent=2), encoding="utf-8")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
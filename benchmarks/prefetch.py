@@ -0,0 +1,108 @@
+"""
+Nudge latency on the 3x3 page with and without speculative prefetch (core.prefetch).
+
+One `AppTest` session opens the planes page and then nudges coefficients up and down by
+one step, as a student exploring a system does. It pauses ``--think`` seconds between
+nudges, which gives the prefetch jobs time to run. Each nudge sometimes moves on to another
+coefficient, so the report includes the misses that follow a change of coefficient.
+
+Each nudge is timed twice: the whole `AppTest` run, and the coefficient workspace fragment
+from the page's own profile. A browser nudge reruns only that fragment, while `AppTest`
+reruns the whole page and parses its output. Runs with and without prefetch alternate for
+``--rounds`` rounds, so drift in machine load hits both alike. They share the process, so
+`SYSTEM_CACHE` is cleared before each run.
+
+Usage
+-----
+python -m benchmarks.prefetch --nudges 60 --think 0.1 --rounds 3 --output prefetch.json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.load import PAGES, ROOT, percentiles
+from core.cache import SYSTEM_CACHE
+from core.prefetch import PREFETCH_ENV, PREFETCHER
+from core.profiling import PROFILE_ENV, PROFILE_LOG_ENV
+
+FRAGMENT = "planes/workspace"
+
+
+def nudge_latencies(nudges: int, think: float, switch: float, seed: int) -> tuple[list[float], list[float]]:
+    """
+    Seconds taken by each nudge: by the whole rerun of the planes page, and by its `FRAGMENT` span.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(str(PAGES["planes"]), default_timeout=60)
+    at.run()
+    name = rng.choice([w.key for w in at.number_input if (w.key or "").startswith("coef_")])
+    latencies, fragments = [], []
+    for _ in range(nudges):
+        if rng.random() < switch:
+            name = rng.choice([w.key for w in at.number_input if (w.key or "").startswith("coef_")])
+        time.sleep(think)
+        widget = at.number_input(key=name)
+        widget.set_value(widget.value + rng.choice((-1, 1)))
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        profile = at.session_state["profile_runs"][-1]
+        fragments.append(next(s.seconds for s in profile.spans if s.name == FRAGMENT))
+    return latencies, fragments
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nudges", type=int, default=60, help="Coefficient nudges per run.")
+    parser.add_argument("--think", type=float, default=0.1, help="Pause before each nudge, in seconds.")
+    parser.add_argument("--switch", type=float, default=0.2, help="Chance that a nudge moves to another coefficient.")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per mode, alternating between the modes.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the latencies and summary as JSON.")
+    args = parser.parse_args(argv)
+
+    import streamlit  # noqa: F401  (creates its loggers, which are quieted below)
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    os.chdir(ROOT)  # The pages load images relative to the repository root.
+    os.environ[PROFILE_ENV] = "1"
+    os.environ[PROFILE_LOG_ENV] = os.devnull
+
+    runs = {mode: {"rerun": [], "fragment": []} for mode in ("off", "on")}
+    for repeat in range(args.rounds):
+        for mode in runs:
+            os.environ[PREFETCH_ENV] = "1" if mode == "on" else "0"
+            SYSTEM_CACHE.clear()
+            latencies, fragments = nudge_latencies(args.nudges, args.think, args.switch, args.seed + repeat)
+            runs[mode]["rerun"] += latencies
+            runs[mode]["fragment"] += fragments
+    stats = PREFETCHER.stats()
+
+    summary = {f"{mode}/{part}": percentiles(values) for mode, parts in runs.items() for part, values in parts.items()}
+    summary["prefetch"] = {**vars(stats), "hit_rate": stats.hit_rate}
+    print(f"{'prefetch':<14} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, row in summary.items():
+        if name != "prefetch":
+            print(f"{name:<14} {row['count']:>6} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}")
+    print(f"Hit rate {stats.hit_rate:.0%} ({stats.hits} of {stats.hits + stats.misses}); "
+          f"{stats.completed} jobs completed, {stats.cancelled} cancelled, {stats.throttled} throttled, "
+          f"{stats.cpu_seconds:.2f} CPU s")
+
+    if args.output:
+        args.output.write_text(json.dumps({"summary": summary, "latencies": runs}, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Several server processes serving the same 3x3 systems, with and without the shared result
+store (core.store).
+
+Each worker is a fresh process, like one Streamlit server behind a reverse proxy, with an
+empty `SYSTEM_CACHE`. Every worker serves ``--requests`` random picks from one pool of
+``--systems`` integer systems, as the page does:
+- it classifies the system through `SYSTEM_CACHE` and the store;
+- it builds the chart figure through the store;
+- it serializes the figure as `st.plotly_chart` does.
+The report gives per-request latency, the figures each mode built, and the store's hit rate
+and size.
+
+Usage
+-----
+python -m benchmarks.store --workers 4 --systems 200 --requests 400 --output store.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from benchmarks.load import percentiles
+from core.store import STORE_ENV
+
+STYLE = ("#5e17eb", "#ff3b3b", "#1BFF00", True, True)
+
+
+def serve(coefficients: list[int]) -> bool:
+    """
+    Serves one system as the planes page does; returns True when its figure had to be built.
+    """
+    import plotly.io as pio
+    import plotly.tools
+
+    from core.cache import SYSTEM_CACHE, canonical_system
+    from core.figures import plot_3_planes
+    from core.general import classify_system
+    from core.kinds import PLANE_LABELS
+    from core.planes import DEFAULT_RTOL
+    from core.store import FIGURE_CODEC, LABEL_CODEC, shared
+
+    rows = [coefficients[0:4], coefficients[4:8], coefficients[8:12]]
+    key, order = canonical_system(rows)
+    SYSTEM_CACHE.get_or_compute(("solution", key), lambda: shared(
+        ("solution", key), lambda: PLANE_LABELS[classify_system(key, rtol=DEFAULT_RTOL, method="auto")], LABEL_CODEC,
+    ))
+    built = []
+    color1, color2, color3, compact, overlay = STYLE
+
+    def build():
+        built.append(True)
+        return plot_3_planes(*coefficients, color1, color2, color3, compact=compact, intersections=overlay)
+
+    fig = shared(("figure", key, order, STYLE), build, FIGURE_CODEC)
+    pio.to_json(plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True), validate=False)
+    return bool(built)
+
+
+def worker(index: int, pool: list[list[int]], requests: int, seed: int, store: str | None) -> dict:
+    if store:
+        os.environ[STORE_ENV] = store
+    else:
+        os.environ.pop(STORE_ENV, None)
+    import plotly.graph_objects  # noqa: F401  (imported before timing, as a running server has)
+
+    rng = random.Random(seed * 1000 + index)
+    latencies, built = [], 0
+    for _ in range(requests):
+        system = rng.choice(pool)
+        start = time.perf_counter()
+        built += serve(system)
+        latencies.append(time.perf_counter() - start)
+    from core.store import shared_store
+
+    stats = shared_store().stats() if store else None
+    return {"latencies": latencies, "built": built, "store": vars(stats) if stats else None}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="Server processes.")
+    parser.add_argument("--systems", type=int, default=200, help="Distinct systems the requests pick from.")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per worker.")
+    parser.add_argument("--store", type=Path, help="SQLite file for the store; a temporary file by default.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the latencies and summary as JSON.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    pool = [[rng.randint(-5, 5) for _ in range(12)] for _ in range(args.systems)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(args.store or Path(directory) / "store.sqlite")
+        summary, results = {}, {}
+        for mode, store in (("off", None), ("on", path)):
+            with ProcessPoolExecutor(args.workers, mp_context=get_context("spawn")) as executor:
+                futures = [executor.submit(worker, i, pool, args.requests, args.seed, store) for i in range(args.workers)]
+                results[mode] = [future.result() for future in futures]
+            latencies = [t for result in results[mode] for t in result["latencies"]]
+            summary[mode] = {**percentiles(latencies), "built": sum(result["built"] for result in results[mode])}
+        stores = [result["store"] for result in results["on"]]
+        hits, misses = sum(s["hits"] for s in stores), sum(s["misses"] for s in stores)
+        summary["store"] = {
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "errors": sum(s["errors"] for s in stores),
+            "entries": max(s["entries"] for s in stores),
+            "nbytes": max(s["nbytes"] for s in stores),
+        }
+
+    print(f"{args.workers} workers x {args.requests} requests over {args.systems} systems")
+    print(f"{'store':<6} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'built':>7}")
+    for mode in ("off", "on"):
+        row = summary[mode]
+        print(f"{mode:<6} {row['count']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f} {row['built']:>7}")
+    store = summary["store"]
+    print(f"Store: {store['hit_rate']:.0%} hit rate, {store['entries']} entries, {store['nbytes'] / 2**20:.2f} MB, {store['errors']} errors")
+
+    if args.output:
+        args.output.write_text(json.dumps({"summary": summary, "results": results}, indent=2), encoding="utf-8")
+    return 1 if store["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
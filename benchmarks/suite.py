@@ -0,0 +1,278 @@
+"""
+Benchmark suite for the solvers, the figures and full page reruns.
+
+Every case is timed (best per-call time over several repeats), its peak Python allocation
+is measured with ``tracemalloc`` in a separate run, and figures also record the size of
+what the browser receives: the Plotly JSON or the PNG that `st.pyplot` sends. Page reruns
+go through Streamlit's headless testing harness.
+
+Usage
+-----
+python -m benchmarks.suite --output results.json
+python -m benchmarks.suite --output results.json --baseline baseline.json --threshold 0.25
+
+With ``--baseline`` the run fails (exit code 1) if any metric of a case present in both
+files grew by more than ``threshold`` (a fraction).
+"""
+import argparse
+import importlib.util
+import io
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from core.cache import SYSTEM_CACHE
+from core.exact import classify_exact
+from core.figures import PLANE_COLORS, create_plane_data, plot_3_planes, plot_line_set, plot_lines, plot_plane_set
+from core.geometry import clip_planes
+from core.lines import classify_lines, pairwise_intersections
+from core.payload import payload_nbytes
+from core.planes import classify_planes
+
+ROOT = Path(__file__).resolve().parent.parent
+LINES_PAGE = ROOT / "pages" / "1_🧮_Linear Systems as Lines.py"
+PLANES_PAGE = ROOT / "pages" / "2_🎏_System of Equations as Planes (3x3).py"
+STRUCTURES = ("regular", "singular", "inconsistent")
+METRICS = ("seconds", "peak_bytes", "payload_bytes")
+
+
+@dataclass
+class Case:
+    """
+    One benchmark: ``run`` is timed after ``setup`` has prepared any state it needs.
+    """
+
+    name: str
+    run: Callable[[], Any]
+    setup: Callable[[], None] | None = None
+    min_time: float = 0.2
+
+
+def plane_systems(structure: str, n: int, seed: int = 0) -> np.ndarray:
+    """
+    Random integer (n, 3, 4) systems with a unique solution, a dependent consistent third
+    row (infinite solutions) or a dependent inconsistent one (no solution).
+    """
+    rng = np.random.default_rng(seed)
+    systems = rng.integers(-5, 6, size=(n, 3, 4)).astype(float)
+    if structure != "regular":
+        systems[:, 2] = systems[:, 0] + systems[:, 1]
+    if structure == "inconsistent":
+        systems[:, 2, 3] += 1
+    return systems
+
+
+def line_systems(structure: str, n: int, seed: int = 0) -> np.ndarray:
+    """
+    Random integer (n, 6) systems of two lines, the second row a multiple of the first
+    (plus one in ``c2``) when singular (inconsistent).
+    """
+    rng = np.random.default_rng(seed)
+    systems = rng.integers(-5, 6, size=(n, 6)).astype(float)
+    if structure != "regular":
+        systems[:, 3:] = 2 * systems[:, :3]
+    if structure == "inconsistent":
+        systems[:, 5] += 1
+    return systems
+
+
+def load_page(path: Path):
+    """
+    Imports a page as a module without running its ``main``, for its ``determine_*`` functions.
+    """
+    import streamlit  # noqa: F401  (creates its loggers, which are quieted below)
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    spec = importlib.util.spec_from_file_location(f"page_{path.stem[0]}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def figure_nbytes(fig) -> int:
+    """
+    Size of what the browser receives for ``fig``: Plotly JSON, or the PNG `st.pyplot` sends.
+    """
+    if hasattr(fig, "to_plotly_json"):
+        return payload_nbytes(fig)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.tell()
+
+
+def page_rerun_cases() -> list[Case]:
+    """
+    Full runs of both pages and single coefficient edits, through `AppTest`.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    cases = []
+    for label, path in (("lines", LINES_PAGE), ("planes", PLANES_PAGE)):
+        state = {}
+
+        def first_run(path=path):
+            AppTest.from_file(str(path)).run(timeout=60)
+
+        def start(path=path, state=state):
+            state["app"] = AppTest.from_file(str(path)).run(timeout=60)
+            state["value"] = 0
+
+        def edit(state=state):
+            # A new value on every call, so each rerun misses the shared system cache.
+            state["value"] += 1
+            state["app"].number_input(key="coef_a1").set_value(state["value"]).run(timeout=60)
+
+        cases.append(Case(f"page[{label}]/first_run", first_run, SYSTEM_CACHE.clear, min_time=1.0))
+        cases.append(Case(f"page[{label}]/edit_rerun", edit, start, min_time=1.0))
+    return cases
+
+
+def build_cases(sizes: list[int], pages: bool) -> list[Case]:
+    lines_page = load_page(LINES_PAGE)
+    planes_page = load_page(PLANES_PAGE)
+    cases = []
+    for structure in STRUCTURES:
+        plane = plane_systems(structure, 1)[0]
+        line = line_systems(structure, 1)[0]
+        cases += [
+            Case(f"create_plane_data[{structure}]", lambda p=plane: [create_plane_data(*row) for row in p]),
+            Case(f"plot_3_planes[{structure}]/cold", lambda p=plane: plot_3_planes(*p.ravel(), *PLANE_COLORS), SYSTEM_CACHE.clear),
+            Case(f"plot_3_planes[{structure}]/warm", lambda p=plane: plot_3_planes(*p.ravel(), *PLANE_COLORS)),
+            Case(f"plot_3_planes[{structure}]/compact", lambda p=plane: plot_3_planes(*p.ravel(), *PLANE_COLORS, compact=True)),
+            Case(f"determine_solution_3v[{structure}]/exact", lambda p=plane: planes_page.determine_solution_3v(*p.ravel())),
+            Case(f"determine_solution_3v[{structure}]/float", lambda p=plane: planes_page.determine_solution_3v(*p.ravel(), method="float")),
+            Case(f"plot_lines[{structure}]/matplotlib", lambda l=line: plot_lines(*l)),
+            Case(f"plot_lines[{structure}]/plotly", lambda l=line: plot_lines(*l, backend="plotly")),
+            Case(f"determine_solution[{structure}]/exact", lambda l=line: lines_page.determine_solution(*l)),
+            Case(f"determine_solution[{structure}]/float", lambda l=line: lines_page.determine_solution(*l, method="float")),
+        ]
+        for n in sizes:
+            planes, lines = plane_systems(structure, n), line_systems(structure, n)
+            cases += [
+                Case(f"clip_planes[{structure}]/n={n}", lambda p=planes: clip_planes(p.reshape(-1, 4))),
+                Case(f"classify_planes[{structure}]/n={n}", lambda p=planes: classify_planes(p)),
+                Case(f"classify_exact_3v[{structure}]/n={n}", lambda p=planes: classify_exact(p)),
+                Case(f"classify_lines[{structure}]/n={n}", lambda l=lines: classify_lines(l)),
+                Case(f"classify_exact_2v[{structure}]/n={n}", lambda l=lines: classify_exact(l.reshape(-1, 2, 3))),
+            ]
+    for n in sizes:
+        planes = np.random.default_rng(n).normal(size=(n, 4)) * [1, 1, 1, 5]
+        cases += [
+            Case(f"plot_plane_set/n={n}", lambda p=planes: plot_plane_set(p, budget=len(p))),
+            Case(f"plot_plane_set/n={n}/budget", lambda p=planes: plot_plane_set(p)),
+            Case(f"pairwise_intersections/m={n}", lambda p=planes: pairwise_intersections(p[:, 1:], max_points=20_000)),
+            Case(f"plot_line_set/m={n}", lambda p=planes: plot_line_set(p[:, 1:], backend="plotly")),
+        ]
+    if pages:
+        cases += page_rerun_cases()
+    return cases
+
+
+def measure(case: Case, repeat: int) -> dict:
+    """
+    Best per-call time, peak traced allocation and, for figures, serialized size of one case.
+    """
+    if case.setup:
+        case.setup()
+    start = time.perf_counter()
+    result = case.run()
+    loops = max(1, int(case.min_time / repeat / max(time.perf_counter() - start, 1e-9)))
+
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for _ in range(loops):
+            if case.setup:
+                case.setup()
+            start = time.perf_counter()
+            case.run()
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed / loops)
+
+    if case.setup:
+        case.setup()
+    tracemalloc.start()
+    case.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    entry = {"seconds": best, "loops": loops, "peak_bytes": peak}
+    if hasattr(result, "to_plotly_json") or hasattr(result, "savefig"):
+        entry["payload_bytes"] = figure_nbytes(result)
+    return entry
+
+
+def compare(results: dict, baseline: dict, threshold: float, metrics: tuple[str, ...] = METRICS) -> list[str]:
+    """
+    Returns a line per metric that grew by more than ``threshold`` against the baseline.
+    """
+    regressions = []
+    for name, entry in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in metrics:
+            if metric in entry and before.get(metric):
+                ratio = entry[metric] / before[metric]
+                if ratio > 1 + threshold:
+                    regressions.append(f"{name} {metric}: {before[metric]:.4g} -> {entry[metric]:.4g} ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000], help="Batch sizes of the vectorized kernels.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text.")
+    parser.add_argument("--no-pages", action="store_true", help="Skip the page reruns through AppTest.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Earlier --output file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative growth of any metric (default: 0.25).")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<48} {'time':>12} {'peak':>12} {'payload':>10}")
+    for case in build_cases(args.sizes, pages=not args.no_pages):
+        if args.filter not in case.name:
+            continue
+        entry = results[case.name] = measure(case, args.repeat)
+        payload = f"{entry['payload_bytes']:,}" if "payload_bytes" in entry else ""
+        print(f"{case.name:<48} {entry['seconds'] * 1e6:>10.1f}µs {entry['peak_bytes']:>12,} {payload:>10}")
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
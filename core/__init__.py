@@ -0,0 +1,55 @@
+"""
+Solver and geometry code shared by the Streamlit pages.
+
+Everything in this package is importable without Streamlit so it can be reused from
+scripts and batch jobs.
+"""
+from core.cache import SYSTEM_CACHE, LRUCache, canonical_system
+from core.exact import ExactClassification, classify_exact, row_reduction_steps
+from core.general import SystemSolution, classify_system, solve_streaming, solve_system
+from core.geometry import DEFAULT_BOUNDS, DEFAULT_PLANE_BUDGET, DEFAULT_VIEWPORT, clip_lines, clip_planes, clip_rays, select_planes, triangulate_polygons
+from core.intersections import Intersections, plane_intersections
+from core.kinds import INFINITE_SOLUTIONS, LINE_LABELS, NO_SOLUTION, ONE_SOLUTION, PLANE_LABELS
+from core.lines import LineClassification, LineIntersections, classify_lines, least_squares_point, pairwise_intersections
+from core.payload import compact_figure, payload_nbytes
+from core.planes import PlaneClassification, classify_planes
+from core.sweep import Sweep, sweep_coefficient
+
+__all__ = [
+    "DEFAULT_BOUNDS",
+    "DEFAULT_PLANE_BUDGET",
+    "DEFAULT_VIEWPORT",
+    "INFINITE_SOLUTIONS",
+    "LINE_LABELS",
+    "NO_SOLUTION",
+    "ONE_SOLUTION",
+    "PLANE_LABELS",
+    "SYSTEM_CACHE",
+    "ExactClassification",
+    "Intersections",
+    "LRUCache",
+    "LineClassification",
+    "LineIntersections",
+    "PlaneClassification",
+    "Sweep",
+    "SystemSolution",
+    "canonical_system",
+    "classify_exact",
+    "classify_lines",
+    "classify_planes",
+    "classify_system",
+    "compact_figure",
+    "least_squares_point",
+    "clip_lines",
+    "clip_planes",
+    "clip_rays",
+    "pairwise_intersections",
+    "payload_nbytes",
+    "plane_intersections",
+    "row_reduction_steps",
+    "select_planes",
+    "solve_streaming",
+    "solve_system",
+    "sweep_coefficient",
+    "triangulate_polygons",
+]
@@ -0,0 +1,174 @@
+"""
+Right-sized, recompressed variants of the images the pages show, decoded once per process.
+
+Streamlit passes PNG bytes that are no wider than the display width straight to the
+browser, but it re-encodes every other format to PNG and shrinks wider images on every
+rerun. The pages therefore ask for palette PNGs already at display width, which are
+served from memory as they are. WebP variants are available for exports that do not go
+through Streamlit.
+
+Usage
+-----
+python -m core.assets            # report the bytes saved by the page variants
+python -m core.assets --format webp
+"""
+import argparse
+import io
+import os
+import sys
+from dataclasses import dataclass
+
+from core.cache import LRUCache
+
+FORMATS = ("png", "webp")
+WEBP_QUALITY = 85
+# Pixel widths of the variants. The logo (24 px high) gets twice its CSS size for
+# high-density screens. The screenshots sit in three columns of the wide "How to use"
+# layout, about 320 px each on a laptop and 600 px on a large monitor. An `st.image` with
+# an explicit width is shrunk to exactly that width by Streamlit, so the photo is not scaled.
+LOGO_WIDTH = 2 * 24
+PROFILE_WIDTH = 250
+SCREENSHOT_WIDTH = 640
+PAGE_ASSETS = (
+    ("images/rudra.png", LOGO_WIDTH),
+    ("images/rudra.png", PROFILE_WIDTH),
+    ("images/one_solution.png", SCREENSHOT_WIDTH),
+    ("images/No_solutions.png", SCREENSHOT_WIDTH),
+    ("images/infinity_solution.png", SCREENSHOT_WIDTH),
+    ("images/one_sol_3d.png", SCREENSHOT_WIDTH),
+    ("images/no_dolution_3d.png", SCREENSHOT_WIDTH),
+    ("images/infinity_sol_3d.png", SCREENSHOT_WIDTH),
+)
+
+ASSET_CACHE = LRUCache(max_entries=64, max_bytes=8 * 1024 * 1024)
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """
+    One encoded variant of an image file.
+
+    Attributes
+    ----------
+    path : str
+        The source image.
+    format : str
+        "png" or "webp".
+    width, height : int
+        Pixel size of the variant; never larger than the source.
+    data : bytes
+        The encoded image.
+    source_nbytes : int
+        Size of the source file.
+    """
+
+    path: str
+    format: str
+    width: int
+    height: int
+    data: bytes
+    source_nbytes: int
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    @property
+    def saved(self) -> int:
+        return self.source_nbytes - self.nbytes
+
+
+def _encode(image, fmt: str) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=6)
+    else:
+        # Fast octree is the quantizer that keeps an alpha channel.
+        image.quantize(256, method=Image.Quantize.FASTOCTREE).save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _render(path: str, source_nbytes: int, fmt: str, widths) -> dict[int, ImageVariant]:
+    """
+    Decodes ``path`` once and encodes one variant per requested width.
+    """
+    from PIL import Image
+
+    with Image.open(path) as source:
+        source.load()
+    if source.mode == "RGBA" and source.getextrema()[3][0] == 255:
+        source = source.convert("RGB")  # Fully opaque: the alpha channel only costs bytes.
+    elif source.mode not in ("RGB", "RGBA"):
+        source = source.convert("RGBA")
+    variants = {}
+    for width in sorted(set(widths)):
+        image = source
+        if width < source.width:
+            image = source.resize((width, max(1, round(source.height * width / source.width))), Image.Resampling.LANCZOS)
+        variants[width] = ImageVariant(path, fmt, image.width, image.height, _encode(image, fmt), source_nbytes)
+    return variants
+
+
+def image_variant(path, width: int, fmt: str = "png") -> ImageVariant:
+    """
+    Returns ``path`` resized to ``width`` pixels (never enlarged) and encoded as ``fmt``.
+
+    Variants are kept in `ASSET_CACHE`, keyed by the file's modification time so an edited
+    image is picked up. On a miss every variant of the same file listed in `PAGE_ASSETS`
+    is produced from the same decode.
+
+    Raises
+    ------
+    ValueError
+        If ``fmt`` is not one of `FORMATS`.
+    OSError
+        If the file cannot be read or is not an image.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown image format {fmt!r}; expected one of {', '.join(FORMATS)}.")
+    path = os.fspath(path)
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, width, fmt)
+    variant = ASSET_CACHE.get(key)
+    if variant is None:
+        widths = [width] + [w for p, w in PAGE_ASSETS if os.path.abspath(p) == key[0]]
+        for w, rendered in _render(path, stat.st_size, fmt, widths).items():
+            ASSET_CACHE.put(key[:2] + (w, fmt), rendered)
+            if w == width:
+                variant = rendered
+    return variant
+
+
+def image_bytes(path, width: int, fmt: str = "png") -> bytes:
+    """
+    Encoded bytes of `image_variant`, ready for ``st.image`` or ``st.logo``.
+    """
+    return image_variant(path, width, fmt).data
+
+
+def prepare_assets(assets=PAGE_ASSETS, fmt: str = "png") -> list[ImageVariant]:
+    """
+    Generates (or fetches) every variant in ``assets``, a sequence of (path, width) pairs.
+    """
+    return [image_variant(path, width, fmt) for path, width in assets]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    args = parser.parse_args(argv)
+
+    variants = prepare_assets(fmt=args.format)
+    print(f"{'image':<30} {'size':>10} {'source':>10} {'variant':>10} {'saved':>7}")
+    for v in variants:
+        print(f"{v.path:<30} {f'{v.width}x{v.height}':>10} {v.source_nbytes:>10,} {v.nbytes:>10,} {v.saved / v.source_nbytes:>7.0%}")
+    source = sum(v.source_nbytes for v in variants)
+    total = sum(v.nbytes for v in variants)
+    print(f"{'total':<30} {'':>10} {source:>10,} {total:>10,} {(source - total) / source:>7.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
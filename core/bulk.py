@@ -0,0 +1,400 @@
+"""
+Chunked classification of large CSV or Parquet files of systems.
+
+    python -m core.bulk exercises.csv --out classified.csv --chunk-rows 100000
+
+Rows are read with pandas in chunks, each chunk is classified by the vectorized kernels in
+one call, and the results are appended to the output before the next chunk is read, so
+memory is bounded by the chunk size however long the file is. Every chunk reports its rows,
+time and throughput to an optional progress callback. Parquet input and output need the
+optional ``pyarrow`` package. pandas itself is only imported once a file is read, so a page
+offering this pipeline does not pay for it at start-up.
+"""
+import argparse
+import importlib.util
+import io
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from core.exact import classify_exact, integral_systems
+from core.general import matrix_ranks, solution_kinds
+from core.kinds import LINE_LABELS, ONE_SOLUTION, PLANE_LABELS
+from core.lines import COLUMNS as LINE_COLUMNS
+from core.planes import COLUMNS as PLANE_COLUMNS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 100_000
+FORMATS = ("csv", "parquet")
+INVALID_LABEL = "Invalid input"
+
+
+@dataclass(frozen=True)
+class ChunkReport:
+    """
+    Rows, wall time (reading, classifying and writing) and progress of one chunk.
+
+    ``progress`` is the fraction of the input consumed so far, or None when its size is unknown.
+    """
+
+    index: int
+    rows: int
+    invalid: int
+    seconds: float
+    progress: float | None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+@dataclass
+class BulkReport:
+    """
+    Totals of a `classify_file` run: rows per solution type and every chunk's report.
+    """
+
+    rows: int = 0
+    seconds: float = 0.0
+    counts: dict[str, int] = field(default_factory=dict)
+    chunks: list[ChunkReport] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+    def to_json(self) -> str:
+        return json.dumps({**asdict(self), "rows_per_second": self.rows_per_second}, ensure_ascii=False)
+
+
+def classify_batch(systems: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Classifies a batch of (N, 6) line or (N, 12) plane systems.
+
+    Each system gets what the pages' "auto" method gives it on its own: integer systems go
+    through `classify_exact`, the others through the float rank rule of
+    `core.general.classify_system` (`core.general.matrix_ranks`). The result of a row
+    therefore does not depend on the rows it shares a chunk with. Returns the solution
+    types and an (N, unknowns) array with the unique solution, NaN for the other systems.
+    """
+    unknowns = 2 if systems.shape[1] == len(LINE_COLUMNS) else 3
+    augmented = systems.reshape(len(systems), unknowns, unknowns + 1)
+    integral = integral_systems(augmented)
+    kind = np.empty(len(systems), dtype=np.int8)
+    point = np.full((len(systems), unknowns), np.nan)
+    if integral.any():
+        result = classify_exact(augmented[integral])
+        kind[integral], point[integral] = result.kind, result.point()
+    if not integral.all():
+        floats = augmented[~integral]
+        kind[~integral] = solution_kinds(*matrix_ranks(floats), unknowns)
+        unique = np.flatnonzero(~integral)[kind[~integral] == ONE_SOLUTION]
+        # Both ranks are full there, so A is far enough from singular for an LU solve.
+        point[unique] = np.linalg.solve(augmented[unique, :, :-1], augmented[unique, :, -1:])[:, :, 0]
+    return kind, np.where((kind == ONE_SOLUTION)[:, np.newaxis], point, np.nan)
+
+
+def frame_columns(columns) -> tuple[str, ...]:
+    """
+    Returns `core.planes.COLUMNS` or `core.lines.COLUMNS`, whichever the table provides.
+
+    Raises
+    ------
+    ValueError
+        If the table has neither set of coefficients.
+    """
+    for candidate in (PLANE_COLUMNS, LINE_COLUMNS):
+        if all(name in columns for name in candidate):
+            return candidate
+    raise ValueError(f"Expected the columns {', '.join(LINE_COLUMNS)} or {', '.join(PLANE_COLUMNS)}.")
+
+
+def numeric_coefficients(frame: "pd.DataFrame", columns: tuple[str, ...]) -> "pd.DataFrame":
+    """
+    Returns the coefficient columns of ``frame`` as numbers, with empty cells as NaN.
+
+    Raises
+    ------
+    ValueError
+        If a cell is not empty and not a number, e.g. ``x`` in a coefficient column.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> numeric_coefficients(pd.DataFrame({"a1": ["1", "x"]}), ("a1",))
+    Traceback (most recent call last):
+    ...
+    ValueError: Row 2, column 'a1': 'x' is not a number.
+    """
+    import pandas as pd
+
+    numeric = {}
+    for name in columns:
+        try:
+            numeric[name] = pd.to_numeric(frame[name], errors="raise")
+        except (ValueError, TypeError):
+            bad = pd.to_numeric(frame[name], errors="coerce").isna() & frame[name].notna()
+            row = bad.idxmax()
+            number = row + 1 if isinstance(row, (int, np.integer)) else row
+            raise ValueError(f"Row {number}, column {name!r}: {frame[name][row]!r} is not a number.") from None
+    return pd.DataFrame(numeric, index=frame.index)
+
+
+def classify_frame(frame: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Classifies every row of a table of systems and returns it with the results appended.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Columns ``a1 .. c2`` (two lines) or ``a1 .. d3`` (three planes); other columns such as
+        an id are passed through.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``frame`` plus a ``solution_type`` column with the page labels and ``x, y`` (and ``z``)
+        holding the unique solution, empty otherwise. Rows with a missing or infinite
+        coefficient get `INVALID_LABEL`.
+
+    Raises
+    ------
+    ValueError
+        If a coefficient cell holds something other than a number, naming its row (counted
+        from 1 after the header, see `read_chunks`) and column.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> frame = pd.DataFrame({"a1": [1, 1], "b1": [1, 1], "c1": [3, 1], "a2": [2, 1], "b2": [1, 1], "c2": [4, 2]})
+    >>> classify_frame(frame)[["solution_type", "x", "y"]].to_dict("list")
+    {'solution_type': ['One Solution', 'No Solution'], 'x': [1.0, nan], 'y': [2.0, nan]}
+    """
+    import pandas as pd
+
+    columns = frame_columns(frame.columns)
+    values = numeric_coefficients(frame, columns).to_numpy(dtype=float)
+    valid = np.isfinite(values).all(axis=1)
+    unknowns = 2 if columns == LINE_COLUMNS else 3
+    labels = np.array(LINE_LABELS if unknowns == 2 else PLANE_LABELS, dtype=object)
+
+    solution_type = np.full(len(frame), INVALID_LABEL, dtype=object)
+    point = np.full((len(frame), unknowns), np.nan)
+    if valid.any():
+        kind, point[valid] = classify_batch(values[valid])
+        solution_type[valid] = labels[kind]
+
+    result = frame.copy()
+    result["solution_type"] = solution_type
+    for name, coordinate in zip("xyz", point.T):
+        result[name] = coordinate
+    return result
+
+
+def read_chunks(source, chunk_rows: int = DEFAULT_CHUNK_ROWS, fmt: str | None = None):
+    """
+    Yields ``(frame, progress)`` for consecutive chunks of a CSV or Parquet file.
+
+    ``source`` is a path or a binary file object (e.g. a Streamlit upload). The format
+    follows the file suffix unless ``fmt`` is given. ``progress`` is the fraction of rows
+    (Parquet) or bytes (CSV) read so far, or None if the size is unknown. Frames are indexed
+    by their row position in the whole file, so errors can name the row.
+    """
+    fmt = fmt or Path(getattr(source, "name", str(source))).suffix.lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}.")
+    file = open(source, "rb") if isinstance(source, (str, Path)) else source
+    try:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            parquet = pq.ParquetFile(file)
+            total, done = parquet.metadata.num_rows, 0
+            for batch in parquet.iter_batches(batch_size=chunk_rows):
+                frame = batch.to_pandas()
+                frame.index += done
+                done += batch.num_rows
+                yield frame, done / total if total else None
+            return
+        import pandas as pd
+
+        file.seek(0, 2)
+        size = file.tell()
+        file.seek(0)
+        with pd.read_csv(file, chunksize=chunk_rows) as reader:
+            for frame in reader:
+                # The parser reads ahead in blocks, so this is exact only at the end of the file.
+                yield frame, min(file.tell() / size, 1.0) if size else None
+    finally:
+        if file is not source:
+            file.close()
+
+
+def pyarrow_installed() -> bool:
+    """
+    Returns True when the optional ``pyarrow`` package can be imported, without importing it.
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class ChunkWriter:
+    """
+    Appends classified chunks to one CSV or Parquet output, writing the header only once.
+
+    CSV goes through ``pyarrow.csv`` when it is installed and the sink is a path or a binary
+    buffer, which is several times faster than `pandas.DataFrame.to_csv`. Parquet keeps the
+    schema of the first chunk, with the coefficient columns stored as float64 (invalid entries
+    as nulls) so every later chunk fits it.
+    """
+
+    def __init__(self, sink, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}.")
+        self.sink = sink
+        self.fmt = fmt
+        self._file = None
+        self._parquet = None
+        self._header = True
+
+    def _binary(self):
+        if isinstance(self.sink, (str, Path)):
+            if self._file is None:
+                self._file = open(self.sink, "wb")
+            return self._file
+        return self.sink if isinstance(self.sink, (io.RawIOBase, io.BufferedIOBase)) else None
+
+    def write(self, frame: "pd.DataFrame") -> None:
+        if self.fmt == "csv":
+            # A path is opened once, here or by pyarrow below, and every chunk appends to it.
+            binary = self._binary()
+            if binary is None or not pyarrow_installed():
+                frame.to_csv(self.sink if binary is None else binary, header=self._header, index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.csv
+
+                options = pyarrow.csv.WriteOptions(include_header=self._header, quoting_style="needed")
+                pyarrow.csv.write_csv(pa.Table.from_pandas(frame, preserve_index=False), binary, options)
+            self._header = False
+            return
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        coefficients = [name for name in frame.columns if name in PLANE_COLUMNS + LINE_COLUMNS]
+        frame = frame.assign(**{name: pd.to_numeric(frame[name], errors="coerce").astype(float) for name in coefficients})
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._parquet is None:
+            schema = table.schema
+            self._parquet = pq.ParquetWriter(self._binary(), schema)
+        self._parquet.write_table(table.cast(self._parquet.schema))
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def classify_file(source, sink, chunk_rows: int = DEFAULT_CHUNK_ROWS, in_format: str | None = None, out_format: str = "csv", progress=None) -> BulkReport:
+    """
+    Classifies a CSV or Parquet file of systems chunk by chunk and streams the results out.
+
+    Parameters
+    ----------
+    source : str, Path or binary file
+        Input table, see `read_chunks`.
+    sink : str, Path or file object
+        Output, written with `ChunkWriter` in ``out_format``. A text or binary buffer works
+        for CSV, a binary one for Parquet.
+    chunk_rows : int, optional
+        Rows read, classified and written per step.
+    in_format : str, optional
+        "csv" or "parquet", by default from the file suffix.
+    out_format : str, optional
+        "csv" (default) or "parquet".
+    progress : callable, optional
+        Called with each `ChunkReport` as soon as its chunk is written.
+
+    Returns
+    -------
+    BulkReport
+        Row counts per solution type and the per-chunk timings.
+
+    Raises
+    ------
+    ValueError
+        If a format is unknown, the table lacks the coefficient columns or a coefficient is
+        not a number. The chunks before the bad one are already written.
+    ImportError
+        If Parquet is used without ``pyarrow`` installed.
+    """
+    report = BulkReport()
+    writer = ChunkWriter(sink, out_format)
+    start = time.perf_counter()
+    try:
+        chunks = read_chunks(source, chunk_rows, in_format)
+        tick = start
+        for index, (frame, fraction) in enumerate(chunks):
+            result = classify_frame(frame)
+            writer.write(result)
+            counts = result["solution_type"].value_counts()
+            for label, count in counts.items():
+                report.counts[label] = report.counts.get(label, 0) + int(count)
+            now = time.perf_counter()
+            chunk = ChunkReport(index, len(frame), int(counts.get(INVALID_LABEL, 0)), now - tick, fraction)
+            tick = now
+            report.rows += chunk.rows
+            report.chunks.append(chunk)
+            if progress is not None:
+                progress(chunk)
+    finally:
+        writer.close()
+        report.seconds = time.perf_counter() - start
+    return report
+
+
+def input_errors() -> tuple[type[Exception], ...]:
+    """
+    The exceptions `classify_file` raises for a file it cannot read, to report instead of crash.
+
+    They are ValueError and ImportError, plus ``pyarrow.ArrowException`` when pyarrow is
+    installed, for a file pyarrow cannot parse or write.
+    """
+    if not pyarrow_installed():
+        return ValueError, ImportError
+    import pyarrow
+
+    return ValueError, ImportError, pyarrow.ArrowException
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.bulk", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", type=Path, help="CSV or Parquet file with the columns a1 .. c2 or a1 .. d3.")
+    parser.add_argument("--out", type=Path, required=True, help="Output file; .parquet writes Parquet, anything else CSV.")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help=f"Rows per chunk (default: {DEFAULT_CHUNK_ROWS:,}).")
+    parser.add_argument("--report", type=Path, help="Write the per-chunk report as JSON.")
+    args = parser.parse_args(argv)
+
+    def show(chunk: ChunkReport) -> None:
+        done = f"{chunk.progress:6.1%}" if chunk.progress is not None else "     ?"
+        print(f"chunk {chunk.index:>5} {done} {chunk.rows:>9,} rows {chunk.seconds * 1000:>9.1f} ms {chunk.rows_per_second:>12,.0f} rows/s", file=sys.stderr)
+
+    out_format = "parquet" if args.out.suffix.lower() == ".parquet" else "csv"
+    report = classify_file(args.input, args.out, args.chunk_rows, out_format=out_format, progress=show)
+    print(f"Classified {report.rows:,} rows in {report.seconds:.2f} s ({report.rows_per_second:,.0f} rows/s): "
+          + ", ".join(f"{label} {count:,}" for label, count in report.counts.items()), file=sys.stderr)
+    if args.report:
+        args.report.write_text(report.to_json(), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Bounded, thread-safe LRU cache keyed by the canonical form of a linear system.
+
+Streamlit imports this module once per server process, so `SYSTEM_CACHE` is shared by
+every session. Equivalent systems (rows reordered, or scaled without rounding) map to the
+same key, and systems that differ in any bit do not.
+"""
+import dataclasses
+import math
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Snapshot of the counters of an `LRUCache`.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def estimate_nbytes(value: Any) -> int:
+    """
+    Roughly estimates the memory held by a cached value, counting numpy buffers in full.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sys.getsizeof(value) + sum(estimate_nbytes(getattr(value, f.name)) for f in dataclasses.fields(value))
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by both entry count and estimated memory.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of entries kept.
+    max_bytes : int
+        Maximum total of `estimate_nbytes` over all entries. A single value larger than
+        this is returned to the caller but never stored.
+
+    Examples
+    --------
+    >>> cache = LRUCache(max_entries=2)
+    >>> cache.get_or_compute("a", lambda: 1), cache.get_or_compute("a", lambda: 2)
+    (1, 1)
+    >>> cache.stats().hits
+    1
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value and marks it as recently used, or ``default`` on a miss.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key][0]
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used entries until both caps hold.
+        """
+        nbytes = estimate_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._nbytes -= self._data.pop(key)[1]
+            self._data[key] = (value, nbytes)
+            self._nbytes += nbytes
+            while len(self._data) > self.max_entries or self._nbytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._nbytes -= evicted
+                self._evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for ``key``, computing and storing it on a miss.
+
+        ``compute`` runs without holding the lock, so two sessions missing the same key at
+        once may both compute it; the second result simply replaces the first.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key][0]
+            self._misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._data), self._nbytes)
+
+    def clear(self) -> None:
+        """
+        Drops every entry and resets the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self._nbytes = self._hits = self._misses = self._evictions = 0
+
+
+def canonical_row(row) -> tuple:
+    """
+    Normalizes one equation so that equivalent multiples of it give the same tuple, and
+    distinct equations never do.
+
+    Integer rows are divided by the gcd of their entries, so every integer multiple maps to
+    one tuple. Other rows keep their exact float values, scaled by the power of two that
+    brings the largest absolute entry into [0.5, 1): dividing by any other factor rounds,
+    and rows a rounding error apart can have different solutions. Either way the first
+    non-zero entry is made positive. An all-zero row stays all zeros.
+
+    Examples
+    --------
+    >>> canonical_row([-2, -2, -2, -4])
+    (1, 1, 1, 2)
+    >>> canonical_row([0.5, 0.0, -1.0, 0.25])
+    (0.25, 0.0, -0.5, 0.125)
+    >>> canonical_row([1, 0, 0, 1.0000000000001]) == canonical_row([1, 0, 0, 1])
+    False
+    """
+    values = [float(v) for v in row]
+    if all(v.is_integer() and abs(v) < 2**53 for v in values):
+        ints = [int(v) for v in values]
+        divisor = math.gcd(*ints) or 1
+        sign = next((-1 if v < 0 else 1 for v in ints if v != 0), 1)
+        return tuple(sign * v // divisor for v in ints)
+    sign = next((-1.0 if v < 0 else 1.0 for v in values if v != 0), 1.0)
+    exponent = math.frexp(max(abs(v) for v in values))[1]
+    scaled = [math.ldexp(sign * v, -exponent) + 0.0 for v in values]
+    # Entries that would lose bits to underflow keep their own scale.
+    if any(math.ldexp(s, exponent) != sign * v for s, v in zip(scaled, values)):
+        scaled = [sign * v + 0.0 for v in values]
+    return tuple(scaled)
+
+
+def canonical_system(rows) -> tuple[tuple[tuple, ...], tuple[int, ...]]:
+    """
+    Returns the canonical key of a system and the position of each original row in it.
+
+    The key is the sorted tuple of `canonical_row` values, so reordering the equations, or
+    scaling them by a factor that leaves them exact, does not change it. ``order[i]`` is the index in the key of the i-th input row,
+    which lets per-row data such as colors be mapped back onto cached geometry.
+
+    Examples
+    --------
+    >>> canonical_system([[2, 4, 2, 6], [1, 0, 0, 1]])
+    (((1, 0, 0, 1), (1, 2, 1, 3)), (1, 0))
+    """
+    canonical = [canonical_row(row) for row in rows]
+    ranking = sorted(range(len(canonical)), key=lambda i: canonical[i])
+    order = [0] * len(canonical)
+    for position, i in enumerate(ranking):
+        order[i] = position
+    return tuple(canonical[i] for i in ranking), tuple(order)
+
+
+SYSTEM_CACHE = LRUCache()
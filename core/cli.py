@@ -0,0 +1,217 @@
+"""
+Headless batch renderer: classifies and draws every system of a CSV or JSONL file.
+
+    python -m core.cli systems.csv --out renders --workers 4 > manifest.jsonl
+
+Each record holds the coefficients ``a1 .. c2`` of two lines or ``a1 .. d3`` of three
+planes, plus an optional ``id`` used as the file name. Records are rendered in chunks on a
+process pool and a JSON line per system (classification, solution, output path, render
+time) is written to the manifest as soon as its chunk finishes. Streamlit is never imported
+and matplotlib figures are drawn without ``pyplot``, so no display is needed.
+
+Lines are drawn as PNG and planes as HTML unless ``--format`` says otherwise; PNG and SVG
+planes need the optional ``kaleido`` package. The exit status is 1 when any record could
+not be read or rendered; its manifest entry holds the error.
+"""
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+from core.bulk import classify_batch
+from core.figures import LINE_COLORS, PLANE_COLORS, plot_3_planes, plot_lines
+from core.kinds import LINE_LABELS, ONE_SOLUTION, PLANE_LABELS
+from core.lines import COLUMNS as LINE_COLUMNS
+from core.planes import COLUMNS as PLANE_COLUMNS
+
+FORMATS = ("png", "svg", "html")
+DEFAULT_FORMATS = {len(LINE_COLUMNS): "png", len(PLANE_COLUMNS): "html"}
+
+
+def read_records(path: Path):
+    """
+    Yields the records of a CSV (header row) or JSONL (one object per line) file as dicts.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.suffix.lower() == ".csv":
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def system_columns(record: dict) -> tuple[str, ...]:
+    """
+    Returns `core.planes.COLUMNS` or `core.lines.COLUMNS`, whichever the record provides.
+
+    Raises
+    ------
+    ValueError
+        If the record has neither set of coefficients.
+    """
+    for columns in (PLANE_COLUMNS, LINE_COLUMNS):
+        if all(name in record for name in columns):
+            return columns
+    raise ValueError(f"Expected the columns {', '.join(LINE_COLUMNS)} or {', '.join(PLANE_COLUMNS)}.")
+
+
+def render_system(coefficients: list[float], path: Path) -> None:
+    """
+    Draws one system with `plot_lines` or `plot_3_planes` and writes it to ``path``.
+
+    The format follows the file suffix. Static images of planes need the optional
+    ``kaleido`` package.
+    """
+    fmt = path.suffix[1:]
+    if len(coefficients) == len(LINE_COLUMNS):
+        if fmt == "html":
+            plot_lines(*coefficients, *LINE_COLORS, backend="plotly").write_html(path, include_plotlyjs="cdn")
+        else:
+            plot_lines(*coefficients, *LINE_COLORS).savefig(path, format=fmt)
+        return
+    fig = plot_3_planes(*coefficients, *PLANE_COLORS, compact=True)
+    if fmt == "html":
+        fig.write_html(path, include_plotlyjs="cdn")
+    else:
+        fig.write_image(path, format=fmt)
+
+
+def render_chunk(chunk: list[tuple[str, list[float]]], out_dir: Path, fmt: str | None) -> list[dict]:
+    """
+    Classifies a chunk of same-sized systems in one batch and renders each of them, in
+    ``fmt`` or else in the `DEFAULT_FORMATS` entry for their size. Every system gets the
+    type it has on its own (see `core.bulk.classify_batch`), whatever ``--chunk-size`` and
+    its neighbours in the file.
+
+    Returns one manifest entry per system, with an ``error`` instead of an output path when
+    rendering failed.
+    """
+    fmt = fmt or DEFAULT_FORMATS[len(chunk[0][1])]
+    kind, point = classify_batch(np.array([coefficients for _, coefficients in chunk], dtype=float))
+    labels = LINE_LABELS if point.shape[1] == 2 else PLANE_LABELS
+    entries = []
+    for (name, coefficients), system_kind, solution in zip(chunk, kind, point):
+        path = out_dir / f"{name}.{fmt}"
+        entry = {
+            "id": name,
+            "classification": labels[system_kind],
+            "solution": solution.tolist() if system_kind == ONE_SOLUTION else None,
+        }
+        start = time.perf_counter()
+        try:
+            render_system(coefficients, path)
+        except Exception as error:  # One bad render (e.g. kaleido missing) must not stop the batch.
+            entry["error"] = str(error).strip()
+        else:
+            entry["output"] = str(path)
+            entry["render_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        entries.append(entry)
+    return entries
+
+
+def parse_records(records, errors: list[dict]):
+    """
+    Yields ``(id, coefficients)`` for every valid record, appending an error entry for the others.
+
+    The id is the record's ``id`` field, or its 1-based position, reduced to characters
+    that are safe in a file name.
+    """
+    for position, record in enumerate(records, start=1):
+        name = re.sub(r"[^\w.-]", "_", str(record.get("id") or position))
+        try:
+            yield name, [float(record[column]) for column in system_columns(record)]
+        except (KeyError, TypeError, ValueError) as error:
+            errors.append({"id": name, "error": str(error)})
+
+
+def chunked(items, size: int):
+    """
+    Splits ``items`` into lists of ``size`` systems that all have the same number of coefficients.
+    """
+    chunk = []
+    for item in items:
+        if chunk and len(item[1]) != len(chunk[0][1]):
+            yield chunk
+            chunk = []
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.cli", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", type=Path, help="CSV or JSONL file of systems.")
+    parser.add_argument("--out", type=Path, default=Path("renders"), help="Directory for the rendered files.")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: png for lines, html for planes).")
+    parser.add_argument("--manifest", type=Path, help="Write the JSONL manifest here instead of stdout.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0 renders in this process).")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Systems classified and rendered per task.")
+    parser.add_argument("--max-tasks-per-child", type=int, default=50, help="Restart a worker after this many chunks to bound its memory.")
+    args = parser.parse_args(argv)
+
+    if args.format in ("png", "svg") and importlib.util.find_spec("kaleido") is None:
+        print("Note: PNG/SVG output of planes needs the optional kaleido package; lines work without it.", file=sys.stderr)
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    errors: list[dict] = []
+    chunks = chunked(parse_records(read_records(args.input), errors), args.chunk_size)
+    manifest = open(args.manifest, "w", encoding="utf-8") if args.manifest else sys.stdout
+    rendered = failed = 0
+    start = time.perf_counter()
+
+    def write(entries: list[dict]) -> None:
+        nonlocal rendered, failed
+        for entry in entries:
+            manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        manifest.flush()
+        rendered += sum("output" in entry for entry in entries)
+        failed += sum("error" in entry for entry in entries)
+
+    try:
+        if args.workers == 0:
+            for chunk in chunks:
+                write(render_chunk(chunk, args.out, args.format))
+                write(errors)
+                errors.clear()
+        else:
+            workers = args.workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(workers, max_tasks_per_child=args.max_tasks_per_child) as pool:
+                # Only a few chunks per worker are in flight, so memory stays bounded for any input size.
+                limit = 2 * workers
+                pending = set()
+                for chunk in chunks:
+                    pending.add(pool.submit(render_chunk, chunk, args.out, args.format))
+                    if len(pending) >= limit:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            write(future.result())
+                    write(errors)
+                    errors.clear()
+                for future in wait(pending).done:
+                    write(future.result())
+        write(errors)
+    finally:
+        if manifest is not sys.stdout:
+            manifest.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {rendered} systems in {elapsed:.2f} s ({rendered / elapsed:.1f}/s).", file=sys.stderr)
+    if failed:
+        print(f"{failed} systems failed; see the error field of their manifest entries.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""
+Exact classification of integer systems with fraction-free (Bareiss) elimination.
+
+Every intermediate value of fraction-free Gauss-Jordan elimination is a minor of the
+original augmented matrix, so integer systems are reduced with integer arithmetic only:
+no rounding and no tolerance. The batch kernel runs in ``int64`` when Hadamard's bound
+guarantees there is no overflow and falls back to Python integers otherwise.
+"""
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import NamedTuple
+
+import numpy as np
+
+from core.kinds import INFINITE_SOLUTIONS, NO_SOLUTION, ONE_SOLUTION
+
+METHODS = ("auto", "exact", "float")
+SMALL_BATCH = 8
+SMALL_ARRAY = 64
+
+
+class ReductionStep(NamedTuple):
+    """
+    One row operation of `row_reduction_steps` and the augmented matrix after it.
+    """
+
+    description: str
+    matrix: tuple[tuple[int, ...], ...]
+
+    def latex(self) -> str:
+        """
+        Returns the matrix as a LaTeX augmented matrix with a bar before the constant column.
+        """
+        columns = len(self.matrix[0])
+        body = r" \\ ".join(" & ".join(str(v) for v in row) for row in self.matrix)
+        return rf"\left[\begin{{array}}{{{'r' * (columns - 1)}|r}} {body} \end{{array}}\right]"
+
+
+@dataclass(frozen=True)
+class ExactClassification:
+    """
+    Result of classifying a batch of integer systems exactly.
+
+    Attributes
+    ----------
+    kind : np.ndarray
+        ``int8`` array of shape (N,) holding ``NO_SOLUTION``, ``ONE_SOLUTION`` or ``INFINITE_SOLUTIONS``.
+    rank_A : np.ndarray
+        Rank of the coefficient matrix, shape (N,).
+    rank_Ab : np.ndarray
+        Rank of the augmented matrix [A|b], shape (N,).
+    numerator : np.ndarray
+        Integer array of shape (N, n). ``numerator / denominator`` is the unique solution, or
+        the solution with every free variable set to zero. Zero for inconsistent systems.
+    denominator : np.ndarray
+        Positive integer array of shape (N,).
+    direction : np.ndarray
+        Integer array of shape (N, n) spanning the solution line when there is exactly one
+        free variable, zero otherwise.
+    """
+
+    kind: np.ndarray
+    rank_A: np.ndarray
+    rank_Ab: np.ndarray
+    numerator: np.ndarray
+    denominator: np.ndarray
+    direction: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def solution(self, i: int = 0) -> tuple[Fraction, ...] | None:
+        """
+        Returns the exact solution point of system ``i``, or None if it is inconsistent.
+        """
+        if self.kind[i] == NO_SOLUTION:
+            return None
+        den = int(self.denominator[i])
+        return tuple(Fraction(int(num), den) for num in self.numerator[i])
+
+    def point(self) -> np.ndarray:
+        """
+        Returns the solution points as floats, NaN where a system is inconsistent.
+        """
+        point = self.numerator.astype(float) / self.denominator.astype(float)[:, np.newaxis]
+        point[self.kind == NO_SOLUTION] = np.nan
+        return point
+
+
+def fraction_latex(value: Fraction) -> str:
+    """
+    Formats a fraction for ``st.latex``, e.g. ``-\\frac{1}{2}`` or ``3``.
+    """
+    if value.denominator == 1:
+        return str(value.numerator)
+    sign = "-" if value < 0 else ""
+    return rf"{sign}\frac{{{abs(value.numerator)}}}{{{value.denominator}}}"
+
+
+def is_integral(values) -> bool:
+    """
+    Returns True when every value is a finite integer that a float represents exactly.
+    """
+    arr = np.asarray(values, dtype=float)
+    if arr.size <= SMALL_ARRAY:
+        # On one system a loop over Python floats beats three numpy reductions several times over.
+        return all(value.is_integer() and abs(value) < 2**53 for value in arr.ravel().tolist())
+    return bool(np.all(np.isfinite(arr)) and np.all(arr == np.round(arr)) and np.all(np.abs(arr) < 2**53))
+
+
+def integral_systems(systems) -> np.ndarray:
+    """
+    Returns a boolean mask of the systems in an (N, m, k) stack that pass `is_integral`.
+
+    A batch can then send each system to the engine it would get on its own, whatever
+    else shares the batch.
+
+    Examples
+    --------
+    >>> integral_systems([[[1, 2], [3, 4]], [[1, 2], [3, 4.5]]]).tolist()
+    [True, False]
+    """
+    arr = np.asarray(systems, dtype=float)
+    flat = arr.reshape(len(arr), -1)
+    with np.errstate(invalid="ignore"):
+        return np.isfinite(flat).all(axis=1) & (flat == np.round(flat)).all(axis=1) & (np.abs(flat) < 2**53).all(axis=1)
+
+
+def use_exact(values, method: str = "auto") -> bool:
+    """
+    Resolves a ``method`` argument to True (exact engine) or False (float SVD).
+
+    ``"auto"`` picks the exact engine for integer input and falls back to float SVD otherwise.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` is unknown, or ``"exact"`` is requested for non-integer input.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}.")
+    if method == "float":
+        return False
+    integral = is_integral(values)
+    if method == "exact" and not integral:
+        raise ValueError("The exact method needs integer coefficients.")
+    return integral
+
+
+def _integer_array(aug: np.ndarray) -> np.ndarray:
+    """
+    Casts integral values to ``int64`` when no intermediate can overflow, else to Python ints.
+    """
+    m, k = aug.shape[-2:]
+    largest = float(np.abs(aug).max()) if aug.size else 0.0
+    # Hadamard: every minor is bounded by (sqrt(k) * largest)^min(m, k); each update
+    # multiplies two minors and subtracts another product.
+    minor_bound = (np.sqrt(k) * max(largest, 1.0)) ** min(m, k)
+    if 2 * minor_bound**2 < 2**62:
+        return aug.astype(np.int64)
+    return np.vectorize(int, otypes=[object])(aug)
+
+
+def _eliminate_batch(M: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fraction-free Gauss-Jordan elimination of a stack of integer matrices, one column at a time.
+
+    Returns the reduced matrices, the pivot row of every column (-1 for none) and the last pivot.
+    """
+    N, m, k = M.shape
+    batch = np.arange(N)
+    row_index = np.arange(m)
+    r = np.zeros(N, dtype=np.intp)
+    prev = np.ones(N, dtype=M.dtype)
+    pivot_rows = np.full((N, k), -1, dtype=np.intp)
+
+    for col in range(k):
+        candidates = (M[:, :, col] != 0) & (row_index >= r[:, np.newaxis])
+        found = candidates.any(axis=1)
+        if not found.any():
+            continue
+        target = np.minimum(r, m - 1)
+        source = candidates.argmax(axis=1)
+        swap = batch[found]
+        M[swap, target[found]], M[swap, source[found]] = M[swap, source[found]], M[swap, target[found]]
+
+        pivot_row = M[batch, target]
+        pivot = pivot_row[:, col]
+        update = (pivot[:, np.newaxis, np.newaxis] * M - M[:, :, col:col + 1] * pivot_row[:, np.newaxis, :])
+        update //= prev[:, np.newaxis, np.newaxis]
+        others = found[:, np.newaxis] & (row_index != target[:, np.newaxis])
+        M = np.where(others[:, :, np.newaxis], update, M)
+
+        prev = np.where(found, pivot, prev)
+        pivot_rows[found, col] = target[found]
+        r = r + found
+    return M, pivot_rows, prev
+
+
+def _eliminate_rows(M: list[list[int]], steps: list[ReductionStep] | None = None) -> tuple[list[list[int]], list[int], int]:
+    """
+    The same elimination as `_eliminate_batch` on one matrix of Python ints, modified in place.
+
+    When ``steps`` is given, every swap and row update is appended to it.
+    """
+    m, k = len(M), len(M[0])
+    pivot_rows = [-1] * k
+    r, prev = 0, 1
+    for col in range(k):
+        if r == m:
+            break
+        source = next((i for i in range(r, m) if M[i][col] != 0), None)
+        if source is None:
+            continue
+        if source != r:
+            M[r], M[source] = M[source], M[r]
+            if steps is not None:
+                steps.append(ReductionStep(f"Swap R{r + 1} and R{source + 1}", tuple(map(tuple, M))))
+        pivot = M[r][col]
+        for i in range(m):
+            if i == r or (M[i][col] == 0 and pivot == prev):
+                continue
+            factor = M[i][col]
+            M[i] = [(pivot * M[i][j] - factor * M[r][j]) // prev for j in range(k)]
+            if steps is not None:
+                sign = "−" if factor >= 0 else "+"
+                steps.append(ReductionStep(
+                    f"R{i + 1} → ({pivot}·R{i + 1} {sign} {abs(factor)}·R{r + 1}) / {prev}", tuple(map(tuple, M))
+                ))
+        pivot_rows[col] = r
+        prev = pivot
+        r += 1
+    return M, pivot_rows, prev
+
+
+def _summarize_rows(M: list[list[int]], pivot_rows: list[int], prev: int, n: int) -> tuple:
+    """
+    Reads kind, ranks, solution and line direction off one matrix reduced by `_eliminate_rows`.
+    """
+    rank_A = sum(p >= 0 for p in pivot_rows[:n])
+    rank_Ab = sum(p >= 0 for p in pivot_rows)
+    if rank_A < rank_Ab:
+        kind = NO_SOLUTION
+    elif rank_A == n:
+        kind = ONE_SOLUTION
+    else:
+        kind = INFINITE_SOLUTIONS
+    sign = -1 if prev < 0 else 1
+    numerator = [sign * M[p][n] if p >= 0 and kind != NO_SOLUTION else 0 for p in pivot_rows[:n]]
+    direction = [0] * n
+    if kind == INFINITE_SOLUTIONS and rank_A == n - 1:
+        free = pivot_rows.index(-1)
+        direction = [-sign * M[p][free] if p >= 0 else 0 for p in pivot_rows[:n]]
+        direction[free] = sign * prev
+    return kind, rank_A, rank_Ab, numerator, sign * prev, direction
+
+
+def classify_exact(systems, unknowns: int | None = None) -> ExactClassification:
+    """
+    Classifies a batch of integer systems with fraction-free Gauss-Jordan elimination.
+
+    Parameters
+    ----------
+    systems : array-like
+        Augmented matrices [A|b] of shape (m, n + 1) or (N, m, n + 1) with integer entries.
+    unknowns : int, optional
+        Number of unknowns n. Defaults to the number of columns minus one.
+
+    Returns
+    -------
+    ExactClassification
+        Exact solution types, ranks, and the solution as integer numerators over a common
+        denominator.
+
+    Raises
+    ------
+    ValueError
+        If the input is not integral or has the wrong shape.
+
+    Examples
+    --------
+    >>> result = classify_exact([[1, 1, 1, 1], [2, 1, 1, 2], [1, 2, 1, 3]])
+    >>> result.kind.tolist(), result.solution(0)
+    ([1], (Fraction(1, 1), Fraction(2, 1), Fraction(-2, 1)))
+
+    Notes
+    -----
+    The elimination loops over columns only; every system in the batch is updated at once,
+    each with its own pivot row. Batches of at most ``SMALL_BATCH`` systems run the same
+    steps on plain Python integers instead. Column k is eliminated from every other row with
+    ``R_i = (p * R_i - R_i[k] * R_r) / p_prev``, where p is the new pivot and p_prev the
+    previous one. The division is always exact. At the end every pivot equals the last one,
+    d, so the right-hand side holds d times the solution.
+    """
+    aug = np.asarray(systems)
+    if aug.ndim == 2:
+        aug = aug[np.newaxis]
+    if aug.ndim != 3 or aug.shape[2] < 2:
+        raise ValueError(f"Expected augmented matrices of shape (N, m, n + 1), got {aug.shape}.")
+    if not is_integral(aug):
+        raise ValueError("Exact classification needs integer coefficients.")
+    n = aug.shape[2] - 1 if unknowns is None else unknowns
+
+    values = aug.astype(float)
+    dtype = _integer_array(values).dtype
+    if len(aug) <= SMALL_BATCH:
+        # Below a handful of systems numpy's per-call overhead dominates; plain integers win.
+        summaries = [_summarize_rows(*_eliminate_rows([[int(v) for v in row] for row in system]), n) for system in values]
+        kind, rank_A, rank_Ab, numerator, denominator, direction = zip(*summaries)
+        return ExactClassification(
+            kind=np.array(kind, dtype=np.int8),
+            rank_A=np.array(rank_A, dtype=np.int8),
+            rank_Ab=np.array(rank_Ab, dtype=np.int8),
+            numerator=np.array(numerator, dtype=dtype),
+            denominator=np.array(denominator, dtype=dtype),
+            direction=np.array(direction, dtype=dtype),
+        )
+
+    M, pivot_rows, prev = _eliminate_batch(values.astype(dtype) if dtype != object else _integer_array(values))
+    N = len(M)
+    batch = np.arange(N)
+
+    rank_A = np.count_nonzero(pivot_rows[:, :n] >= 0, axis=1)
+    rank_Ab = np.count_nonzero(pivot_rows >= 0, axis=1)
+    consistent = rank_A == rank_Ab
+
+    kind = np.full(N, INFINITE_SOLUTIONS, dtype=np.int8)
+    kind[rank_A == n] = ONE_SOLUTION
+    kind[~consistent] = NO_SOLUTION
+
+    sign = np.where(prev < 0, -1, 1).astype(M.dtype)
+    denominator = prev * sign
+    rhs = M[:, :, n] * sign[:, np.newaxis]
+    numerator = np.zeros((N, n), dtype=M.dtype)
+    direction = np.zeros((N, n), dtype=M.dtype)
+    for col in range(n):
+        has_pivot = pivot_rows[:, col] >= 0
+        numerator[:, col] = np.where(has_pivot, rhs[batch, pivot_rows[:, col]], 0)
+
+    line = consistent & (rank_A == n - 1)
+    if line.any():
+        free = np.argmin(pivot_rows[:, :n] >= 0, axis=1)
+        free_column = M[batch, :, free] * sign[:, np.newaxis]
+        for col in range(n):
+            has_pivot = pivot_rows[:, col] >= 0
+            direction[:, col] = np.where(has_pivot, -free_column[batch, pivot_rows[:, col]], 0)
+        direction[batch, free] = denominator
+        direction[~line] = 0
+    numerator[~consistent] = 0
+
+    return ExactClassification(
+        kind=kind,
+        rank_A=rank_A.astype(np.int8),
+        rank_Ab=rank_Ab.astype(np.int8),
+        numerator=numerator,
+        denominator=denominator,
+        direction=direction,
+    )
+
+
+def exact_kind(system, unknowns: int | None = None) -> int:
+    """
+    Returns the exact solution type of one augmented matrix already known to be integral.
+
+    This is `classify_exact` for a single system without its checks and batch set-up: the
+    caller has run `is_integral` (e.g. through `use_exact`), and the matrix goes straight
+    to the Python-integer elimination.
+
+    Examples
+    --------
+    >>> exact_kind(np.array([[1, 1, 1], [2, 2, 3]]))
+    0
+    """
+    rows = [[int(value) for value in row] for row in np.asarray(system, dtype=float).tolist()]
+    n = len(rows[0]) - 1 if unknowns is None else unknowns
+    return _summarize_rows(*_eliminate_rows(rows), n)[0]
+
+
+def row_reduction_steps(system) -> list[ReductionStep]:
+    """
+    Reduces one integer augmented matrix and records every row operation.
+
+    Parameters
+    ----------
+    system : array-like
+        Augmented matrix [A|b] of shape (m, n + 1) with integer entries.
+
+    Returns
+    -------
+    list[ReductionStep]
+        The starting matrix followed by one entry per swap and elimination, using the same
+        fraction-free updates as `classify_exact`.
+
+    Raises
+    ------
+    ValueError
+        If the input is not integral.
+
+    Examples
+    --------
+    >>> steps = row_reduction_steps([[1, 1, 3], [2, 1, 4]])
+    >>> [step.description for step in steps]
+    ['Start with [A|b]', 'R2 → (1·R2 − 2·R1) / 1', 'R1 → (-1·R1 − 1·R2) / 1']
+    >>> steps[-1].matrix
+    ((-1, 0, -1), (0, -1, -2))
+    """
+    if not is_integral(system):
+        raise ValueError("Row reduction steps need integer coefficients.")
+    M = [[int(v) for v in row] for row in np.asarray(system, dtype=float)]
+    steps = [ReductionStep("Start with [A|b]", tuple(map(tuple, M)))]
+    _eliminate_rows(M, steps)
+    return steps
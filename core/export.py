@@ -0,0 +1,337 @@
+"""
+Self-contained static HTML export of the lines and planes pages.
+
+The exported file embeds the current coefficients and a JavaScript port of the
+classification and clipping (``core/static/linsys.js``), so every edit is solved in the
+browser with no server and no network. The chart is plain SVG: there is no Plotly bundle,
+which keeps a file at about 17 KB. The same input always gives byte-identical output.
+
+The port is checked against the Python engine on a generated corpus with Node.js:
+
+    python -m core.export planes --coefficients 1 1 1 1 2 1 1 2 1 2 1 3 --out planes.html
+    python -m core.export --check --count 5000
+"""
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from core.exact import is_integral
+from core.figures import LINE_COLORS, PLANE_COLORS
+from core.general import classify_system, solve_system
+from core.geometry import DEFAULT_BOUNDS, DEFAULT_VIEWPORT, clip_lines, clip_planes
+from core.kinds import LINE_LABELS, ONE_SOLUTION, PLANE_LABELS
+from core.lines import COLUMNS as LINE_COLUMNS
+from core.planes import COLUMNS as PLANE_COLUMNS, DEFAULT_RTOL
+
+STATIC = Path(__file__).with_name("static")
+SOLVER = STATIC / "linsys.js"
+POINT_RTOL = 1e-8
+VERTEX_ATOL = 1e-9
+BORDERLINE = 10.0
+
+
+class ExportPage(NamedTuple):
+    """
+    What the export of one page needs: its inputs, labels, tolerance and viewing box.
+    """
+
+    title: str
+    names: tuple[str, ...]
+    labels: tuple[str, ...]
+    rtol: float
+    bounds: tuple
+    colors: tuple[str, ...]
+    presets: tuple[tuple[int, ...], ...]
+
+
+# The tolerances are the defaults of `determine_solution` and `determine_solution_3v`.
+PAGES = {
+    "lines": ExportPage(
+        "System of Linear Equations Visualizer", LINE_COLUMNS, LINE_LABELS, DEFAULT_RTOL, DEFAULT_VIEWPORT, LINE_COLORS,
+        ((1, 1, 1, 1, 1, 2), (1, 1, 1, 2, 2, 2), (1, 1, 3, 2, 1, 4)),
+    ),
+    "planes": ExportPage(
+        "System of Equations as Planes (3x3)", PLANE_COLUMNS, PLANE_LABELS, DEFAULT_RTOL, DEFAULT_BOUNDS, PLANE_COLORS,
+        ((1, 1, 1, 1, 1, 1, 1, 2, 1, 1, 1, 3), (1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3), (1, 1, 1, 1, 2, 1, 1, 2, 1, 2, 1, 3)),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class CrossCheck:
+    """
+    Outcome of comparing the JavaScript port with the Python engine on one corpus.
+
+    Attributes
+    ----------
+    page : str
+        "lines" or "planes".
+    systems : int
+        Number of systems compared.
+    kind_mismatches : int
+        Systems whose solution type differs although every rank and consistency test of
+        the Python engine is further than a factor `BORDERLINE` from its tolerance.
+    borderline : int
+        Systems whose solution type differs on a test that close to its tolerance. Their
+        answer is decided by rounding in the last bits, which a different SVD algorithm
+        rounds differently, so they are reported but do not fail the check.
+    point_mismatches : int
+        Systems with one solution whose point differs by more than `POINT_RTOL` plus the
+        forward error ``10 * condition number * eps`` of the solve, both relative to the point.
+    geometry_mismatches : int
+        Systems where any clipped polygon or segment differs by more than `VERTEX_ATOL`.
+    examples : tuple
+        Up to five mismatching augmented matrices, for reproducing a failure.
+    """
+
+    page: str
+    systems: int
+    kind_mismatches: int
+    borderline: int
+    point_mismatches: int
+    geometry_mismatches: int
+    examples: tuple
+
+    @property
+    def ok(self) -> bool:
+        return not (self.kind_mismatches or self.point_mismatches or self.geometry_mismatches)
+
+
+@lru_cache(maxsize=None)
+def _static(name: str) -> str:
+    return (STATIC / name).read_text(encoding="utf-8")
+
+
+def _number(value: float) -> int | float:
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def export_html(page: str, coefficients, colors=None) -> str:
+    """
+    Builds the standalone HTML file of a page for the given coefficients.
+
+    Parameters
+    ----------
+    page : str
+        "lines" (six coefficients ``a1 .. c2``) or "planes" (twelve, ``a1 .. d3``).
+    coefficients : sequence of float
+        Starting values of the inputs, in `core.lines.COLUMNS` or `core.planes.COLUMNS` order.
+    colors : sequence of str, optional
+        One color per equation, the page defaults otherwise.
+
+    Returns
+    -------
+    str
+        The HTML document. It depends only on the arguments, so repeated exports are identical.
+
+    Raises
+    ------
+    ValueError
+        If the page is unknown or the number of coefficients or colors does not match it.
+
+    Examples
+    --------
+    >>> html = export_html("lines", [1, 1, 3, 2, 1, 4])
+    >>> html == export_html("lines", [1.0, 1.0, 3.0, 2.0, 1.0, 4.0]), "<script src" in html
+    (True, False)
+    """
+    if page not in PAGES:
+        raise ValueError(f"Unknown page {page!r}, expected one of {tuple(PAGES)}.")
+    spec = PAGES[page]
+    colors = tuple(colors or spec.colors)
+    if len(coefficients) != len(spec.names) or len(colors) != len(spec.colors):
+        raise ValueError(f"The {page} page takes {len(spec.names)} coefficients and {len(spec.colors)} colors.")
+    state = {
+        "page": page,
+        "names": list(spec.names),
+        "labels": list(spec.labels),
+        "rtol": spec.rtol,
+        "bounds": [list(axis) for axis in spec.bounds],
+        "colors": list(colors),
+        "coefficients": [_number(v) for v in coefficients],
+    }
+    # "</" would end the script element early; "<\/" is the same string to the JSON parser.
+    state_json = json.dumps(state, ensure_ascii=False, sort_keys=True, separators=(",", ":")).replace("</", "<\\/")
+    html = _static("export.html")
+    for marker, value in (
+        ("{{title}}", escape(spec.title)),
+        ("{{state}}", state_json),
+        ("{{solver}}", _static("linsys.js").strip()),
+        ("{{viewer}}", _static("viewer.js").strip()),
+    ):
+        html = html.replace(marker, value)
+    return html
+
+
+def check_corpus(page: str, count: int = 2_000, seed: int = 0) -> np.ndarray:
+    """
+    Generates augmented matrices of shape (N, m, m + 1) that exercise every branch of the port.
+
+    The corpus mixes the page presets and degenerate rows with four generated groups:
+    - small integers, which go through the exact engine;
+    - integer systems with a dependent row, which may or may not be consistent;
+    - general floats;
+    - float systems whose last row is a combination of the others, the rank-deficient case
+      that float rounding makes hardest. Half of them get a shifted constant, so they have
+      no solution;
+    - the same with the last row, or only its constant, nudged by a relative amount spread
+      over three orders of magnitude either side of the page's tolerance, so the tolerance
+      tests themselves are exercised.
+    """
+    rng = np.random.default_rng(seed)
+    m = len(PAGES[page].colors)
+    spec = PAGES[page]
+    shape = (count // 5, m, m + 1)
+    integers = rng.integers(-4, 5, shape).astype(float)
+    dependent = rng.integers(-4, 5, shape).astype(float)
+    weights = rng.integers(-2, 3, (shape[0], m - 1))
+    dependent[:, -1] = np.einsum("nk,nkc->nc", weights, dependent[:, :-1])
+    dependent[:, -1, -1] += rng.integers(0, 2, shape[0])
+    floats = rng.normal(0.0, 5.0, shape).round(2)
+    combined = rng.normal(0.0, 5.0, shape).round(1)
+    mix = rng.choice([0.1, 0.2, 0.3, 0.5, 1.5], (shape[0], m - 1))
+    combined[:, -1] = np.einsum("nk,nkc->nc", mix, combined[:, :-1])
+    near = combined.copy()
+    combined[::2, -1, -1] += 1.0
+    nudge = 10.0 ** rng.uniform(np.log10(spec.rtol) - 3, np.log10(spec.rtol) + 3, (shape[0], 1))
+    noise = rng.normal(0.0, 1.0, (shape[0], m + 1))
+    noise[::2, :-1] = 0.0  # Only the constant: the rank stays deficient and only consistency changes.
+    near[:, -1] += noise * nudge * np.abs(near[:, -1]).max(axis=1, keepdims=True)
+    special = np.array(spec.presets, dtype=float).reshape(-1, m, m + 1)
+    zeros = np.zeros((3, m, m + 1))
+    zeros[1, 0, -1] = 1.0  # 0 = 1
+    zeros[2, 0] = np.arange(1, m + 2)
+    return np.concatenate([special, zeros, integers, dependent, floats, combined, near])
+
+
+def run_solver(page: str, systems) -> list[dict]:
+    """
+    Classifies and clips ``systems`` with the JavaScript port under Node.js.
+
+    Raises
+    ------
+    RuntimeError
+        If Node.js is not installed.
+    """
+    spec = PAGES[page]
+    payload = {"page": page, "rtol": spec.rtol, "bounds": spec.bounds, "systems": np.asarray(systems, dtype=float).tolist()}
+    try:
+        result = subprocess.run(["node", str(SOLVER)], input=json.dumps(payload), capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise RuntimeError("The cross-check runs the JavaScript port with Node.js, which was not found on PATH.") from None
+    return json.loads(result.stdout)
+
+
+def _tolerance_margin(aug: np.ndarray, rtol: float) -> float:
+    """
+    How far the float engine's closest decision is from its tolerance, as a factor >= 1.
+
+    Mirrors the rank tests of `core.general._solve` on A and on [A|b].
+    """
+    m, k = aug.shape
+    s = np.linalg.svd(aug[:, :-1], compute_uv=False)
+    s_aug = np.linalg.svd(aug, compute_uv=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.concatenate([s / (rtol * max(m, k - 1) * s[0]), s_aug / (rtol * max(m, k) * s_aug[0])])
+        factors = np.abs(np.log(ratios))
+    return float(np.exp(np.nanmin(factors)))
+
+
+def _same_polygon(js: list, py: np.ndarray) -> bool:
+    # Compared up to the starting vertex: a vertex at exactly -pi or pi may start either list.
+    if len(js) != len(py):
+        return False
+    if not len(py):
+        return True
+    js = np.array(js)
+    return any(np.allclose(np.roll(js, shift, axis=0), py, rtol=0, atol=VERTEX_ATOL) for shift in range(len(py)))
+
+
+def cross_check(page: str, count: int = 2_000, seed: int = 0) -> CrossCheck:
+    """
+    Compares the solution type, unique point and clipped geometry of the port with Python.
+
+    The Python side is what the page shows: `classify_system` with the page's tolerance and
+    the "auto" method, `solve_system` with the same for the point, and `clip_planes` or
+    `clip_lines`.
+    """
+    spec = PAGES[page]
+    corpus = check_corpus(page, count, seed)
+    results = run_solver(page, corpus)
+    m = corpus.shape[1]
+    if page == "planes":
+        vertices, counts = clip_planes(corpus.reshape(-1, 4), spec.bounds)
+        shapes = [vertices[i, :counts[i]] for i in range(len(counts))]
+    else:
+        segments, visible = clip_lines(corpus.reshape(-1, 3), spec.bounds)
+        shapes = [segments[i] if visible[i] else np.empty((0, 2)) for i in range(len(visible))]
+
+    kinds = borderline = points = geometry = 0
+    examples = []
+    for index, (aug, js) in enumerate(zip(corpus, results)):
+        kind = classify_system(aug, rtol=spec.rtol, method="auto")
+        wrong_kind = js["kind"] != kind
+        if wrong_kind and not is_integral(aug) and _tolerance_margin(aug, spec.rtol) < BORDERLINE:
+            borderline += 1
+            continue
+        wrong_point = False
+        if kind == ONE_SOLUTION and not wrong_kind:
+            expected = solve_system(aug, rtol=spec.rtol, method="auto").particular
+            bound = POINT_RTOL + 10 * np.linalg.cond(aug[:, :-1]) * np.finfo(float).eps
+            wrong_point = not np.allclose(js["point"], expected, rtol=0, atol=bound * max(1.0, np.abs(expected).max()))
+        wrong_geometry = not all(
+            _same_polygon(shape or [], expected) for shape, expected in zip(js["geometry"], shapes[index * m:(index + 1) * m])
+        )
+        kinds += wrong_kind
+        points += wrong_point
+        geometry += wrong_geometry
+        if (wrong_kind or wrong_point or wrong_geometry) and len(examples) < 5:
+            examples.append(aug.tolist())
+    return CrossCheck(page, len(corpus), kinds, borderline, points, geometry, tuple(examples))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("page", nargs="?", choices=sorted(PAGES), default="planes")
+    parser.add_argument("--coefficients", nargs="+", type=float, help="Starting coefficients (default: the first preset).")
+    parser.add_argument("--colors", nargs="+", help="One color per equation.")
+    parser.add_argument("--out", type=Path, help="Write the HTML here instead of to stdout.")
+    parser.add_argument("--check", action="store_true", help="Cross-check the JavaScript port against Python on both pages.")
+    parser.add_argument("--count", type=int, default=2_000, help="Generated systems per page for --check.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failed = False
+        for page in PAGES:
+            report = cross_check(page, args.count, args.seed)
+            failed |= not report.ok
+            print(f"{page}: {report.systems} systems, {report.kind_mismatches} kind, {report.point_mismatches} point "
+                  f"and {report.geometry_mismatches} geometry mismatches ({report.borderline} borderline)")
+            for example in report.examples:
+                print(f"  {example}")
+        return 1 if failed else 0
+
+    try:
+        html = export_html(args.page, args.coefficients or PAGES[args.page].presets[-1], args.colors)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.out:
+        args.out.write_text(html, encoding="utf-8")
+        print(f"Wrote {len(html.encode()):,} bytes to {args.out}", file=sys.stderr)
+    else:
+        sys.stdout.write(html)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
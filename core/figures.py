@@ -0,0 +1,659 @@
+"""
+Figures for the pages and for batch rendering: two lines in 2D and three planes in 3D.
+
+Nothing here imports Streamlit, so the same figures can be rendered headlessly. Plotly and
+matplotlib are imported inside the functions that draw with them, so importing this module
+is cheap and a page only loads the plotting library it actually uses.
+"""
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from core.cache import SYSTEM_CACHE, canonical_system
+from core.geometry import DEFAULT_BOUNDS, DEFAULT_PLANE_BUDGET, DEFAULT_VIEWPORT, clip_lines, clip_planes, clip_rays, fan_triangles, select_planes, triangulate_polygons
+from core.intersections import Intersections, plane_intersections
+from core.kinds import PLANE_LABELS
+from core.lines import LineIntersections, as_lines
+from core.payload import compact_figure
+from core.planes import COLUMNS as PLANE_COLUMNS
+from core.profiling import span
+from core.sweep import sweep_coefficient
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+DEFAULT_POINT_BUDGET = 20_000
+LINE_COLORS = ("#5e17eb", "#ff3b3b")
+PLANE_COLORS = ("#5e17eb", "#ff3b3b", "#1BFF00")
+
+
+def plot_lines(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int, color1: str = "#5e17eb", color2: str = "#ff3b3b", backend: str = "matplotlib"):
+    """
+    Plots two lines representing the system of linear equations.
+
+    Parameters
+    ----------
+    a1 : int
+        Coefficient of x in the first equation (a1*x + b1*y = c1).
+    b1 : int
+        Coefficient of y in the first equation (a1*x + b1*y = c1).
+    c1 : int
+        Constant term in the first equation (a1*x + b1*y = c1).
+    a2 : int
+        Coefficient of x in the second equation (a2*x + b2*y = c2).
+    b2 : int
+        Coefficient of y in the second equation (a2*x + b2*y = c2).
+    c2 : int
+        Constant term in the second equation (a2*x + b2*y = c2).
+    color1 : str, optional
+        Color of the first line.
+    color2 : str, optional
+        Color of the second line.
+    backend : str, optional
+        "matplotlib" (default) for a `matplotlib.figure.Figure`, or "plotly" for a vector
+        `plotly.graph_objects.Figure` that the browser renders without server-side rasterizing.
+
+    Returns
+    -------
+    matplotlib.figure.Figure or plotly.graph_objects.Figure
+        The figure, ready for `st.pyplot` or `st.plotly_chart`.
+
+    Raises
+    ------
+    ValueError
+        If any of the input coefficients are not numeric, or the backend is unknown.
+
+    Examples
+    --------
+    >>> fig = plot_lines(1, 1, 1, 2, -1, 0)
+
+    Notes
+    -----
+    This function generates a plot of two linear equations in the form ax + by = c.
+    Each line is clipped analytically to the viewport with `core.geometry.clip_lines`, so it is drawn from two endpoints;
+    vertical lines (b = 0) need no special case and an equation with a = b = 0 only appears in the legend.
+    The matplotlib figure is created without `pyplot`, so it is not kept in pyplot's global registry
+    and is freed as soon as the page stops referencing it.
+    The plot includes a grid, axes lines, and a legend.
+    """
+    with span("geometry"):
+        segments, visible = clip_lines([[a1, b1, c1], [a2, b2, c2]])
+    labels = (f"{a1}x + {b1}y = {c1}", f"{a2}x + {b2}y = {c2}")
+    (x0, x1), (y0, y1) = DEFAULT_VIEWPORT
+
+    if backend == "plotly":
+        import plotly.graph_objects as go
+
+        with span("figure"):
+            fig = go.Figure()
+            for segment, label, color in zip(segments, labels, (color1, color2)):
+                fig.add_trace(go.Scatter(x=segment[:, 0], y=segment[:, 1], mode="lines", name=label, line=dict(color=color, width=3)))
+            fig.update_layout(
+                xaxis=dict(range=[x0, x1], zeroline=True, zerolinecolor="black"),
+                yaxis=dict(range=[y0, y1], zeroline=True, zerolinecolor="black", scaleanchor="x"),
+                margin=dict(l=0, r=0, t=20, b=20),
+            )
+        return fig
+    if backend != "matplotlib":
+        raise ValueError(f"Unknown backend {backend!r}, expected 'matplotlib' or 'plotly'.")
+
+    from matplotlib.figure import Figure
+
+    with span("figure"):
+        fig = Figure(figsize=(10, 8))
+        ax = fig.subplots()
+        for segment, label, color in zip(segments, labels, (color1, color2)):
+            ax.plot(segment[:, 0], segment[:, 1], color=color, label=label, linewidth=2)
+        ax.set_xlim(x0, x1)
+        ax.set_ylim(y0, y1)
+        ax.grid(True)
+        ax.axhline(0, color='black', linewidth=0.5)
+        ax.axvline(0, color='black', linewidth=0.5)
+        ax.legend(fontsize='large')
+
+    return fig
+
+
+def plot_line_set(lines, intersections: LineIntersections | None = None, point=None, color: str = "#5e17eb", point_color: str = "#ff3b3b", backend: str = "matplotlib", max_points: int = DEFAULT_POINT_BUDGET):
+    """
+    Plots any number of lines ax + by = c as a single collection.
+
+    Parameters
+    ----------
+    lines : array-like
+        Line coefficients of shape (m, 3) in the order ``a, b, c``.
+    intersections : LineIntersections, optional
+        Pairwise intersections from `core.lines.pairwise_intersections`, drawn as small dots.
+    point : array-like, optional
+        The least-squares point of the whole set, drawn as a star.
+    color : str, optional
+        Color of the lines. They get more transparent as m grows so dense regions stand out.
+    point_color : str, optional
+        Color of the least-squares point.
+    backend : str, optional
+        "matplotlib" (default) or "plotly", as in `plot_lines`.
+    max_points : int, optional
+        At most this many intersection points are drawn, evenly spaced among all of them.
+
+    Returns
+    -------
+    matplotlib.figure.Figure or plotly.graph_objects.Figure
+        The figure, ready for `st.pyplot` or `st.plotly_chart`.
+
+    Raises
+    ------
+    ValueError
+        If the lines are not numeric or the backend is unknown.
+
+    Examples
+    --------
+    >>> fig = plot_line_set([[1, 1, 1], [2, -1, 0], [0, 1, 3]], point=[0.5, 1.0])
+
+    Notes
+    -----
+    All lines are clipped by one `core.geometry.clip_lines` call and drawn as one matplotlib
+    `LineCollection`, or one Plotly trace whose segments are separated by NaN gaps, so
+    drawing thousands of lines costs about as much as drawing two.
+    """
+    if backend not in ("matplotlib", "plotly"):
+        raise ValueError(f"Unknown backend {backend!r}, expected 'matplotlib' or 'plotly'.")
+    lines = as_lines(lines)
+    with span("geometry"):
+        segments, visible = clip_lines(lines)
+        segments = segments[visible]
+        dots = np.zeros((0, 2)) if intersections is None else intersections.points
+        if len(dots) > max_points:
+            dots = dots[::-(-len(dots) // max_points)]
+    alpha = float(np.clip(30 / max(len(segments), 1), 0.05, 1.0))
+    label = f"{len(lines):,} lines"
+    (x0, x1), (y0, y1) = DEFAULT_VIEWPORT
+
+    if backend == "plotly":
+        import plotly.graph_objects as go
+
+        with span("figure"):
+            gaps = np.full((len(segments), 1, 2), np.nan)
+            path = np.concatenate([segments, gaps], axis=1).reshape(-1, 2)
+            fig = go.Figure(go.Scatter(x=path[:, 0], y=path[:, 1], mode="lines", name=label, opacity=max(alpha, 0.2), line=dict(color=color, width=1)))
+            if len(dots):
+                fig.add_trace(go.Scattergl(x=dots[:, 0], y=dots[:, 1], mode="markers", name="Intersections", marker=dict(color="#444444", size=3)))
+            if point is not None:
+                fig.add_trace(go.Scatter(x=[point[0]], y=[point[1]], mode="markers", name="Least-squares point", marker=dict(color=point_color, size=14, symbol="star")))
+            fig.update_layout(
+                xaxis=dict(range=[x0, x1], zeroline=True, zerolinecolor="black"),
+                yaxis=dict(range=[y0, y1], zeroline=True, zerolinecolor="black", scaleanchor="x"),
+                margin=dict(l=0, r=0, t=20, b=20),
+            )
+        return compact_figure(fig, drop_template=False)
+
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+
+    with span("figure"):
+        fig = Figure(figsize=(10, 8))
+        ax = fig.subplots()
+        ax.add_collection(LineCollection(segments, colors=color, linewidths=1, alpha=alpha, label=label))
+        if len(dots):
+            ax.scatter(dots[:, 0], dots[:, 1], s=2, color="#444444", label="Intersections", zorder=2)
+        if point is not None:
+            ax.scatter([point[0]], [point[1]], s=200, marker="*", color=point_color, label="Least-squares point", zorder=3)
+        ax.set_xlim(x0, x1)
+        ax.set_ylim(y0, y1)
+        ax.grid(True)
+        ax.axhline(0, color='black', linewidth=0.5)
+        ax.axvline(0, color='black', linewidth=0.5)
+        ax.legend(fontsize='large')
+    return fig
+
+
+def create_plane_data(a: float, b: float, c: float, d: float, bounds: tuple = DEFAULT_BOUNDS) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Creates the polygon where a plane cuts the viewing box.
+
+    Parameters
+    ----------
+    a : float
+        Coefficient of x in the plane equation (ax + by + cz = d).
+    b : float
+        Coefficient of y in the plane equation (ax + by + cz = d).
+    c : float
+        Coefficient of z in the plane equation (ax + by + cz = d).
+    d : float
+        Constant term in the plane equation (ax + by + cz = d).
+    bounds : tuple, optional
+        ``((xmin, xmax), (ymin, ymax), (zmin, zmax))`` of the viewing box.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        X, Y and Z coordinates of the polygon vertices (at most 6) in order around the polygon.
+        The arrays are empty when the plane misses the box.
+
+    Raises
+    ------
+    ValueError
+        If any of the input coefficients are not numeric.
+
+    Examples
+    --------
+    >>> X, Y, Z = create_plane_data(0, 0, 1, 0)
+    >>> len(X)
+    4
+
+    Notes
+    -----
+    This function clips the plane ax + by + cz = d analytically against the box with
+    `core.geometry.clip_planes` instead of sampling it on a grid, so vertical planes (c = 0)
+    are drawn correctly.
+    """
+    vertices, counts = clip_planes([[a, b, c, d]], bounds)
+    polygon = vertices[0, :counts[0]]
+    return polygon[:, 0], polygon[:, 1], polygon[:, 2]
+
+
+def build_plane_geometry(rows: tuple[tuple[float, ...], ...]) -> tuple[np.ndarray, np.ndarray, Intersections]:
+    """
+    Clips every (a, b, c, d) row to the viewing box, in the given order, and finds where they meet.
+
+    Parameters
+    ----------
+    rows : tuple[tuple[float, ...], ...]
+        Plane equations ax + by + cz = d, usually the canonical key from `canonical_system`.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, Intersections]
+        ``vertices`` and ``counts`` as returned by `clip_planes`, and the clipped intersection
+        lines and common point or line from `plane_intersections`. All arrays are read-only,
+        so they are safe to share between sessions through the cache.
+    """
+    vertices, counts = clip_planes(rows)
+    intersections = plane_intersections([rows])
+    for arr in (vertices, counts, intersections.kind, intersections.pair_segments, intersections.point, intersections.line):
+        arr.flags.writeable = False
+    return vertices, counts, intersections
+
+
+def intersection_traces(intersections: Intersections, index: int = 0) -> "list[go.Scatter3d]":
+    """
+    Light `go.Scatter3d` traces for one system: the pairwise intersection lines (dashed, in one
+    trace separated by gaps) and the common line or point.
+    """
+    import plotly.graph_objects as go
+
+    traces = []
+    pairs = intersections.pair_segments[index]
+    pairs = pairs[~np.isnan(pairs).any(axis=(1, 2))]
+    if len(pairs):
+        gaps = np.full((len(pairs), 1, 3), np.nan)
+        path = np.concatenate([pairs, gaps], axis=1).reshape(-1, 3)
+        traces.append(go.Scatter3d(
+            x=path[:, 0], y=path[:, 1], z=path[:, 2], mode="lines",
+            line=dict(color="#444444", width=3, dash="dash"), name="Pairwise intersections", hoverinfo="skip",
+        ))
+    line = intersections.line[index]
+    if not np.isnan(line).any():
+        traces.append(go.Scatter3d(x=line[:, 0], y=line[:, 1], z=line[:, 2], mode="lines", line=dict(color="#000000", width=8), name="Common line"))
+    point = intersections.point[index]
+    if not np.isnan(point).any():
+        traces.append(go.Scatter3d(x=point[:1], y=point[1:2], z=point[2:], mode="markers", marker=dict(color="#000000", size=6), name="Common point"))
+    return traces
+
+
+def plot_3_planes(a1: float, b1: float, c1: float, d1: float, a2: float, b2: float, c2: float, d2: float, a3: float, b3: float, c3: float, d3: float, color1: str, color2: str, color3: str, compact: bool = False, intersections: bool = True) -> "go.Figure":
+    """
+    Plots three 3D planes.
+
+    Parameters
+    ----------
+    a1 : float
+        Coefficient of x in the first plane equation.
+    b1 : float
+        Coefficient of y in the first plane equation.
+    c1 : float
+        Coefficient of z in the first plane equation.
+    d1 : float
+        Constant term in the first plane equation.
+    a2 : float
+        Coefficient of x in the second plane equation.
+    b2 : float
+        Coefficient of y in the second plane equation.
+    c2 : float
+        Coefficient of z in the second plane equation.
+    d2 : float
+        Constant term in the second plane equation.
+    a3 : float
+        Coefficient of x in the third plane equation.
+    b3 : float
+        Coefficient of y in the third plane equation.
+    c3 : float
+        Coefficient of z in the third plane equation.
+    d3 : float
+        Constant term in the third plane equation.
+    color1 : str
+        Color of the first plane.
+    color2 : str
+        Color of the second plane.
+    color3 : str
+        Color of the third plane.
+    compact : bool, optional
+        Merge the planes into a single `go.Mesh3d` with per-triangle colors and send float32
+        arrays without a template (see `core.payload.compact_figure`).
+    intersections : bool, optional
+        Overlay the pairwise intersection lines and the common point or line (see
+        `core.intersections.plane_intersections`).
+
+    Returns
+    -------
+    go.Figure
+        A Plotly Figure object containing the 3D plot of the planes.
+
+    Raises
+    ------
+    ValueError
+        If any of the input coefficients are not numeric.
+
+    Examples
+    --------
+    >>> fig = plot_3_planes(1, 1, 1, 1, 2, 1, 1, 2, 1, 2, 1, 3, "#5e17eb", "#ff3b3b", "#1BFF00")
+
+    Notes
+    -----
+    This function generates a 3D plot of three planes using Plotly.
+    Each plane is drawn as a small `go.Mesh3d` polygon clipped to the viewing box.
+    The plane geometry is cached in `SYSTEM_CACHE` under the canonical form of the system, without
+    the colors, so equivalent systems and recolors reuse it. The intersection overlay is computed
+    analytically and cached together with the planes.
+    """
+    import plotly.graph_objects as go
+
+    with span("geometry"):
+        key, order = canonical_system([[a1, b1, c1, d1], [a2, b2, c2, d2], [a3, b3, c3, d3]])
+        vertices, counts, meeting = SYSTEM_CACHE.get_or_compute(("planes", key), lambda: build_plane_geometry(key))
+        vertices, counts = vertices[list(order)], counts[list(order)]
+
+    with span("figure"):
+        colors = (color1, color2, color3)
+
+        fig = go.Figure()
+
+        if compact:
+            points, triangles, owner = triangulate_polygons(vertices, counts)
+            fig.add_trace(go.Mesh3d(
+                x=points[:, 0], y=points[:, 1], z=points[:, 2],
+                i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2],
+                facecolor=[colors[plane] for plane in owner], flatshading=True,
+            ))
+        else:
+            for polygon, count, color in zip(vertices, counts, colors):
+                i, j, k = fan_triangles(count)
+                fig.add_trace(go.Mesh3d(
+                    x=polygon[:count, 0], y=polygon[:count, 1], z=polygon[:count, 2],
+                    i=i, j=j, k=k, color=color, flatshading=True,
+                ))
+
+        if intersections:
+            fig.add_traces(intersection_traces(meeting))
+
+        (x0, x1), (y0, y1), (z0, z1) = DEFAULT_BOUNDS
+        fig.update_layout(
+            scene=dict(
+                xaxis=dict(title="X", range=[x0, x1]),
+                yaxis=dict(title="Y", range=[y0, y1]),
+                zaxis=dict(title="Z", range=[z0, z1]),
+                aspectmode="cube",
+            ),
+            margin=dict(l=0, r=0, t=20, b=20)  # Adjust margins for better layout
+        )
+
+        if compact:
+            compact_figure(fig)
+    return fig
+
+
+def plot_sweep(coefficients: list[float], index: int, values: np.ndarray, color1: str, color2: str, color3: str) -> "go.Figure":
+    """
+    Plots an animated sweep of one coefficient with a slider over all frames.
+
+    Parameters
+    ----------
+    coefficients : list[float]
+        The twelve coefficients of the starting system, in `core.planes.COLUMNS` order.
+    index : int
+        Position of the swept coefficient.
+    values : np.ndarray
+        Values of the swept coefficient, one animation frame each.
+    color1 : str
+        Color of the first plane.
+    color2 : str
+        Color of the second plane.
+    color3 : str
+        Color of the third plane.
+
+    Returns
+    -------
+    go.Figure
+        A Plotly Figure whose frames hold every state of the sweep.
+
+    Examples
+    --------
+    >>> fig = plot_sweep([1, 1, 1, 1, 1, 1, 1, 2, 1, 2, 1, 3], 7, np.arange(-3, 4), "#5e17eb", "#ff3b3b", "#1BFF00")
+
+    Notes
+    -----
+    Geometry and classification of all frames come from one vectorized `sweep_coefficient`
+    call, so scrubbing the slider runs entirely in the browser without any server rerun.
+    Slider labels marked with ◆ are where the solution type changes.
+    """
+    import plotly.graph_objects as go
+
+    with span("sweep"):
+        sweep = sweep_coefficient(coefficients, index, values)
+    colors = np.array([color1, color2, color3])
+    name = PLANE_COLUMNS[index]
+    animate = {"mode": "immediate", "frame": {"duration": 0, "redraw": True}, "transition": {"duration": 0}}
+
+    frames, steps = [], []
+    with span("figure"):
+        for frame, (value, kind, changed) in enumerate(zip(sweep.values, sweep.kind, sweep.changes)):
+            points, triangles, owner = triangulate_polygons(sweep.vertices[frame], sweep.counts[frame])
+            mesh = go.Mesh3d(
+                x=points[:, 0], y=points[:, 1], z=points[:, 2],
+                i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2],
+                facecolor=colors[owner], flatshading=True,
+            )
+            title = f"{name} = {value:g}: {PLANE_LABELS[kind]}"
+            frames.append(go.Frame(data=[mesh], name=str(frame), layout=go.Layout(title_text=title)))
+            steps.append(dict(label=f"{'◆ ' if changed else ''}{value:g}", method="animate", args=[[str(frame)], animate]))
+
+        fig = go.Figure(data=frames[0].data, frames=frames)
+        (x0, x1), (y0, y1), (z0, z1) = DEFAULT_BOUNDS
+        fig.update_layout(
+            title_text=frames[0].layout.title.text,
+            scene=dict(
+                xaxis=dict(title="X", range=[x0, x1]),
+                yaxis=dict(title="Y", range=[y0, y1]),
+                zaxis=dict(title="Z", range=[z0, z1]),
+                aspectmode="cube",
+            ),
+            sliders=[dict(active=0, currentvalue=dict(prefix=f"{name} = "), steps=steps)],
+            updatemenus=[dict(type="buttons", showactive=False, x=0, y=0, xanchor="right", yanchor="top", buttons=[
+                dict(label="▶", method="animate", args=[None, {**animate, "frame": {"duration": 300, "redraw": True}, "fromcurrent": True}]),
+                dict(label="⏸", method="animate", args=[[None], animate]),
+            ])],
+            margin=dict(l=0, r=0, t=40, b=20),
+        )
+    return compact_figure(fig)
+
+
+def plane_set_trace(planes, values=None, colors=None, budget: int = DEFAULT_PLANE_BUDGET, strategy: str = "stride", focus=None, bounds=DEFAULT_BOUNDS, **mesh) -> "tuple[go.Mesh3d, np.ndarray]":
+    """
+    Packs any number of planes into one `go.Mesh3d` with per-vertex colors.
+
+    Parameters
+    ----------
+    planes : array-like
+        Plane equations ``ax + by + cz = d`` of shape (N, 4).
+    values : array-like, optional
+        One number per plane, mapped through the colorscale on every vertex of its polygon.
+        Defaults to the plane index.
+    colors : str or sequence of str, optional
+        A single color for all planes, or one color per plane. Takes precedence over ``values``.
+    budget : int, optional
+        Maximum number of planes drawn. Planes that miss the box are dropped first, and
+        `core.geometry.select_planes` picks among the rest if there are still too many.
+    strategy : str, optional
+        Selection strategy above the budget, "stride" or "nearest" (to ``focus``).
+    focus : array-like, optional
+        Point the "nearest" strategy measures distances from.
+    bounds : tuple, optional
+        Viewing box the planes are clipped to.
+    **mesh
+        Further `go.Mesh3d` properties such as ``opacity``, ``name`` or ``colorscale``.
+
+    Returns
+    -------
+    tuple[go.Mesh3d, np.ndarray]
+        The trace and the indices of the planes it draws.
+
+    Examples
+    --------
+    >>> trace, kept = plane_set_trace([[0, 0, 1, z] for z in range(-20, 20)], budget=10)
+    >>> len(kept), len(trace.x), len(trace.i)
+    (10, 40, 20)
+
+    Notes
+    -----
+    Clipping, selection and triangulation are single vectorized passes over all planes, so the
+    cost grows linearly with N and the browser receives one trace however many planes there are.
+    """
+    import plotly.graph_objects as go
+
+    planes = np.asarray(planes, dtype=float).reshape(-1, 4)
+    with span("geometry"):
+        vertices, counts = clip_planes(planes, bounds)
+        visible = np.flatnonzero(counts)
+        kept = visible[select_planes(planes[visible], budget, strategy, focus)]
+        points, triangles, owner = triangulate_polygons(vertices[kept], counts[kept])
+        vertex_owner = np.repeat(kept, counts[kept])
+
+    with span("figure"):
+        if isinstance(colors, str):
+            mesh["color"] = colors
+        elif colors is not None:
+            mesh["vertexcolor"] = np.asarray(colors)[vertex_owner]
+        else:
+            values = np.arange(len(planes)) if values is None else np.asarray(values, dtype=float).reshape(len(planes))
+            mesh.setdefault("colorscale", "Viridis")
+            mesh.update(intensity=values[vertex_owner], intensitymode="vertex", cmin=values.min(initial=0), cmax=values.max(initial=1))
+        trace = go.Mesh3d(
+            x=points[:, 0], y=points[:, 1], z=points[:, 2],
+            i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2],
+            flatshading=True, **mesh,
+        )
+    return trace, kept
+
+
+def plot_plane_set(planes, values=None, colors=None, budget: int = DEFAULT_PLANE_BUDGET, strategy: str = "stride", focus=None, axis_titles: tuple[str, str, str] = ("X", "Y", "Z")) -> "go.Figure":
+    """
+    Plots hundreds or thousands of planes as one compact mesh, see `plane_set_trace`.
+
+    The title says how many planes are drawn when the budget or the viewing box left some out.
+
+    Examples
+    --------
+    >>> rng = np.random.default_rng(0)
+    >>> fig = plot_plane_set(rng.normal(size=(5000, 4)), budget=500)
+    >>> fig.layout.title.text
+    'Showing 500 of 5,000 planes'
+    """
+    import plotly.graph_objects as go
+
+    planes = np.asarray(planes, dtype=float).reshape(-1, 4)
+    trace, kept = plane_set_trace(planes, values, colors, budget, strategy, focus, opacity=0.6)
+    fig = go.Figure(trace)
+    (x0, x1), (y0, y1), (z0, z1) = DEFAULT_BOUNDS
+    fig.update_layout(
+        title_text=f"Showing {len(kept):,} of {len(planes):,} planes" if len(kept) < len(planes) else None,
+        scene=dict(
+            xaxis=dict(title=axis_titles[0], range=[x0, x1]),
+            yaxis=dict(title=axis_titles[1], range=[y0, y1]),
+            zaxis=dict(title=axis_titles[2], range=[z0, z1]),
+            aspectmode="cube",
+        ),
+        margin=dict(l=0, r=0, t=30, b=20),
+    )
+    return compact_figure(fig)
+
+
+def plot_solution_set(point: np.ndarray | None, basis: np.ndarray, planes: np.ndarray | None = None, axis_titles: tuple[str, str, str] = ("X", "Y", "Z"), color: str = "#ff3b3b", plane_color: str = "#5e17eb", plane_budget: int = DEFAULT_PLANE_BUDGET, focus: np.ndarray | None = None) -> "go.Figure":
+    """
+    Plots a solution set ``point + basis @ t`` in three unknowns, optionally over the planes it solves.
+
+    Parameters
+    ----------
+    point : np.ndarray or None
+        A point of the set, shape (3,), or None when the set is empty.
+    basis : np.ndarray
+        Shape (3, d) spanning the directions of the set: d = 0 draws a point, 1 a line,
+        2 a plane and 3 fills the whole box.
+    planes : np.ndarray, optional
+        Equations (k, 4) ``ax + by + cz = d`` drawn translucently behind the set.
+    axis_titles : tuple[str, str, str], optional
+        Names of the three unknowns.
+    color : str, optional
+        Color of the solution set.
+    plane_color : str, optional
+        Color of the equation planes.
+    plane_budget : int, optional
+        Maximum number of equation planes drawn; above it the planes nearest the solution
+        are kept (see `plane_set_trace`).
+    focus : np.ndarray, optional
+        Point the kept planes are nearest to, ``point`` by default. Pass the least-squares
+        solution to keep the relevant constraints of an inconsistent system.
+
+    Returns
+    -------
+    go.Figure
+        A Plotly Figure with the solution set clipped to the viewing box.
+
+    Examples
+    --------
+    >>> fig = plot_solution_set(np.zeros(3), np.eye(3)[:, :1], planes=np.array([[0, 1, 0, 0], [0, 0, 1, 0]]))
+    """
+    import plotly.graph_objects as go
+
+    basis = np.asarray(basis, dtype=float).reshape(3, -1)
+    fig = go.Figure()
+    with span("geometry"):
+        if planes is not None and len(planes):
+            trace, kept = plane_set_trace(planes, colors=plane_color, budget=plane_budget, strategy="nearest", focus=point if focus is None else focus, opacity=0.3)
+            trace.name = f"Equations ({len(kept):,} of {len(planes):,})" if len(kept) < len(planes) else "Equations"
+            fig.add_trace(trace)
+        dimension = basis.shape[1] if point is not None else None
+        if point is not None:
+            point = np.asarray(point, dtype=float)
+        if dimension == 0:
+            fig.add_trace(go.Scatter3d(x=point[:1], y=point[1:2], z=point[2:], mode="markers", marker=dict(size=6, color=color), name="Solution"))
+        elif dimension == 1:
+            segments, _ = clip_rays(point, basis[:, 0])
+            fig.add_trace(go.Scatter3d(x=segments[0, :, 0], y=segments[0, :, 1], z=segments[0, :, 2], mode="lines", line=dict(width=8, color=color), name="Solution"))
+        elif dimension == 2:
+            normal = np.cross(basis[:, 0], basis[:, 1])
+            vertices, counts = clip_planes(np.append(normal, normal @ point))
+            polygon = vertices[0, :counts[0]]
+            i, j, k = fan_triangles(counts[0])
+            fig.add_trace(go.Mesh3d(x=polygon[:, 0], y=polygon[:, 1], z=polygon[:, 2], i=i, j=j, k=k, color=color, opacity=0.8, flatshading=True, name="Solution"))
+
+    (x0, x1), (y0, y1), (z0, z1) = DEFAULT_BOUNDS
+    fig.update_layout(
+        title_text="Every point is a solution" if dimension is not None and dimension >= 3 else None,
+        scene=dict(
+            xaxis=dict(title=axis_titles[0], range=[x0, x1]),
+            yaxis=dict(title=axis_titles[1], range=[y0, y1]),
+            zaxis=dict(title=axis_titles[2], range=[z0, z1]),
+            aspectmode="cube",
+        ),
+        margin=dict(l=0, r=0, t=30, b=20),
+    )
+    return fig
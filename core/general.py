@@ -0,0 +1,377 @@
+"""
+General engine for one system of m equations in n unknowns, given as an augmented matrix.
+
+Both ranks come from the singular values of A and of [A|b] (`matrix_ranks`, two SVDs
+without factors). A third SVD, of A with its factors, gives the minimum-norm
+least-squares particular solution, an orthonormal null-space basis and the residual.
+Tall systems can be streamed in row blocks: a running TSQR keeps only the (n+1) x (n+1)
+triangular factor of [A|b], which has the same singular values and least-squares
+solution as the full matrix.
+"""
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from core.exact import classify_exact, exact_kind, use_exact
+from core.kinds import INFINITE_SOLUTIONS, NO_SOLUTION, ONE_SOLUTION
+
+DEFAULT_CHUNK_ROWS = 65_536
+DEFAULT_RTOL = np.finfo(float).eps
+
+
+@dataclass(frozen=True)
+class SystemSolution:
+    """
+    Result of solving one m x n system.
+
+    Attributes
+    ----------
+    kind : int
+        ``NO_SOLUTION``, ``ONE_SOLUTION`` or ``INFINITE_SOLUTIONS``.
+    rank_A : int
+        Rank of the coefficient matrix.
+    rank_Ab : int
+        Rank of the augmented matrix [A|b].
+    particular : np.ndarray
+        Shape (n,). The minimum-norm solution, or the minimum-norm least-squares solution
+        when the system is inconsistent.
+    null_space : np.ndarray
+        Shape (n, n - rank_A). Orthonormal basis of the null space of A, so every solution is
+        ``particular + null_space @ t``.
+    residual_norm : float
+        ``|A @ particular - b|``, zero up to rounding for consistent systems.
+    singular_values : np.ndarray
+        Singular values of A in descending order.
+    """
+
+    kind: int
+    rank_A: int
+    rank_Ab: int
+    particular: np.ndarray
+    null_space: np.ndarray
+    residual_norm: float
+    singular_values: np.ndarray
+
+    @property
+    def unknowns(self) -> int:
+        return len(self.particular)
+
+    def residuals(self, augmented) -> np.ndarray:
+        """
+        Returns the per-equation residuals ``A @ particular - b`` of ``augmented``.
+        """
+        aug = as_augmented(augmented)
+        return aug[:, :-1] @ self.particular - aug[:, -1]
+
+
+def as_augmented(augmented) -> np.ndarray:
+    """
+    Converts one augmented matrix [A|b] into a float array of shape (m, n + 1).
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric or not a 2D matrix with at least two columns.
+    """
+    arr = np.asarray(augmented, dtype=float)
+    if arr.ndim != 2 or arr.shape[1] < 2:
+        raise ValueError(f"Expected an augmented matrix of shape (m, n + 1), got {arr.shape}.")
+    return arr
+
+
+def parse_matrix(text: str) -> np.ndarray:
+    """
+    Reads an augmented matrix typed as one equation per line, numbers separated by spaces or commas.
+
+    Raises
+    ------
+    ValueError
+        If an entry is not a number or the rows have different lengths.
+
+    Examples
+    --------
+    >>> parse_matrix("1 2 3\\n4, 5, 6").tolist()
+    [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    """
+    rows = [line.replace(",", " ").split() for line in text.splitlines() if line.strip()]
+    if not rows or len({len(row) for row in rows}) != 1 or len(rows[0]) < 2:
+        raise ValueError("Enter one equation per line, every line with the same number of entries (at least two).")
+    return np.array([[float(value) for value in row] for row in rows])
+
+
+def matrix_ranks(systems, rtol: float | None = None, rows: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the ranks of A and of [A|b] for one augmented matrix or a stack of them.
+
+    Both are decided as ``np.linalg.matrix_rank`` decides them: a singular value of an
+    m x k matrix counts when it exceeds ``rtol * max(m, k) * max(singular values)``, with
+    ``rtol`` `DEFAULT_RTOL` by default. ``rows`` replaces m when the matrices were reduced
+    from a taller system. This is the one rank rule of every float classification, so a
+    system gets the same type from `classify_system`, `core.planes.classify_planes` and the
+    bulk classifier.
+
+    Examples
+    --------
+    >>> rank_A, rank_Ab = matrix_ranks([[[1, 1, 1], [2, 2, 3]], [[1, 0, 1], [0, 1, 2]]])
+    >>> rank_A.tolist(), rank_Ab.tolist()
+    ([1, 2], [2, 2])
+    """
+    aug = np.asarray(systems, dtype=float)
+    m, k = aug.shape[-2:]
+    m = m if rows is None else rows
+    rtol = DEFAULT_RTOL if rtol is None else rtol
+    s = np.linalg.svd(aug[..., :-1], compute_uv=False)
+    s_aug = np.linalg.svd(aug, compute_uv=False)
+    rank_A = np.count_nonzero(s > rtol * max(m, k - 1) * s[..., :1], axis=-1)
+    rank_Ab = np.count_nonzero(s_aug > rtol * max(m, k) * s_aug[..., :1], axis=-1)
+    return rank_A, np.maximum(rank_A, rank_Ab)
+
+
+def solution_kinds(rank_A, rank_Ab, unknowns: int) -> np.ndarray:
+    """
+    Returns the solution types (``int8``) that the ranks of A and [A|b] give for ``unknowns`` unknowns.
+    """
+    rank_A = np.asarray(rank_A)
+    kind = np.where(rank_A == unknowns, ONE_SOLUTION, INFINITE_SOLUTIONS).astype(np.int8)
+    kind[np.asarray(rank_Ab) != rank_A] = NO_SOLUTION
+    return kind
+
+
+def _solve(A: np.ndarray, b: np.ndarray, extra_residual: float, rtol: float, rows: int | None = None) -> SystemSolution:
+    """
+    Solves A x = b; ``extra_residual`` is the part of b already known to lie outside the
+    column space (the last diagonal entry of a TSQR factor) and ``rows`` the number of
+    equations A was reduced from, A's own row count by default.
+    """
+    m, n = A.shape
+    u, s, vt = np.linalg.svd(A, full_matrices=m < n)
+    # [A|b] with extra_residual below b has the singular values of the full augmented matrix.
+    augmented = np.column_stack([A, b])
+    if extra_residual:
+        augmented = np.vstack([augmented, np.eye(1, n + 1, n) * extra_residual])
+    rank_A, rank_Ab = (int(rank) for rank in matrix_ranks(augmented, rtol, rows or m))
+    consistent = rank_Ab == rank_A
+
+    coeff = u.T @ b
+    particular = vt[:rank_A].T @ (coeff[:rank_A] / s[:rank_A])
+    # The residual is the part of b outside the leading columns of U. Unlike A @ x - b it
+    # does not pick up the rounding error of x, which grows with the condition number.
+    if u.shape[1] == m:
+        outside = np.linalg.norm(coeff[rank_A:])
+    else:
+        outside = np.linalg.norm(b - u[:, :rank_A] @ coeff[:rank_A])
+    residual_norm = float(np.hypot(outside, extra_residual))
+
+    return SystemSolution(
+        kind=int(solution_kinds(rank_A, rank_Ab, n)),
+        rank_A=rank_A,
+        rank_Ab=rank_Ab,
+        particular=particular,
+        null_space=vt[rank_A:].T.copy(),
+        residual_norm=residual_norm,
+        singular_values=s,
+    )
+
+
+def solve_system(augmented, rtol: float | None = None, method: str = "float", chunk_rows: int | None = None) -> SystemSolution:
+    """
+    Solves one system of m equations in n unknowns.
+
+    Parameters
+    ----------
+    augmented : array-like
+        Augmented matrix [A|b] of shape (m, n + 1).
+    rtol : float, optional
+        Relative tolerance per dimension, `core.planes.DEFAULT_RTOL` by default. As with
+        ``np.linalg.matrix_rank``, a singular value of an m x k matrix counts towards its
+        rank when it exceeds ``rtol * max(m, k) * max(singular values)``; this decides the
+        ranks of A and of [A|b], and the system is consistent when they are equal.
+    method : str, optional
+        "float" (default) for the SVD alone, "exact" to take the kind and both ranks from
+        fraction-free elimination, or "auto" to do so whenever every entry is an integer
+        (see `core.exact.use_exact`). A consistent system then also gets its particular
+        solution from the exact one, made minimum-norm with the SVD's null space, so an
+        ill-conditioned system is not solved at a rank the float SVD got wrong.
+    chunk_rows : int, optional
+        Process the rows in blocks of this size with `solve_streaming`, so a tall system
+        needs only O(chunk_rows * n) extra memory.
+
+    Returns
+    -------
+    SystemSolution
+        Kind, ranks, particular solution, null-space basis and residual.
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric or has the wrong shape, or "exact" is requested for
+        non-integers.
+
+    Examples
+    --------
+    >>> result = solve_system([[1, 1, 1, 3], [1, -1, 0, 0]])
+    >>> result.kind, result.rank_A, result.null_space.shape
+    (2, 2, (3, 1))
+    >>> round(solve_system([[1, 1], [1, 3]]).residual_norm, 12)
+    1.414213562373
+    """
+    aug = as_augmented(augmented)
+    exact = use_exact(aug, method)
+    rtol = DEFAULT_RTOL if rtol is None else rtol
+    if chunk_rows and len(aug) > chunk_rows:
+        result = solve_streaming((aug[i:i + chunk_rows] for i in range(0, len(aug), chunk_rows)), rtol)
+    else:
+        result = _solve(aug[:, :-1], aug[:, -1], 0.0, rtol)
+    if exact:
+        classification = classify_exact(aug)
+        rank_A = int(classification.rank_A[0])
+        if rank_A != result.rank_A:
+            # The float rank disagrees with the exact one, so rebuild the basis to match it
+            # from the n x n triangular factor of A, which has A's right singular vectors.
+            step = chunk_rows or len(aug)
+            R, _ = _triangular_factor(aug[i:i + step, :-1] for i in range(0, len(aug), step))
+            _, _, vt = np.linalg.svd(R)
+            result = replace(result, null_space=vt[rank_A:].T.copy())
+        result = replace(
+            result,
+            kind=int(classification.kind[0]),
+            rank_A=rank_A,
+            rank_Ab=int(classification.rank_Ab[0]),
+        )
+        if result.kind != NO_SOLUTION:
+            point = classification.point()[0]
+            particular = point - result.null_space @ (result.null_space.T @ point)
+            residual_norm = float(np.linalg.norm(aug[:, :-1] @ particular - aug[:, -1]))
+            result = replace(result, particular=particular, residual_norm=residual_norm)
+    return result
+
+
+def classify_system(augmented, rtol: float | None = None, method: str = "float") -> int:
+    """
+    Returns only the solution type of one m x n system, with the options of `solve_system`.
+
+    Only the singular values are computed (`matrix_ranks`), and with the exact method not
+    even those, which keeps the scalar page functions cheap.
+
+    Examples
+    --------
+    >>> classify_system([[1, 1, 1], [2, 2, 3]], method="auto")
+    0
+    """
+    aug = as_augmented(augmented)
+    if use_exact(aug, method):
+        return exact_kind(aug)
+    rank_A, rank_Ab = matrix_ranks(aug, rtol)
+    return int(solution_kinds(rank_A, rank_Ab, aug.shape[1] - 1))
+
+
+def solve_streaming(chunks, rtol: float | None = None) -> SystemSolution:
+    """
+    Solves a tall system given as an iterable of row blocks of [A|b].
+
+    Each block of shape (k, n + 1) is stacked under the current triangular factor and
+    re-factored with a QR decomposition, so memory stays at one block plus an
+    (n + 1) x (n + 1) matrix however many rows there are. ``rtol`` is as in `solve_system`.
+
+    Examples
+    --------
+    >>> rows = np.array([[1.0, 0, 1], [0, 1, 2], [1, 1, 3]] * 1000)
+    >>> result = solve_streaming(np.array_split(rows, 7))
+    >>> result.kind, result.particular.round(12).tolist()
+    (1, [1.0, 2.0])
+    """
+    square, rows = _triangular_factor(as_augmented(chunk) for chunk in chunks)
+    n = len(square) - 1
+    rtol = DEFAULT_RTOL if rtol is None else rtol
+    return _solve(square[:n, :n], square[:n, n], abs(square[n, n]), rtol, rows)
+
+
+def _triangular_factor(blocks) -> tuple[np.ndarray, int]:
+    """
+    Returns the k x k triangular factor R of the row blocks (each of shape (rows, k)) stacked
+    on top of each other, padded with zero rows, and their total row count. The stack has
+    R^T R as its Gram matrix, so the same singular values and right singular vectors.
+    """
+    R = None
+    rows = 0
+    for block in blocks:
+        rows += len(block)
+        R = np.linalg.qr(block if R is None else np.vstack([R, block]), mode="r")
+    if R is None:
+        raise ValueError("Expected at least one block of rows.")
+    square = np.zeros((R.shape[1], R.shape[1]))
+    square[:len(R)] = R
+    return square, rows
+
+
+def read_chunks(path, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Yields row blocks of an augmented matrix stored as ``.npy`` (memory-mapped) or as a CSV
+    without header (read with pandas in chunks, parsing every value to the float it was
+    written from).
+    """
+    path = str(path)
+    if path.endswith(".npy"):
+        arr = np.load(path, mmap_mode="r")
+        for start in range(0, len(arr), chunk_rows):
+            yield np.asarray(arr[start:start + chunk_rows], dtype=float)
+        return
+    import pandas as pd
+
+    for frame in pd.read_csv(path, header=None, chunksize=chunk_rows, float_precision="round_trip"):
+        yield frame.to_numpy(dtype=float)
+
+
+def slice_system(augmented, variables, fixed) -> np.ndarray:
+    """
+    Restricts a system to three (or any) chosen unknowns by fixing all the others.
+
+    Parameters
+    ----------
+    augmented : array-like
+        Augmented matrix [A|b] of shape (m, n + 1).
+    variables : sequence of int
+        Indices of the unknowns that stay free.
+    fixed : sequence of float
+        Values of the remaining unknowns, in increasing index order.
+
+    Returns
+    -------
+    np.ndarray
+        Augmented matrix of shape (m, len(variables) + 1) in the chosen unknowns.
+
+    Examples
+    --------
+    >>> slice_system([[1, 2, 3, 4, 10]], [0, 1, 3], [1]).tolist()
+    [[1.0, 2.0, 4.0, 7.0]]
+    """
+    aug = as_augmented(augmented)
+    n = aug.shape[1] - 1
+    variables = list(variables)
+    others = [i for i in range(n) if i not in variables]
+    b = aug[:, -1] - aug[:, others] @ np.asarray(fixed, dtype=float).reshape(len(others))
+    return np.column_stack([aug[:, variables], b])
+
+
+def project_solution(solution: SystemSolution, variables, rtol: float = 1e-10) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Projects the solution set onto the chosen unknowns.
+
+    Returns the projected particular solution and an orthonormal basis, shape (k, d), of
+    the projected null space, where d is 0 (a point), 1 (a line), 2 (a plane) or k.
+    Directions shorter than ``rtol`` after projection are dropped.
+
+    Examples
+    --------
+    >>> point, basis = project_solution(solve_system([[1, 1, 1, 1, 4]]), [0, 1, 2])
+    >>> point.round(6).tolist(), basis.shape
+    ([1.0, 1.0, 1.0], (3, 3))
+    """
+    variables = list(variables)
+    point = solution.particular[variables]
+    spanned = solution.null_space[variables]
+    if spanned.size == 0:
+        return point, np.zeros((len(variables), 0))
+    u, s, _ = np.linalg.svd(spanned, full_matrices=False)
+    rank = int(np.count_nonzero(s > rtol))
+    return point, u[:, :rank]
@@ -0,0 +1,305 @@
+"""
+Analytic geometry for drawing: lines clipped to a viewport and planes clipped to a box.
+
+A plane cuts a box in a convex polygon with at most six vertices and a line crosses a
+rectangle in a single segment, so both can be drawn from a handful of exact points
+instead of sampled coordinates.
+"""
+import numpy as np
+
+DEFAULT_BOUNDS = ((-15.0, 15.0), (-15.0, 15.0), (-15.0, 15.0))
+DEFAULT_VIEWPORT = ((-10.0, 10.0), (-10.0, 10.0))
+MAX_POLYGON_VERTICES = 6
+DEFAULT_PLANE_BUDGET = 2_000
+SELECTION_STRATEGIES = ("stride", "nearest")
+
+# Index pairs of the 12 box edges into the 8 corners produced by `box_corners`.
+_EDGES = np.array([
+    (0, 1), (2, 3), (4, 5), (6, 7),  # along x
+    (0, 2), (1, 3), (4, 6), (5, 7),  # along y
+    (0, 4), (1, 5), (2, 6), (3, 7),  # along z
+])
+
+
+def box_corners(bounds=DEFAULT_BOUNDS) -> np.ndarray:
+    """
+    Returns the 8 corners of the box as an (8, 3) array, x varying fastest.
+    """
+    (x0, x1), (y0, y1), (z0, z1) = bounds
+    return np.array([(x, y, z) for z in (z0, z1) for y in (y0, y1) for x in (x0, x1)], dtype=float)
+
+
+def clip_planes(planes, bounds=DEFAULT_BOUNDS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Clips a batch of planes ax + by + cz = d against a box in one vectorized pass.
+
+    Parameters
+    ----------
+    planes : array-like
+        Plane coefficients of shape (N, 4) in the order ``a, b, c, d``.
+    bounds : tuple, optional
+        ``((xmin, xmax), (ymin, ymax), (zmin, zmax))`` of the viewing box.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        ``vertices`` of shape (N, 6, 3), ordered around each polygon and padded with NaN,
+        and ``counts`` of shape (N,) with the number of valid vertices. A count below 3 means
+        the plane misses the box (or a = b = c = 0).
+
+    Examples
+    --------
+    >>> vertices, counts = clip_planes([[0, 0, 1, 0], [1, 1, 1, 100]], bounds=((-1, 1),) * 3)
+    >>> counts.tolist()
+    [4, 0]
+
+    Notes
+    -----
+    Candidate vertices are the box corners lying on the plane plus the points where the
+    plane strictly crosses a box edge, so corners are never counted twice. The candidates
+    are then ordered by their angle around the centroid, measured in the plane.
+    """
+    planes = np.asarray(planes, dtype=float).reshape(-1, 4)
+    normal, d = planes[:, :3], planes[:, 3]
+    corners = box_corners(bounds)
+    extent = np.abs(corners).max()
+
+    side = corners @ normal.T - d  # (8, N)
+    tol = 1e-9 * (np.linalg.norm(normal, axis=1) * extent + np.abs(d))
+    on_plane = np.abs(side) <= tol
+    side = np.where(on_plane, 0.0, side)
+
+    f0, f1 = side[_EDGES[:, 0]], side[_EDGES[:, 1]]  # (12, N)
+    crossing = f0 * f1 < 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(crossing, f0 / (f0 - f1), 0.0)
+    p0, p1 = corners[_EDGES[:, 0]], corners[_EDGES[:, 1]]
+    edge_points = p0[:, np.newaxis, :] + t[:, :, np.newaxis] * (p1 - p0)[:, np.newaxis, :]
+
+    points = np.concatenate([np.broadcast_to(corners[:, np.newaxis, :], (8, len(planes), 3)), edge_points])
+    valid = np.concatenate([on_plane, crossing]).T  # (N, 20)
+    valid &= np.any(normal != 0, axis=1)[:, np.newaxis]
+    points = points.transpose(1, 0, 2)  # (N, 20, 3)
+    counts = valid.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centroid = np.where(valid[..., np.newaxis], points, 0.0).sum(axis=1) / counts[:, np.newaxis]
+        unit = normal / np.linalg.norm(normal, axis=1, keepdims=True)
+    helper = np.where(np.abs(unit[:, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+    u = np.cross(unit, helper)
+    u /= np.linalg.norm(u, axis=1, keepdims=True)
+    v = np.cross(unit, u)
+    offset = points - centroid[:, np.newaxis, :]
+    angle = np.arctan2(np.einsum("npk,nk->np", offset, v), np.einsum("npk,nk->np", offset, u))
+    angle = np.where(valid, angle, np.inf)
+
+    order = np.argsort(angle, axis=1)[:, :MAX_POLYGON_VERTICES]
+    vertices = np.take_along_axis(points, order[..., np.newaxis], axis=1)
+    counts = np.minimum(counts, MAX_POLYGON_VERTICES)
+    counts[counts < 3] = 0
+    vertices[np.arange(MAX_POLYGON_VERTICES) >= counts[:, np.newaxis]] = np.nan
+    return vertices, counts
+
+
+def clip_rays(points, directions, bounds=DEFAULT_BOUNDS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Clips a batch of 3D lines ``point + t * direction`` to a box in one vectorized pass.
+
+    Parameters
+    ----------
+    points : array-like
+        A point on each line, shape (N, 3).
+    directions : array-like
+        Direction of each line, shape (N, 3).
+    bounds : tuple, optional
+        ``((xmin, xmax), (ymin, ymax), (zmin, zmax))`` of the viewing box.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        ``segments`` of shape (N, 2, 3) with the entry and exit points (NaN where the line
+        misses the box), and a boolean ``visible`` mask of shape (N,).
+
+    Examples
+    --------
+    >>> segments, visible = clip_rays([[0, 0, 0]], [[0, 0, 2]], bounds=((-1, 1),) * 3)
+    >>> segments[0].tolist(), visible.tolist()
+    ([[0.0, 0.0, -1.0], [0.0, 0.0, 1.0]], [True])
+
+    Notes
+    -----
+    This is the slab method: each axis limits t to an interval, and the line is visible
+    where the three intervals overlap. An axis the line is parallel to either leaves t
+    free or, if the point lies outside that slab, hides the line.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    directions = np.asarray(directions, dtype=float).reshape(-1, 3)
+    low, high = np.asarray(bounds, dtype=float).T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t0 = (low - points) / directions
+        t1 = (high - points) / directions
+    parallel = directions == 0
+    outside = parallel & ((points < low) | (points > high))
+    t_enter = np.where(parallel, -np.inf, np.minimum(t0, t1)).max(axis=1)
+    t_exit = np.where(parallel, np.inf, np.maximum(t0, t1)).min(axis=1)
+    visible = (t_enter < t_exit) & ~outside.any(axis=1) & np.isfinite(t_enter) & np.isfinite(t_exit)
+    t = np.stack([t_enter, t_exit], axis=1)
+    t[~visible] = np.nan
+    segments = points[:, np.newaxis, :] + t[:, :, np.newaxis] * directions[:, np.newaxis, :]
+    return segments, visible
+
+
+def triangulate_polygons(vertices: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Packs a batch of clipped polygons into one triangle mesh.
+
+    Parameters
+    ----------
+    vertices : np.ndarray
+        Polygon vertices of shape (P, 6, 3) as returned by `clip_planes`.
+    counts : np.ndarray
+        Number of valid vertices of each polygon, shape (P,).
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        ``points`` of shape (V, 3), ``triangles`` of shape (T, 3) indexing into ``points``,
+        and ``owner`` of shape (T,) giving the polygon each triangle came from.
+
+    Examples
+    --------
+    >>> vertices, counts = clip_planes([[0, 0, 1, 0], [1, 0, 0, 0]])
+    >>> points, triangles, owner = triangulate_polygons(vertices, counts)
+    >>> points.shape, triangles.shape, owner.tolist()
+    ((8, 3), (4, 3), [0, 0, 1, 1])
+    """
+    counts = np.asarray(counts)
+    valid = np.arange(vertices.shape[1]) < counts[:, np.newaxis]
+    points = vertices[valid]
+    first = np.cumsum(counts) - counts
+    per_polygon = np.maximum(counts - 2, 0)
+    owner = np.repeat(np.arange(len(counts)), per_polygon)
+    fan = np.arange(len(owner)) - np.repeat(np.cumsum(per_polygon) - per_polygon, per_polygon)
+    base = first[owner]
+    triangles = np.column_stack((base, base + fan + 1, base + fan + 2))
+    return points, triangles, owner
+
+
+def select_planes(planes, budget: int = DEFAULT_PLANE_BUDGET, strategy: str = "stride", focus=None) -> np.ndarray:
+    """
+    Picks at most ``budget`` of a batch of planes to draw.
+
+    Parameters
+    ----------
+    planes : array-like
+        Plane coefficients of shape (N, 4) in the order ``a, b, c, d``.
+    budget : int, optional
+        Maximum number of planes to keep.
+    strategy : str, optional
+        "stride" (default) keeps evenly spaced planes, so the sample follows the input
+        order. "nearest" keeps the planes closest to ``focus``, e.g. the constraints that
+        matter around a least-squares solution.
+    focus : array-like, optional
+        Point of shape (3,) for "nearest". Defaults to the origin.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted indices of the kept planes; all of them when N <= budget.
+
+    Raises
+    ------
+    ValueError
+        If the strategy is unknown or the budget is not positive.
+
+    Examples
+    --------
+    >>> planes = [[0, 0, 1, z] for z in range(10)]
+    >>> select_planes(planes, 4).tolist()
+    [0, 3, 6, 9]
+    >>> select_planes(planes, 2, "nearest", focus=[0, 0, 4.2]).tolist()
+    [4, 5]
+    """
+    if strategy not in SELECTION_STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}, expected one of {SELECTION_STRATEGIES}.")
+    if budget < 1:
+        raise ValueError(f"The budget must be positive, got {budget}.")
+    planes = np.asarray(planes, dtype=float).reshape(-1, 4)
+    if len(planes) <= budget:
+        return np.arange(len(planes))
+    if strategy == "stride":
+        return np.unique(np.linspace(0, len(planes) - 1, budget).round().astype(int))
+    focus = np.zeros(3) if focus is None else np.asarray(focus, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distance = np.abs(planes[:, :3] @ focus - planes[:, 3]) / np.linalg.norm(planes[:, :3], axis=1)
+    return np.sort(np.argpartition(np.nan_to_num(distance, nan=np.inf), budget - 1)[:budget])
+
+
+def fan_triangles(count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns Mesh3d ``i, j, k`` index arrays triangulating a convex polygon of ``count`` vertices.
+    """
+    j = np.arange(1, max(count - 1, 1))
+    return np.zeros_like(j), j, j + 1
+
+
+def clip_lines(lines, viewport=DEFAULT_VIEWPORT) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Clips a batch of lines ax + by = c to a rectangular viewport in one vectorized pass.
+
+    Parameters
+    ----------
+    lines : array-like
+        Line coefficients of shape (N, 3) in the order ``a, b, c``.
+    viewport : tuple, optional
+        ``((xmin, xmax), (ymin, ymax))`` of the visible rectangle.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        ``segments`` of shape (N, 2, 2) holding the two endpoints of each visible segment
+        (NaN where there is none), and a boolean ``visible`` mask of shape (N,). Lines with
+        a = b = 0 are never visible.
+
+    Examples
+    --------
+    >>> segments, visible = clip_lines([[1, 0, 2], [0, 0, 1]])
+    >>> segments[0].tolist(), visible.tolist()
+    ([[2.0, -10.0], [2.0, 10.0]], [True, False])
+
+    Notes
+    -----
+    The candidates are the points where the line meets the four viewport edges; only
+    edges the line is not parallel to are used, so b == 0 needs no special case. The
+    visible segment runs between the extreme candidates along the line direction (-b, a).
+    """
+    lines = np.asarray(lines, dtype=float).reshape(-1, 3)
+    a, b, c = lines[:, 0:1], lines[:, 1:2], lines[:, 2:3]
+    (x0, x1), (y0, y1) = viewport
+    xs = np.array([[x0, x1]])
+    ys = np.array([[y0, y1]])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        on_vertical = np.stack([np.broadcast_to(xs, (len(lines), 2)), (c - a * xs) / b], axis=-1)
+        on_horizontal = np.stack([(c - b * ys) / a, np.broadcast_to(ys, (len(lines), 2))], axis=-1)
+    points = np.concatenate([on_vertical, on_horizontal], axis=1)  # (N, 4, 2)
+
+    slack = 1e-9 * max(x1 - x0, y1 - y0)
+    inside = (
+        np.isfinite(points).all(axis=2)
+        & (points[..., 0] >= x0 - slack) & (points[..., 0] <= x1 + slack)
+        & (points[..., 1] >= y0 - slack) & (points[..., 1] <= y1 + slack)
+    )
+    with np.errstate(invalid="ignore"):
+        position = points[..., 0] * -b + points[..., 1] * a
+    low = np.where(inside, position, np.inf)
+    high = np.where(inside, position, -np.inf)
+    first, last = np.argmin(low, axis=1), np.argmax(high, axis=1)
+    rows = np.arange(len(lines))
+    segments = np.stack([points[rows, first], points[rows, last]], axis=1)
+    segments = np.clip(segments, [x0, y0], [x1, y1])
+
+    # A line that only touches a corner has a zero-length segment and is not drawn.
+    visible = high[rows, last] > low[rows, first]
+    segments[~visible] = np.nan
+    return segments, visible
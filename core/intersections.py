@@ -0,0 +1,106 @@
+"""
+Where the three planes of a 3x3 system meet: pairwise intersection lines and the common
+point or line, clipped to the viewing box and vectorized over batches of systems.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.geometry import DEFAULT_BOUNDS, clip_rays
+from core.kinds import ONE_SOLUTION
+from core.planes import DEFAULT_RTOL, as_plane_systems, classify_planes
+
+PAIRS = ((0, 1), (0, 2), (1, 2))
+PARALLEL_RTOL = 1e-12
+
+
+@dataclass(frozen=True)
+class Intersections:
+    """
+    Intersection geometry of a batch of 3x3 systems, clipped to the viewing box.
+
+    Attributes
+    ----------
+    kind : np.ndarray
+        Shape (N,). Solution type of each system, from the classification that placed the
+        common point or line.
+    pair_segments : np.ndarray
+        Shape (N, 3, 2, 3). End points of the line where planes 1 & 2, 1 & 3 and 2 & 3
+        meet, in `PAIRS` order. NaN where the two planes are parallel or the line misses the box.
+    point : np.ndarray
+        Shape (N, 3). The common point of a system with one solution, NaN otherwise or
+        when the point lies outside the box.
+    line : np.ndarray
+        Shape (N, 2, 3). End points of the common line of a system whose solutions form a
+        line, NaN otherwise.
+    """
+
+    kind: np.ndarray
+    pair_segments: np.ndarray
+    point: np.ndarray
+    line: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.point)
+
+
+def plane_intersections(systems, bounds=DEFAULT_BOUNDS, rtol: float = DEFAULT_RTOL, method: str = "auto") -> Intersections:
+    """
+    Computes the pairwise intersection lines and the common point or line of each system.
+
+    Parameters
+    ----------
+    systems : array-like or pandas.DataFrame
+        Augmented matrices, see `core.planes.as_plane_systems` for the accepted layouts.
+    bounds : tuple, optional
+        Viewing box everything is clipped to.
+    rtol : float, optional
+        Relative tolerance of the classification that decides between point and line.
+    method : str, optional
+        Classification method, see `core.planes.classify_planes`. The default "auto" matches
+        the solution type the pages show (`core.general.classify_system` with "auto"), so
+        integer systems get the exact point or line.
+
+    Returns
+    -------
+    Intersections
+        Clipped segments and points, NaN where there is nothing to draw.
+
+    Examples
+    --------
+    >>> result = plane_intersections([[1, 0, 0, 1], [0, 1, 0, 2], [0, 0, 1, 3]])
+    >>> result.point.tolist()
+    [[1.0, 2.0, 3.0]]
+    >>> result.pair_segments[0, 0].tolist()
+    [[1.0, 2.0, -15.0], [1.0, 2.0, 15.0]]
+
+    Notes
+    -----
+    Two planes n1·x = d1 and n2·x = d2 meet along u = n1 × n2 through the point
+    (d1 (n2 × u) + d2 (u × n1)) / |u|², all three pairs at once with no solve. The common
+    point and line come from `classify_planes`.
+    """
+    aug = as_plane_systems(systems)
+    normals, d = aug[:, :, :3], aug[:, :, 3]
+    first, second = np.array(PAIRS).T
+    n1, n2 = normals[:, first], normals[:, second]  # (N, 3 pairs, 3)
+    d1, d2 = d[:, first, np.newaxis], d[:, second, np.newaxis]
+
+    u = np.cross(n1, n2)
+    uu = np.sum(u * u, axis=-1, keepdims=True)
+    scale = np.linalg.norm(n1, axis=-1, keepdims=True) * np.linalg.norm(n2, axis=-1, keepdims=True)
+    parallel = np.sqrt(uu) <= PARALLEL_RTOL * scale
+    with np.errstate(divide="ignore", invalid="ignore"):
+        through = (d1 * np.cross(n2, u) + d2 * np.cross(u, n1)) / uu
+    through = np.where(parallel, np.nan, through)
+    pair_segments, _ = clip_rays(through.reshape(-1, 3), np.where(parallel, 0.0, u).reshape(-1, 3), bounds)
+    pair_segments = pair_segments.reshape(len(aug), len(PAIRS), 2, 3)
+
+    result = classify_planes(aug, rtol=rtol, method=method)
+    low, high = np.asarray(bounds, dtype=float).T
+    unique = result.kind == ONE_SOLUTION
+    inside = np.all((result.point >= low) & (result.point <= high), axis=1)
+    point = np.where((unique & inside)[:, np.newaxis], result.point, np.nan)
+    line, _ = clip_rays(result.point, np.nan_to_num(result.direction), bounds)
+    line[np.isnan(result.direction).any(axis=1)] = np.nan
+    return Intersections(kind=result.kind, pair_segments=pair_segments, point=point, line=line)
@@ -0,0 +1,14 @@
+"""
+Solution-type codes shared by every classifier in the package.
+
+The batch classifiers return these small integer codes (stored as ``int8``) instead of
+strings so that millions of results stay compact. The label tuples map a code back to the
+text shown on the pages.
+"""
+
+NO_SOLUTION = 0
+ONE_SOLUTION = 1
+INFINITE_SOLUTIONS = 2
+
+LINE_LABELS = ("No Solution", "One Solution", "Infinity Solution")
+PLANE_LABELS = ("❌ No Solution", "✅ One Unique Solution", "♾️ Infinite Solutions")
@@ -0,0 +1,300 @@
+"""
+Vectorized classification of 2x2 linear systems (two lines in the plane), and the
+intersections of every pair in a larger set of lines.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.general import SystemSolution, solve_system
+from core.kinds import INFINITE_SOLUTIONS, LINE_LABELS, NO_SOLUTION, ONE_SOLUTION
+
+COLUMNS = ("a1", "b1", "c1", "a2", "b2", "c2")
+DEFAULT_TOL = 1e-10
+PAIR_BLOCK_ENTRIES = 1 << 16
+
+
+@dataclass(frozen=True)
+class LineClassification:
+    """
+    Result of classifying a batch of 2x2 systems.
+
+    Attributes
+    ----------
+    kind : np.ndarray
+        ``int8`` array of shape (N,) holding ``NO_SOLUTION``, ``ONE_SOLUTION`` or ``INFINITE_SOLUTIONS``.
+    x : np.ndarray
+        x coordinate of the intersection point, NaN where the system has no unique solution.
+    y : np.ndarray
+        y coordinate of the intersection point, NaN where the system has no unique solution.
+    """
+
+    kind: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def labels(self):
+        """
+        Returns the solution types as a ``pandas.Categorical`` using the page labels.
+        """
+        import pandas as pd
+
+        return pd.Categorical.from_codes(self.kind, categories=list(LINE_LABELS))
+
+
+def as_line_systems(systems) -> np.ndarray:
+    """
+    Converts an (N, 6) array-like or a DataFrame with columns ``a1..c2`` into a float array.
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric or does not have six coefficients per system.
+    """
+    columns = getattr(systems, "columns", None)
+    if columns is not None and all(name in columns for name in COLUMNS):
+        systems = systems[list(COLUMNS)]
+    arr = np.asarray(systems, dtype=float)
+    if arr.ndim == 1:
+        arr = arr[np.newaxis, :]
+    if arr.ndim != 2 or arr.shape[1] != 6:
+        raise ValueError(f"Expected systems of shape (N, 6), got {arr.shape}.")
+    return arr
+
+
+def classify_lines(systems, tol: float = DEFAULT_TOL) -> LineClassification:
+    """
+    Classifies a batch of systems a1*x + b1*y = c1, a2*x + b2*y = c2 in one array pass.
+
+    Parameters
+    ----------
+    systems : array-like or pandas.DataFrame
+        Coefficients with shape (N, 6) in the order ``a1, b1, c1, a2, b2, c2``, or a DataFrame
+        containing those columns.
+    tol : float, optional
+        Tolerance applied after each equation is scaled so that its normal (a, b) has length 1.
+        Lines whose determinant (the sine of the angle between them) is below ``tol`` are
+        parallel, and parallel lines coincide when their distance is below ``tol`` times the
+        larger distance from the origin (or times 1 near the origin). Use ``0`` for exact
+        comparisons.
+
+    Returns
+    -------
+    LineClassification
+        Integer solution types and the intersection points found with Cramer's rule.
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric or has the wrong shape.
+
+    Examples
+    --------
+    >>> result = classify_lines([[1, 1, 3, 2, 1, 4], [1, 1, 1, 1, 1, 2]])
+    >>> result.kind.tolist()
+    [1, 0]
+    >>> float(result.x[0]), float(result.y[0])
+    (1.0, 2.0)
+
+    A large constant does not make the lines look parallel:
+
+    >>> classify_lines([[1, 2, 1e6, 2, 1, 1e6]]).kind.tolist()
+    [1]
+
+    Notes
+    -----
+    Scaling an equation does not change its line, so each row is divided by the length of
+    its normal (a, b) before the determinant test. This makes ``tol`` relative and keeps
+    float inputs such as 0.1 and 0.3 from being misclassified by an exact ``det == 0`` check.
+    The constant is left out of the scale, so however large it is the determinant still
+    measures the angle between the lines; it only enters the test of whether two parallel
+    lines coincide. An equation whose normal is negligible next to a non-zero constant
+    (a1 = b1 = 0, c1 != 0) can never be satisfied, so it makes the whole system inconsistent;
+    0 = 0 constrains nothing.
+    """
+    arr = as_line_systems(systems)
+    rows = arr.reshape(-1, 2, 3)
+    norm = np.hypot(rows[:, :, 0], rows[:, :, 1])
+    empty = (norm <= tol * np.abs(rows[:, :, 2])) & (rows[:, :, 2] != 0)
+    line = (norm > 0) & ~empty
+    scale = np.where(line, norm, 1.0)
+    a1, b1, c1, a2, b2, c2 = (rows / scale[:, :, np.newaxis]).reshape(-1, 6).T
+
+    det = a1 * b2 - a2 * b1
+    singular = np.abs(det) <= tol
+    # Parallel unit normals are equal or opposite; c is then each line's signed distance from the origin.
+    side = np.where(a1 * a2 + b1 * b2 < 0, -1.0, 1.0)
+    gap = np.abs(c1 - side * c2)
+    apart = line.all(axis=1) & (gap > tol * np.maximum(1.0, np.maximum(np.abs(c1), np.abs(c2))))
+
+    empty_row = empty.any(axis=1)
+    inconsistent = empty_row | (singular & apart)
+    unique = ~singular & ~empty_row
+
+    kind = np.full(len(arr), INFINITE_SOLUTIONS, dtype=np.int8)
+    kind[inconsistent] = NO_SOLUTION
+    kind[unique] = ONE_SOLUTION
+
+    # The intersection is solved on the unscaled rows so integer systems keep exact minors.
+    a1, b1, c1, a2, b2, c2 = arr.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        det = a1 * b2 - a2 * b1
+        x = np.where(unique, (c1 * b2 - c2 * b1) / det, np.nan)
+        y = np.where(unique, (a1 * c2 - a2 * c1) / det, np.nan)
+    return LineClassification(kind=kind, x=x, y=y)
+
+
+@dataclass(frozen=True)
+class LineIntersections:
+    """
+    Intersection points of the non-parallel pairs in a set of lines.
+
+    Attributes
+    ----------
+    pairs : np.ndarray
+        Shape (P, 2). Indices ``i < j`` of the two lines of each pair, in row-major order.
+    points : np.ndarray
+        Shape (P, 2). Where lines ``i`` and ``j`` cross.
+    total : int
+        Number of crossing pairs before any sampling, equal to P unless ``max_points`` was given.
+    """
+
+    pairs: np.ndarray
+    points: np.ndarray
+    total: int
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+
+def as_lines(lines) -> np.ndarray:
+    """
+    Converts an (m, 3) array-like of lines ``a, b, c`` into a float array.
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric or does not have three coefficients per line.
+    """
+    arr = np.asarray(lines, dtype=float)
+    if arr.ndim == 1:
+        arr = arr[np.newaxis, :]
+    if arr.ndim != 2 or arr.shape[1] != 3:
+        raise ValueError(f"Expected lines of shape (m, 3), got {arr.shape}.")
+    return arr
+
+
+def pairwise_intersections(lines, tol: float = DEFAULT_TOL, viewport=None, max_points: int | None = None) -> LineIntersections:
+    """
+    Intersects every pair of lines a*x + b*y = c with vectorized 2x2 determinants.
+
+    Parameters
+    ----------
+    lines : array-like
+        Line coefficients of shape (m, 3) in the order ``a, b, c``.
+    tol : float, optional
+        Pairs whose determinant is below ``tol`` after scaling each normal (a, b) to length 1
+        (see `classify_lines`) are parallel or coincident and have no single intersection.
+    viewport : tuple, optional
+        ``((xmin, xmax), (ymin, ymax))``. When given, only points inside it are returned.
+    max_points : int, optional
+        Keep about this many points, every k-th crossing pair, so thousands of lines do not
+        hold millions of points in memory. ``total`` still counts all of them.
+
+    Returns
+    -------
+    LineIntersections
+        The crossing pairs and their points.
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric or has the wrong shape.
+
+    Examples
+    --------
+    >>> result = pairwise_intersections([[1, 0, 1], [0, 1, 2], [1, 1, 0], [2, 0, 2]])
+    >>> result.pairs.tolist()
+    [[0, 1], [0, 2], [1, 2], [1, 3], [2, 3]]
+    >>> result.points[:2].tolist()
+    [[1.0, 2.0], [1.0, -1.0]]
+    >>> sample = pairwise_intersections([[1, 0, 1], [0, 1, 2], [1, 1, 0], [2, 0, 2]], max_points=2)
+    >>> sample.pairs.tolist(), sample.total
+    ([[0, 1], [1, 3]], 5)
+
+    Notes
+    -----
+    The determinants of all pairs form the antisymmetric matrix ``a bᵀ - b aᵀ``. It is built
+    in row blocks of about `PAIR_BLOCK_ENTRIES` entries, keeping only the upper triangle, so
+    memory stays bounded while m(m - 1)/2 pairs are solved without a Python loop per pair.
+    """
+    arr = as_lines(lines)
+    scale = np.hypot(arr[:, 0], arr[:, 1])
+    scale[scale == 0] = 1.0
+    a, b, c = (arr / scale[:, np.newaxis]).T
+    m = len(arr)
+    block = max(1, PAIR_BLOCK_ENTRIES // max(m, 1))
+    stride = max(1, -(-m * (m - 1) // 2 // max_points)) if max_points else 1
+
+    pairs, points = [], []
+    total = 0
+    for start in range(0, m, block):
+        rows = np.arange(start, min(start + block, m))
+        # Only columns right of the block's first row can hold pairs with i < j.
+        det = a[rows, np.newaxis] * b[start + 1:] - b[rows, np.newaxis] * a[start + 1:]
+        keep = (np.arange(start + 1, m) > rows[:, np.newaxis]) & (np.abs(det) > tol)
+        i, j = np.nonzero(keep)
+        i += start
+        j += start + 1
+        d = det[keep]
+        xy = np.column_stack(((c[i] * b[j] - c[j] * b[i]) / d, (a[i] * c[j] - a[j] * c[i]) / d))
+        if viewport is not None:
+            (x0, x1), (y0, y1) = viewport
+            inside = (xy[:, 0] >= x0) & (xy[:, 0] <= x1) & (xy[:, 1] >= y0) & (xy[:, 1] <= y1)
+            i, j, xy = i[inside], j[inside], xy[inside]
+        sample = (np.arange(len(i)) + total) % stride == 0
+        total += len(i)
+        i, j, xy = i[sample], j[sample], xy[sample]
+        pairs.append(np.column_stack((i, j)))
+        points.append(xy)
+    if not pairs:
+        return LineIntersections(pairs=np.zeros((0, 2), dtype=int), points=np.zeros((0, 2)), total=0)
+    return LineIntersections(pairs=np.concatenate(pairs), points=np.concatenate(points), total=total)
+
+
+def least_squares_point(lines) -> tuple[np.ndarray, float, SystemSolution]:
+    """
+    Finds the point closest to a whole set of lines, in the least-squares sense.
+
+    Each equation is first divided by the length of its normal (a, b), so the residuals are
+    perpendicular distances and steep equations do not outweigh others. Equations with
+    a = b = 0 carry no line and are ignored.
+
+    Returns
+    -------
+    tuple[np.ndarray, float, SystemSolution]
+        The point (x, y), the root-mean-square distance from it to the lines, and the full
+        `core.general.solve_system` result of the normalized set (``kind`` tells whether the
+        lines really share a point).
+
+    Raises
+    ------
+    ValueError
+        If the input has the wrong shape or no equation describes a line.
+
+    Examples
+    --------
+    >>> point, rms, solution = least_squares_point([[1, 0, 0], [0, 1, 0], [1, 1, 3]])
+    >>> point.round(6).tolist(), round(rms, 6), solution.kind
+    ([0.75, 0.75], 0.866025, 0)
+    """
+    arr = as_lines(lines)
+    length = np.hypot(arr[:, 0], arr[:, 1])
+    arr = arr[length > 0] / length[length > 0, np.newaxis]
+    if not len(arr):
+        raise ValueError("Expected at least one equation with a or b non-zero.")
+    solution = solve_system(arr)
+    return solution.particular, float(solution.residual_norm / np.sqrt(len(arr))), solution
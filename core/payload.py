@@ -0,0 +1,63 @@
+"""
+Helpers that shrink the JSON payload Streamlit sends to the browser for a Plotly figure.
+
+Plotly serializes numpy arrays as base64 typed arrays (``{"dtype": ..., "bdata": ...}``), so
+the size of a chart is driven by the dtype of its arrays and by any structure repeated
+per trace.
+"""
+import numpy as np
+
+ARRAY_ATTRIBUTES = ("x", "y", "z", "i", "j", "k", "intensity")
+
+
+def _narrow(values, float_dtype) -> np.ndarray:
+    arr = np.asarray(values)
+    if arr.dtype.kind == "f":
+        return arr.astype(float_dtype)
+    if arr.dtype.kind in "iu" and arr.size:
+        return arr.astype(np.result_type(np.min_scalar_type(arr.min()), np.min_scalar_type(arr.max())))
+    return arr
+
+
+def compact_figure(fig, float_dtype=np.float32, drop_template: bool = True):
+    """
+    Downcasts the numeric arrays of a Plotly figure in place and optionally drops its template.
+
+    Parameters
+    ----------
+    fig : plotly.graph_objects.Figure
+        The figure to compact.
+    float_dtype : numpy dtype, optional
+        Dtype for floating point arrays, ``float32`` by default. Coordinates of a chart do
+        not need more than float32's seven significant digits.
+    drop_template : bool, optional
+        Replace the layout template with the empty ``"none"`` template. Streamlit applies its
+        own theme in the browser, so the template is usually dead weight.
+
+    Returns
+    -------
+    plotly.graph_objects.Figure
+        The same figure, for chaining.
+
+    Notes
+    -----
+    Integer arrays such as Mesh3d ``i, j, k`` indices are narrowed to the smallest integer
+    type that holds them. Traces inside animation frames are compacted as well.
+    """
+    traces = list(fig.data) + [trace for frame in fig.frames for trace in frame.data]
+    for trace in traces:
+        for name in ARRAY_ATTRIBUTES:
+            if name in trace and trace[name] is not None and not isinstance(trace[name], str):
+                trace[name] = _narrow(trace[name], float_dtype)
+    if drop_template:
+        fig.update_layout(template="none")
+    return fig
+
+
+def payload_nbytes(fig) -> int:
+    """
+    Returns the size in bytes of the JSON that `st.plotly_chart` sends for ``fig``.
+    """
+    import plotly.io as pio
+
+    return len(pio.to_json(fig, validate=False).encode())
@@ -0,0 +1,193 @@
+"""
+Vectorized classification of 3x3 linear systems (three planes in space).
+
+The float method takes three batched SVDs per call: two without factors for rank(A) and
+rank([A|b]), and one of A with its factors for the solution point and line direction.
+"""
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from core.exact import ExactClassification, classify_exact, integral_systems, use_exact
+from core.general import DEFAULT_RTOL, matrix_ranks, solution_kinds
+from core.kinds import INFINITE_SOLUTIONS, PLANE_LABELS
+
+COLUMNS = ("a1", "b1", "c1", "d1", "a2", "b2", "c2", "d2", "a3", "b3", "c3", "d3")
+
+
+@dataclass(frozen=True)
+class PlaneClassification:
+    """
+    Result of classifying a batch of 3x3 systems.
+
+    Attributes
+    ----------
+    kind : np.ndarray
+        ``int8`` array of shape (N,) holding ``NO_SOLUTION``, ``ONE_SOLUTION`` or ``INFINITE_SOLUTIONS``.
+    rank_A : np.ndarray
+        Rank of the coefficient matrix, shape (N,).
+    rank_Ab : np.ndarray
+        Rank of the augmented matrix [A|b], shape (N,).
+    point : np.ndarray
+        Shape (N, 3). The unique solution, or a point of the solution set when there are
+        infinitely many: the minimum-norm one with the float method, the one with every free
+        variable at zero with the exact method. NaN where the system is inconsistent.
+    direction : np.ndarray
+        Shape (N, 3). Unit direction of the solution line where rank(A) = rank([A|b]) = 2,
+        NaN otherwise.
+    """
+
+    kind: np.ndarray
+    rank_A: np.ndarray
+    rank_Ab: np.ndarray
+    point: np.ndarray
+    direction: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def labels(self):
+        """
+        Returns the solution types as a ``pandas.Categorical`` using the page labels.
+        """
+        import pandas as pd
+
+        return pd.Categorical.from_codes(self.kind, categories=list(PLANE_LABELS))
+
+
+def as_plane_systems(systems) -> np.ndarray:
+    """
+    Converts systems into a float array of augmented matrices with shape (N, 3, 4).
+
+    Accepts a single (3, 4) matrix, a stacked (N, 3, 4) array, flat rows of twelve
+    coefficients in the order ``a1, b1, c1, d1, ..., d3`` or a DataFrame with those columns.
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric or cannot be read as 3x4 augmented matrices.
+    """
+    columns = getattr(systems, "columns", None)
+    if columns is not None and all(name in columns for name in COLUMNS):
+        systems = systems[list(COLUMNS)]
+    arr = np.asarray(systems, dtype=float)
+    if arr.shape[-2:] == (3, 4):
+        return arr.reshape(-1, 3, 4)
+    if arr.shape[-1:] == (12,) and arr.ndim <= 2:
+        return arr.reshape(-1, 3, 4)
+    raise ValueError(f"Expected systems of shape (N, 3, 4) or (N, 12), got {arr.shape}.")
+
+
+def _oriented(direction: np.ndarray) -> np.ndarray:
+    """
+    Scales each direction to unit length with its largest component positive, which makes it deterministic.
+    """
+    largest = np.take_along_axis(direction, np.abs(direction).argmax(axis=1)[:, np.newaxis], axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return direction * np.where(largest < 0, -1.0, 1.0) / np.linalg.norm(direction, axis=1, keepdims=True)
+
+
+def from_exact(result: ExactClassification) -> PlaneClassification:
+    """
+    Converts a `core.exact.classify_exact` result for 3x3 systems to a `PlaneClassification`.
+    """
+    line = (result.kind == INFINITE_SOLUTIONS) & (result.rank_A == 2)
+    direction = _oriented(result.direction.astype(float))
+    direction[~line] = np.nan
+    return PlaneClassification(
+        kind=result.kind,
+        rank_A=result.rank_A,
+        rank_Ab=result.rank_Ab,
+        point=result.point(),
+        direction=direction,
+    )
+
+
+def classify_planes(systems, rtol: float = DEFAULT_RTOL, method: str = "float") -> PlaneClassification:
+    """
+    Classifies a batch of 3x3 systems from batched SVDs, or exactly.
+
+    Parameters
+    ----------
+    systems : array-like or pandas.DataFrame
+        Augmented matrices, see `as_plane_systems` for the accepted layouts.
+    rtol : float, optional
+        Relative tolerance per dimension. A singular value of an m x k matrix counts towards
+        its rank when it exceeds ``rtol * max(m, k) * max(singular values)``, for A and for
+        [A|b]. The default is the tolerance of ``np.linalg.matrix_rank``, so the types are
+        those of the original two-``matrix_rank`` classification.
+    method : str, optional
+        "float" (default) for the SVDs, "exact" for fraction-free elimination
+        (`core.exact.classify_exact`), or "auto" for the exact engine on every system whose
+        entries are all integers and the SVDs on the others, as `core.general.classify_system`
+        decides for one system.
+
+    Returns
+    -------
+    PlaneClassification
+        Solution types, both ranks, and the solution point and line direction.
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric or has the wrong shape.
+
+    Examples
+    --------
+    >>> result = classify_planes([[1, 1, 1, 1], [2, 1, 1, 2], [1, 2, 1, 3]])
+    >>> result.kind.tolist(), result.point.round(6).tolist()
+    ([1], [[1.0, 2.0, -2.0]])
+
+    Notes
+    -----
+    Both ranks come from `core.general.matrix_ranks`, the singular values of A and of [A|b]
+    with ``np.linalg.matrix_rank``'s tolerance, as the original code did one system at a
+    time, but for the whole batch in two calls; `classify_system` and the bulk classifier
+    use the same rule, so every view of a system agrees on its type. Deciding consistency
+    from the residual of b outside the span of A instead would save the second SVD, but
+    that residual and the smallest singular value of [A|b] carry different rounding, so a
+    few rank-deficient float systems would change type. A third SVD, A = U S V^T with the
+    factors, gives the minimum-norm solution V S^+ U^T b and, for rank 2, the null-space
+    direction (last row of V^T) of the solution line; singular values computed without
+    the factors round differently, so the ranks are not read off this one.
+    """
+    aug = as_plane_systems(systems)
+    if method == "auto":
+        # Each system gets the engine it would get on its own, whatever shares the batch.
+        integral = integral_systems(aug)
+        if integral.any() and not integral.all():
+            exact, floats = from_exact(classify_exact(aug[integral])), classify_planes(aug[~integral], rtol)
+            merged = {}
+            for field in fields(PlaneClassification):
+                values = np.empty((len(aug), *getattr(floats, field.name).shape[1:]), dtype=getattr(floats, field.name).dtype)
+                values[integral], values[~integral] = getattr(exact, field.name), getattr(floats, field.name)
+                merged[field.name] = values
+            return PlaneClassification(**merged)
+    if use_exact(aug, method):
+        return from_exact(classify_exact(aug))
+    A = aug[:, :, :3]
+    b = aug[:, :, 3]
+
+    rank_A, rank_Ab = matrix_ranks(aug, rtol)
+    kind = solution_kinds(rank_A, rank_Ab, 3)
+    consistent = rank_Ab == rank_A
+    in_range = np.arange(3) < rank_A[:, np.newaxis]
+
+    u, s, vt = np.linalg.svd(A)
+    coeff = np.einsum("nij,ni->nj", u, b)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(in_range, coeff / s, 0.0)
+    point = np.einsum("nij,ni->nj", vt, weights)
+    point[~consistent] = np.nan
+
+    direction = _oriented(vt[:, 2, :])
+    direction[~(consistent & (rank_A == 2))] = np.nan
+
+    return PlaneClassification(
+        kind=kind,
+        rank_A=rank_A.astype(np.int8),
+        rank_Ab=rank_Ab.astype(np.int8),
+        point=point,
+        direction=direction,
+    )
@@ -0,0 +1,264 @@
+"""
+Speculative prefetch of the systems a user is likely to ask for next.
+
+On the 3x3 page a user usually nudges one coefficient by its step at a time. After each
+render the page hands `PREFETCHER` jobs for the two neighbours of the last edited
+coefficient. The jobs run on a small thread pool and fill `SYSTEM_CACHE` (see
+`warm_plane_system`), and the page keeps the figures they build, so the next nudge finds
+its work done.
+
+Four limits keep the speculation cheap:
+- jobs wait a moment before they start, so they do not compete with the rest of the rerun
+  that scheduled them for the GIL;
+- a new batch cancels the previous batch of the same session;
+- a token bucket caps the CPU time of the jobs at a fraction of one core;
+- the number of queued jobs is bounded.
+
+Set ``LSV_PREFETCH=1`` to enable it.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from core.cache import SYSTEM_CACHE, LRUCache, canonical_system
+from core.figures import build_plane_geometry
+from core.general import classify_system
+from core.kinds import PLANE_LABELS
+from core.planes import DEFAULT_RTOL
+
+PREFETCH_ENV = "LSV_PREFETCH"
+DEFAULT_WORKERS = 2
+DEFAULT_CPU_BUDGET = 0.5
+DEFAULT_BURST = 0.25
+DEFAULT_DELAY = 0.1
+DEFAULT_MAX_PENDING = 64
+
+
+@dataclass(frozen=True)
+class PrefetchStats:
+    """
+    Snapshot of the counters of a `Prefetcher`.
+
+    Attributes
+    ----------
+    scheduled : int
+        Jobs handed to the pool.
+    completed : int
+        Jobs that ran to the end.
+    cancelled : int
+        Jobs dropped because a newer batch replaced theirs before they started.
+    throttled : int
+        Jobs skipped because the CPU budget was spent or too many jobs were queued.
+    failed : int
+        Jobs that raised. Speculation never reports errors to the page.
+    hits : int
+        Requests, as reported with `Prefetcher.record`, that found their result prefetched.
+    misses : int
+        Requests that had to compute their result.
+    cpu_seconds : float
+        CPU time spent in completed jobs.
+    """
+
+    scheduled: int
+    completed: int
+    cancelled: int
+    throttled: int
+    failed: int
+    hits: int
+    misses: int
+    cpu_seconds: float
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PrefetchBatch:
+    """
+    The jobs of one `Prefetcher.schedule` call; see `Prefetcher.cancel`.
+    """
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.futures: list[Future] = []
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures)
+
+
+class Prefetcher:
+    """
+    Runs speculative jobs on a bounded thread pool under a CPU budget.
+
+    Parameters
+    ----------
+    workers : int
+        Threads in the pool, created on first use.
+    cpu_budget : float
+        Average share of one core the jobs may use. Every job's thread CPU time is taken
+        from a bucket that refills at ``cpu_budget`` seconds per second. A job is skipped
+        while the bucket is empty.
+    burst : float
+        Capacity of the bucket in CPU seconds, i.e. how much work may run back to back.
+    max_pending : int
+        Jobs queued or running at once; further jobs are skipped.
+    delay : float
+        Seconds a job waits before it starts. Cancelling its batch ends the wait.
+
+    Examples
+    --------
+    >>> prefetcher = Prefetcher(workers=1, delay=0)
+    >>> results = []
+    >>> batch = prefetcher.schedule([lambda: results.append(1)])
+    >>> _ = [future.result() for future in batch.futures]
+    >>> results, prefetcher.stats().completed
+    ([1], 1)
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, cpu_budget: float = DEFAULT_CPU_BUDGET, burst: float = DEFAULT_BURST, max_pending: int = DEFAULT_MAX_PENDING, delay: float = DEFAULT_DELAY):
+        self.cpu_budget = cpu_budget
+        self.burst = burst
+        self.max_pending = max_pending
+        self.delay = delay
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._allowance = burst
+        self._refilled = time.monotonic()
+        self._pending = 0
+        self._counts = dict.fromkeys(("scheduled", "completed", "cancelled", "throttled", "failed", "hits", "misses"), 0)
+        self._cpu_seconds = 0.0
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.burst, self._allowance + (now - self._refilled) * self.cpu_budget)
+            self._refilled = now
+            return self._allowance > 0
+
+    def _run(self, job: Callable[[], object], batch: PrefetchBatch) -> None:
+        try:
+            if batch.cancelled.wait(self.delay):
+                self._count("cancelled")
+                return
+            if not self._take_budget():
+                self._count("throttled")
+                return
+            start = time.thread_time()
+            try:
+                job()
+            except Exception:
+                self._count("failed")
+                return
+            finally:
+                spent = time.thread_time() - start
+                with self._lock:
+                    self._allowance -= spent
+                    self._cpu_seconds += spent
+            self._count("completed")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def schedule(self, jobs: Iterable[Callable[[], object]], previous: PrefetchBatch | None = None) -> PrefetchBatch:
+        """
+        Cancels ``previous`` (usually the session's last batch) and queues ``jobs``.
+
+        Returns the new batch, which the caller keeps to cancel it in turn.
+        """
+        if previous is not None:
+            self.cancel(previous)
+        batch = PrefetchBatch()
+        for job in jobs:
+            with self._lock:
+                full = self._pending >= self.max_pending
+                if not full:
+                    self._pending += 1
+                    self._counts["scheduled"] += 1
+            if full:
+                self._count("throttled")
+                continue
+            batch.futures.append(self._executor.submit(self._run, job, batch))
+        return batch
+
+    def cancel(self, batch: PrefetchBatch) -> None:
+        """
+        Skips every job of ``batch`` that has not started yet. Running jobs finish.
+        Cancelling a batch again does nothing.
+        """
+        batch.cancelled.set()  # Jobs a worker has already taken see this and return.
+        dropped = sum(not future.cancelled() and future.cancel() for future in batch.futures)
+        with self._lock:
+            self._counts["cancelled"] += dropped
+            self._pending -= dropped
+
+    def record(self, hit: bool) -> None:
+        """
+        Counts a request that did (``hit``) or did not find its result prefetched.
+        """
+        self._count("hits" if hit else "misses")
+
+    def stats(self) -> PrefetchStats:
+        with self._lock:
+            return PrefetchStats(**self._counts, cpu_seconds=self._cpu_seconds)
+
+
+def env_enabled() -> bool:
+    """
+    True when the ``LSV_PREFETCH`` environment variable is set to 1, true, yes or on.
+    """
+    return os.environ.get(PREFETCH_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def neighbours(coefficients, index: int, step: float = 1) -> list[list[float]]:
+    """
+    Returns the systems one ``step`` below and above ``coefficients[index]``.
+
+    Examples
+    --------
+    >>> neighbours([1, 2, 3], 1)
+    [[1, 1, 3], [1, 3, 3]]
+    """
+    return [[*coefficients[:index], coefficients[index] + delta, *coefficients[index + 1:]] for delta in (-step, step)]
+
+
+def last_edited(previous, current) -> int | None:
+    """
+    Index of the single coefficient that differs between two systems, or None if zero or
+    several differ (a preset, or a form submitted with many edits).
+
+    Examples
+    --------
+    >>> last_edited([1, 2, 3], [1, 5, 3]), last_edited([1, 2, 3], [0, 0, 3])
+    (1, None)
+    """
+    if previous is None or len(previous) != len(current):
+        return None
+    changed = [i for i, (a, b) in enumerate(zip(previous, current)) if a != b]
+    return changed[0] if len(changed) == 1 else None
+
+
+def warm_plane_system(coefficients, cache: LRUCache = SYSTEM_CACHE) -> None:
+    """
+    Stores the solution label and the plane geometry of a 3x3 system under the keys the
+    planes page and `core.figures.plot_3_planes` look up. Entries already cached are kept.
+
+    The label is what `determine_solution_3v` returns with its defaults for the canonical
+    rows, which the geometry is built from too.
+    """
+    rows = [list(coefficients[0:4]), list(coefficients[4:8]), list(coefficients[8:12])]
+    key, _ = canonical_system(rows)
+    if ("solution", key) not in cache:
+        cache.put(("solution", key), PLANE_LABELS[classify_system(key, rtol=DEFAULT_RTOL, method="auto")])
+    if ("planes", key) not in cache:
+        cache.put(("planes", key), build_plane_geometry(key))
+
+
+PREFETCHER = Prefetcher()
@@ -0,0 +1,162 @@
+"""
+Lightweight per-rerun profiling: named spans with wall time and allocated-block counts.
+
+A page opens a run with `profile_run`; code anywhere below it, including `core.figures`,
+marks stages with ``with span("geometry"):``. The active run lives in a context variable,
+and Streamlit runs every session in its own thread, so sessions never see each other's
+spans. Without an active run `span` returns a shared no-op context manager, so disabled
+profiling costs one context-variable lookup per stage.
+
+Set ``LSV_PROFILE=1`` to enable it for every session, or ``LSV_PROFILE=query`` to enable it
+only for sessions that open a page with ``?profile=1``; visitors cannot turn it on
+otherwise. ``LSV_PROFILE_LOG`` chooses the JSONL log file (``profile.jsonl`` in the working
+directory by default). Once the log reaches ``LSV_PROFILE_LOG_MB`` (16 MB by default) it is
+moved to ``<log>.1``, replacing the previous one, so the two files stay bounded.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+
+PROFILE_ENV = "LSV_PROFILE"
+PROFILE_LOG_ENV = "LSV_PROFILE_LOG"
+PROFILE_LOG_MB_ENV = "LSV_PROFILE_LOG_MB"
+DEFAULT_LOG = "profile.jsonl"
+DEFAULT_LOG_BYTES = 16 * 1024 * 1024
+QUERY_MODE = "query"
+
+_ACTIVE: ContextVar["Profile | None"] = ContextVar("active_profile", default=None)
+_NULL_SPAN = nullcontext()
+_LOG_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """
+    One finished span: nesting depth, wall time and net change of `sys.getallocatedblocks`.
+    """
+
+    name: str
+    depth: int
+    seconds: float
+    blocks: int
+
+
+@dataclass
+class Profile:
+    """
+    Spans recorded during one run of a page or fragment, in the order they finished.
+    """
+
+    run: str
+    started: float = field(default_factory=time.time)
+    spans: list[SpanRecord] = field(default_factory=list)
+    _depth: int = 0
+
+    @contextmanager
+    def span(self, name: str):
+        depth = self._depth
+        self._depth += 1
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._depth = depth
+            self.spans.append(SpanRecord(name, depth, seconds, sys.getallocatedblocks() - blocks))
+
+    def to_json(self) -> str:
+        return json.dumps({"run": self.run, "started": self.started, "spans": [asdict(s) for s in self.spans]}, ensure_ascii=False)
+
+
+def env_enabled() -> bool:
+    """
+    True when the ``LSV_PROFILE`` environment variable is set to 1, true, yes or on.
+    """
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def profiling_requested(query_value: str | None) -> bool:
+    """
+    Whether to profile a session whose ``profile`` query parameter is ``query_value``.
+
+    The query parameter only counts when ``LSV_PROFILE=query`` is set.
+
+    Examples
+    --------
+    >>> os.environ[PROFILE_ENV] = ""
+    >>> profiling_requested("1")
+    False
+    >>> os.environ[PROFILE_ENV] = "query"
+    >>> profiling_requested("1"), profiling_requested(None)
+    (True, False)
+    >>> del os.environ[PROFILE_ENV]
+    """
+    if env_enabled():
+        return True
+    return os.environ.get(PROFILE_ENV, "").strip().lower() == QUERY_MODE and query_value == "1"
+
+
+def span(name: str):
+    """
+    Context manager timing a stage of the active run, or a no-op when nothing is profiled.
+
+    Examples
+    --------
+    >>> with profile_run("demo", enabled=True, log_path=os.devnull) as profile:
+    ...     with span("work"):
+    ...         pass
+    >>> [(s.name, s.depth) for s in profile.spans]
+    [('work', 1), ('demo', 0)]
+    """
+    profile = _ACTIVE.get()
+    return _NULL_SPAN if profile is None else profile.span(name)
+
+
+def append_log(profile: Profile, log_path: str | None = None) -> None:
+    """
+    Appends one JSON line for ``profile`` to the log file, first moving a full log to
+    ``<log>.1``.
+    """
+    path = log_path or os.environ.get(PROFILE_LOG_ENV, DEFAULT_LOG)
+    mb = os.environ.get(PROFILE_LOG_MB_ENV, "").strip()
+    max_bytes = int(float(mb) * 1024 * 1024) if mb else DEFAULT_LOG_BYTES
+    line = profile.to_json() + "\n"
+    with _LOG_LOCK:
+        if os.path.isfile(path) and os.path.getsize(path) + len(line.encode()) > max_bytes:
+            os.replace(path, path + ".1")
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(line)
+
+
+@contextmanager
+def profile_run(run: str, enabled: bool, history=None, log_path: str | None = None):
+    """
+    Profiles the enclosed block as one run and yields its `Profile`, or None when disabled.
+
+    If a run is already active, as for a fragment executing inside a full page run, the
+    block becomes a span of that run instead. A finished run is appended to the JSONL log
+    and, when given, to ``history`` (e.g. a bounded deque kept in the session state).
+    """
+    if not enabled:
+        yield None
+        return
+    if _ACTIVE.get() is not None:
+        with span(run):
+            yield _ACTIVE.get()
+        return
+    profile = Profile(run)
+    token = _ACTIVE.set(profile)
+    try:
+        with profile.span(run):
+            yield profile
+    finally:
+        _ACTIVE.reset(token)
+        append_log(profile, log_path)
+        if history is not None:
+            history.append(profile)
@@ -0,0 +1,224 @@
+/*
+ * Classification and clipping of the 2x2 and 3x3 pages, ported from the Python engine for
+ * the static HTML export (core/export.py).
+ *
+ * - classify: the "auto" method of core.general.classify_system. Integer systems use
+ *   fraction-free elimination on BigInts (core.exact); other systems use the rank tests of
+ *   core.general._solve (np.linalg.matrix_rank's tolerance on A and on [A|b]) on a
+ *   one-sided Jacobi SVD.
+ * - clipPlane / clipLine: core.geometry.clip_planes and clip_lines for one plane or line.
+ *
+ * Under node the file reads {"page", "rtol", "systems"} as JSON from stdin and prints one
+ * result per system, which is what `python -m core.export --check` compares against.
+ */
+"use strict";
+
+const LinSys = (() => {
+  const NO_SOLUTION = 0, ONE_SOLUTION = 1, INFINITE_SOLUTIONS = 2;
+  const MAX_POLYGON_VERTICES = 6;
+  const EDGES = [
+    [0, 1], [2, 3], [4, 5], [6, 7],
+    [0, 2], [1, 3], [4, 6], [5, 7],
+    [0, 4], [1, 5], [2, 6], [3, 7],
+  ];
+
+  const dot = (u, v) => u.reduce((sum, x, i) => sum + x * v[i], 0);
+  const norm = (u) => Math.sqrt(dot(u, u));
+  const cross = (u, v) => [u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0]];
+
+  function isIntegral(rows) {
+    return rows.every((row) => row.every((v) => Number.isInteger(v) && Math.abs(v) < 2 ** 53));
+  }
+
+  function kindOf(rankA, rankAb, unknowns) {
+    if (rankAb > rankA) return NO_SOLUTION;
+    return rankA === unknowns ? ONE_SOLUTION : INFINITE_SOLUTIONS;
+  }
+
+  // Fraction-free (Bareiss) Gauss-Jordan elimination, as core.exact: every entry stays an
+  // exact integer, and at the end each pivot row holds the last pivot times its unknown.
+  function classifyExact(aug) {
+    const M = aug.map((row) => row.map((v) => BigInt(v)));
+    const m = M.length, k = M[0].length;
+    const pivotRows = [];
+    let r = 0, prev = 1n, rankA = 0;
+    for (let col = 0; col < k && r < m; col++) {
+      let source = r;
+      while (source < m && M[source][col] === 0n) source++;
+      if (source === m) continue;
+      [M[r], M[source]] = [M[source], M[r]];
+      const pivot = M[r][col];
+      for (let i = 0; i < m; i++) {
+        if (i === r) continue;
+        const factor = M[i][col];
+        for (let j = 0; j < k; j++) M[i][j] = (pivot * M[i][j] - factor * M[r][j]) / prev;
+      }
+      prev = pivot;
+      pivotRows[col] = r;
+      r++;
+      if (col < k - 1) rankA++;
+    }
+    const kind = kindOf(rankA, r, k - 1);
+    const point = kind === ONE_SOLUTION ? pivotRows.slice(0, k - 1).map((row) => Number(M[row][k - 1]) / Number(prev)) : null;
+    return { kind, rankA, rankAb: r, point };
+  }
+
+  // One-sided Jacobi SVD of an m x n matrix (m >= n): rotates columns until they are
+  // orthogonal, so A V = U S with the column norms as singular values.
+  function svd(A) {
+    const m = A.length, n = A[0].length;
+    const W = A.map((row) => row.slice());
+    const V = Array.from({ length: n }, (_, i) => Array.from({ length: n }, (_, j) => +(i === j)));
+    for (let sweep = 0; sweep < 64; sweep++) {
+      let rotated = false;
+      for (let p = 0; p < n - 1; p++) {
+        for (let q = p + 1; q < n; q++) {
+          let alpha = 0, beta = 0, gamma = 0;
+          for (let i = 0; i < m; i++) {
+            alpha += W[i][p] * W[i][p];
+            beta += W[i][q] * W[i][q];
+            gamma += W[i][p] * W[i][q];
+          }
+          if (gamma === 0 || Math.abs(gamma) <= Number.EPSILON * Math.sqrt(alpha * beta)) continue;
+          rotated = true;
+          const zeta = (beta - alpha) / (2 * gamma);
+          const t = Math.sign(zeta || 1) / (Math.abs(zeta) + Math.hypot(1, zeta));
+          const c = 1 / Math.hypot(1, t), s = c * t;
+          for (const M of [W, V]) {
+            for (const row of M) {
+              const x = row[p], y = row[q];
+              row[p] = c * x - s * y;
+              row[q] = s * x + c * y;
+            }
+          }
+        }
+      }
+      if (!rotated) break;
+    }
+    const columns = Array.from({ length: n }, (_, j) => ({
+      s: Math.sqrt(W.reduce((sum, row) => sum + row[j] * row[j], 0)),
+      w: W.map((row) => row[j]),
+      v: V.map((row) => row[j]),
+    }));
+    return columns.sort((x, y) => y.s - x.s);
+  }
+
+  // Rank with the tolerance of np.linalg.matrix_rank scaled by rtol / eps.
+  function rank(columns, rtol, m, k) {
+    const sMax = columns.length ? columns[0].s : 0;
+    return columns.filter((col) => col.s > rtol * Math.max(m, k) * sMax).length;
+  }
+
+  // core.general._solve for a square system: ranks, consistency and the minimum-norm solution.
+  function solveFloat(aug, rtol) {
+    const m = aug.length, n = aug[0].length - 1;
+    const A = aug.map((row) => row.slice(0, n));
+    const b = aug.map((row) => row[n]);
+    const columns = svd(A);
+    const rankA = rank(columns, rtol, m, n);
+    // [A|b] is wider than tall, so its singular values come from the SVD of its transpose.
+    const transposed = aug[0].map((_, j) => aug.map((row) => row[j]));
+    const rankAb = Math.max(rankA, rank(svd(transposed), rtol, m, n + 1));
+    const point = new Array(n).fill(0);
+    for (const { s, w, v } of columns.slice(0, rankA)) {
+      const coeff = dot(w, b) / s;
+      v.forEach((x, i) => { point[i] += (x * coeff) / s; });
+    }
+    return { kind: kindOf(rankA, rankAb, n), rankA, rankAb, point };
+  }
+
+  /* The "auto" method of core.general.solve_system: exact for integer systems, SVD
+     otherwise. The point is null unless it is unique. */
+  function classify(aug, rtol) {
+    if (isIntegral(aug)) {
+      const { kind, point } = classifyExact(aug);
+      return { kind, point };
+    }
+    const { kind, point } = solveFloat(aug, rtol);
+    return { kind, point: kind === ONE_SOLUTION ? point : null };
+  }
+
+  function boxCorners(bounds) {
+    const [[x0, x1], [y0, y1], [z0, z1]] = bounds;
+    const corners = [];
+    for (const z of [z0, z1]) for (const y of [y0, y1]) for (const x of [x0, x1]) corners.push([x, y, z]);
+    return corners;
+  }
+
+  // The polygon where ax + by + cz = d cuts the box, ordered around it; [] if it misses.
+  function clipPlane([a, b, c, d], bounds) {
+    const normal = [a, b, c];
+    if (normal.every((v) => v === 0)) return [];
+    const corners = boxCorners(bounds);
+    const extent = Math.max(...corners.flat().map(Math.abs));
+    const tol = 1e-9 * (norm(normal) * extent + Math.abs(d));
+    const side = corners.map((p) => {
+      const f = dot(p, normal) - d;
+      return Math.abs(f) <= tol ? 0 : f;
+    });
+    const points = corners.filter((_, i) => side[i] === 0);
+    for (const [i, j] of EDGES) {
+      const f0 = side[i], f1 = side[j];
+      if (f0 * f1 < 0) {
+        const t = f0 / (f0 - f1);
+        points.push(corners[i].map((x, axis) => x + t * (corners[j][axis] - x)));
+      }
+    }
+    if (points.length < 3) return [];
+    const centroid = [0, 1, 2].map((axis) => points.reduce((sum, p) => sum + p[axis], 0) / points.length);
+    const unit = normal.map((x) => x / norm(normal));
+    let u = cross(unit, Math.abs(unit[0]) < 0.9 ? [1, 0, 0] : [0, 1, 0]);
+    u = u.map((x) => x / norm(u));
+    const v = cross(unit, u);
+    const angle = (p) => {
+      const offset = p.map((x, axis) => x - centroid[axis]);
+      return Math.atan2(dot(offset, v), dot(offset, u));
+    };
+    return points
+      .map((p) => [angle(p), p])
+      .sort((x, y) => x[0] - y[0])
+      .slice(0, MAX_POLYGON_VERTICES)
+      .map(([, p]) => p);
+  }
+
+  // The visible segment of ax + by = c inside the viewport, or null.
+  function clipLine([a, b, c], viewport) {
+    const [[x0, x1], [y0, y1]] = viewport;
+    const points = [
+      [x0, (c - a * x0) / b], [x1, (c - a * x1) / b],
+      [(c - b * y0) / a, y0], [(c - b * y1) / a, y1],
+    ];
+    const slack = 1e-9 * Math.max(x1 - x0, y1 - y0);
+    let first = null, last = null, low = Infinity, high = -Infinity;
+    for (const p of points) {
+      const inside = p.every(Number.isFinite)
+        && p[0] >= x0 - slack && p[0] <= x1 + slack && p[1] >= y0 - slack && p[1] <= y1 + slack;
+      if (!inside) continue;
+      const position = p[0] * -b + p[1] * a;
+      if (position < low) { low = position; first = p; }
+      if (position > high) { high = position; last = p; }
+    }
+    // A line that only touches a corner has a zero-length segment and is not drawn.
+    if (!(high > low)) return null;
+    const clamp = ([x, y]) => [Math.min(Math.max(x, x0), x1), Math.min(Math.max(y, y0), y1)];
+    return [clamp(first), clamp(last)];
+  }
+
+  return { NO_SOLUTION, ONE_SOLUTION, INFINITE_SOLUTIONS, classify, classifyExact, solveFloat, clipPlane, clipLine };
+})();
+
+if (typeof module !== "undefined" && require.main === module) {
+  let input = "";
+  process.stdin.on("data", (chunk) => { input += chunk; });
+  process.stdin.on("end", () => {
+    const { page, rtol, bounds, systems } = JSON.parse(input);
+    const results = systems.map((aug) => {
+      const { kind, point } = LinSys.classify(aug, rtol);
+      const clip = page === "planes" ? LinSys.clipPlane : LinSys.clipLine;
+      return { kind, point, geometry: aug.map((row) => clip(row, bounds)) };
+    });
+    process.stdout.write(JSON.stringify(results));
+  });
+} else if (typeof module !== "undefined") {
+  module.exports = LinSys;
+}
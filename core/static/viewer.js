@@ -0,0 +1,146 @@
+/*
+ * Page logic of an exported HTML file: coefficient inputs, the solution type and an SVG
+ * chart, all recomputed in the browser with LinSys on every edit.
+ */
+"use strict";
+
+(() => {
+  const state = JSON.parse(document.getElementById("state").textContent);
+  const SVG = "http://www.w3.org/2000/svg";
+  const chart = document.getElementById("chart");
+  const planes = state.page === "planes";
+  const width = state.names.length / state.colors.length;  // coefficients per equation
+  const inputs = [];
+  let view = { yaw: -0.9, pitch: 0.45 };
+  let shown = null;
+
+  const format = (v) => String(Number(v.toFixed(4)));
+
+  function element(name, attributes, parent) {
+    const node = document.createElementNS(SVG, name);
+    for (const [key, value] of Object.entries(attributes)) node.setAttribute(key, value);
+    parent.appendChild(node);
+    return node;
+  }
+
+  function equation(row) {
+    const vars = planes ? ["x", "y", "z"] : ["x", "y"];
+    return vars.map((v, i) => `${format(row[i])}${v}`).join(" + ") + ` = ${format(row[vars.length])}`;
+  }
+
+  // Rotate about z by the yaw, then tilt by the pitch; returns screen x, y and depth.
+  function project([x, y, z]) {
+    const scale = 1 / (Math.sqrt(3) * Math.max(...state.bounds.flat().map(Math.abs)));
+    const cy = Math.cos(view.yaw), sy = Math.sin(view.yaw), cp = Math.cos(view.pitch), sp = Math.sin(view.pitch);
+    const across = x * cy - y * sy, along = x * sy + y * cy;
+    return [across * scale, -(z * cp + along * sp) * scale, along * cp - z * sp];
+  }
+
+  function drawPlanes({ geometry, point }) {
+    chart.setAttribute("viewBox", "-1.15 -1.15 2.3 2.3");
+    const corners = [];
+    for (const z of state.bounds[2]) for (const y of state.bounds[1]) for (const x of state.bounds[0]) corners.push(project([x, y, z]));
+    for (const [i, j] of [[0, 1], [2, 3], [4, 5], [6, 7], [0, 2], [1, 3], [4, 6], [5, 7], [0, 4], [1, 5], [2, 6], [3, 7]]) {
+      element("line", { x1: corners[i][0], y1: corners[i][1], x2: corners[j][0], y2: corners[j][1], class: "box" }, chart);
+    }
+    ["X", "Y", "Z"].forEach((label, axis) => {
+      const end = [0, 0, 0];
+      end[axis] = state.bounds[axis][1] * 1.12;
+      const [x, y] = project(end);
+      element("text", { x, y, class: "axis" }, chart).textContent = label;
+    });
+    const polygons = geometry
+      .map((polygon, i) => ({ points: polygon.map(project), color: state.colors[i] }))
+      .filter(({ points }) => points.length)
+      .map((p) => ({ ...p, depth: p.points.reduce((sum, q) => sum + q[2], 0) / p.points.length }))
+      .sort((p, q) => q.depth - p.depth);  // Far to near, so nearer planes are painted on top.
+    for (const { points, color } of polygons) {
+      element("polygon", { points: points.map(([x, y]) => `${x},${y}`).join(" "), fill: color, stroke: color, class: "plane" }, chart);
+    }
+    const inside = point && point.every((v, axis) => v >= state.bounds[axis][0] && v <= state.bounds[axis][1]);
+    if (inside) {
+      const [x, y] = project(point);
+      element("circle", { cx: x, cy: y, r: 0.025, class: "point" }, chart);
+    }
+  }
+
+  function drawLines({ geometry, point }) {
+    const [[x0, x1], [y0, y1]] = state.bounds;
+    chart.setAttribute("viewBox", `${x0} ${-y1} ${x1 - x0} ${y1 - y0}`);
+    for (let x = Math.ceil(x0); x <= x1; x++) element("line", { x1: x, y1: -y0, x2: x, y2: -y1, class: x ? "grid" : "axis-line" }, chart);
+    for (let y = Math.ceil(y0); y <= y1; y++) element("line", { x1: x0, y1: -y, x2: x1, y2: -y, class: y ? "grid" : "axis-line" }, chart);
+    geometry.forEach((segment, i) => {
+      if (segment) {
+        const [[ax, ay], [bx, by]] = segment;
+        element("line", { x1: ax, y1: -ay, x2: bx, y2: -by, stroke: state.colors[i], class: "equation" }, chart);
+      }
+    });
+    if (point && point[0] >= x0 && point[0] <= x1 && point[1] >= y0 && point[1] <= y1) {
+      element("circle", { cx: point[0], cy: -point[1], r: 0.25, class: "point" }, chart);
+    }
+  }
+
+  function draw() {
+    chart.replaceChildren();
+    if (shown) (planes ? drawPlanes : drawLines)(shown);
+  }
+
+  function update() {
+    const values = inputs.map((input) => parseFloat(input.value));
+    const label = document.getElementById("label");
+    const solution = document.getElementById("solution");
+    const legend = document.getElementById("legend");
+    if (!values.every(Number.isFinite)) {
+      label.textContent = "Enter a number in every box.";
+      solution.textContent = "";
+      return;
+    }
+    const aug = state.colors.map((_, i) => values.slice(i * width, (i + 1) * width));
+    const { kind, point } = LinSys.classify(aug, state.rtol);
+    const clip = planes ? LinSys.clipPlane : LinSys.clipLine;
+    shown = { geometry: aug.map((row) => clip(row, state.bounds)), point };
+    label.textContent = `Solution: ${state.labels[kind]}`;
+    solution.textContent = point ? point.map((v, i) => `${"xyz"[i]} = ${format(v)}`).join(", ") : "";
+    legend.replaceChildren(...aug.map((row, i) => {
+      const item = document.createElement("li");
+      item.style.color = state.colors[i];
+      item.textContent = equation(row);
+      return item;
+    }));
+    draw();
+  }
+
+  const form = document.getElementById("inputs");
+  state.colors.forEach((color, i) => {
+    const column = document.createElement("fieldset");
+    column.style.borderColor = color;
+    state.names.slice(i * width, (i + 1) * width).forEach((name, j) => {
+      const field = document.createElement("label");
+      const input = document.createElement("input");
+      Object.assign(input, { type: "number", step: "1", value: state.coefficients[i * width + j] });
+      input.addEventListener("input", update);
+      field.append(name, input);
+      column.appendChild(field);
+      inputs.push(input);
+    });
+    form.appendChild(column);
+  });
+
+  if (planes) {
+    let drag = null;
+    chart.addEventListener("pointerdown", (event) => {
+      drag = { x: event.clientX, y: event.clientY, ...view };
+      chart.setPointerCapture(event.pointerId);
+    });
+    chart.addEventListener("pointermove", (event) => {
+      if (!drag) return;
+      view = {
+        yaw: drag.yaw + (event.clientX - drag.x) / 150,
+        pitch: Math.min(Math.max(drag.pitch + (event.clientY - drag.y) / 150, -1.5), 1.5),
+      };
+      draw();
+    });
+    chart.addEventListener("pointerup", () => { drag = null; });
+  }
+  update();
+})();
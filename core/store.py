@@ -0,0 +1,272 @@
+"""
+Result store shared by every Streamlit server process on one machine.
+
+`SYSTEM_CACHE` lives in one process, so behind a reverse proxy with several server
+processes each one recomputes every system. This module keeps solution types and
+serialized Plotly figures in a local SQLite file that all of them read and write. A system
+computed by one process is then served to the others without recomputation.
+
+- Keys are built from the canonical form of a system (`core.cache.canonical_system`), so
+  reordered equations share an entry while systems differing in any bit do not.
+- The file runs in write-ahead-log mode: readers never block, and writers queue on SQLite's
+  own lock with a busy timeout.
+- Least recently read entries are evicted once the values exceed ``max_bytes``.
+
+Set ``LSV_STORE`` to the path of the SQLite file to enable it, and ``LSV_STORE_MB`` to bound
+its size (256 MB by default). A store that cannot be read or written counts an error and
+falls back to computing; it never fails the page.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, NamedTuple
+
+STORE_ENV = "LSV_STORE"
+STORE_MB_ENV = "LSV_STORE_MB"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+BUSY_TIMEOUT = 5.0
+TOUCH_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    nbytes INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+# Keeps the most recently read rows whose values fit in the budget and deletes the rest.
+_EVICT = """
+DELETE FROM results WHERE key IN (
+    SELECT key FROM (SELECT key, SUM(nbytes) OVER (ORDER BY accessed DESC, key) AS kept FROM results)
+    WHERE kept > ?
+)
+"""
+
+
+class Codec(NamedTuple):
+    """
+    Turns a value into the bytes kept in the store and back.
+    """
+
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+def figure_to_bytes(fig) -> bytes:
+    """
+    Serializes a Plotly figure to the JSON that `st.plotly_chart` sends to the browser.
+    """
+    import plotly.io as pio
+
+    return pio.to_json(fig, validate=False).encode()
+
+
+def figure_from_bytes(data: bytes):
+    """
+    Rebuilds a figure from `figure_to_bytes` without validating it again, which takes well
+    under a millisecond where building a 3x3 chart takes over ten.
+    """
+    import plotly.graph_objects as go
+
+    return go.Figure(json.loads(data), _validate=False)
+
+
+LABEL_CODEC = Codec(str.encode, bytes.decode)
+FIGURE_CODEC = Codec(figure_to_bytes, figure_from_bytes)
+
+
+@dataclass(frozen=True)
+class StoreStats:
+    """
+    Snapshot of a `SharedStore`: the counters of this process and the size of the file.
+
+    Attributes
+    ----------
+    hits : int
+        Lookups served from the store.
+    misses : int
+        Lookups that had to compute their value.
+    writes : int
+        Values this process added.
+    errors : int
+        Reads or writes that failed, for example because the file stayed locked for longer
+        than `BUSY_TIMEOUT`.
+    entries : int
+        Values in the store, from every process.
+    nbytes : int
+        Total size of those values.
+    """
+
+    hits: int
+    misses: int
+    writes: int
+    errors: int
+    entries: int
+    nbytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def store_key(key: Hashable) -> str:
+    """
+    Text form of a cache key such as ``("solution", canonical_key)``, identical in every process.
+
+    Examples
+    --------
+    >>> store_key(("solution", ((1, 1, 1, 1), (1, 1, 1, 2))))
+    "('solution', ((1, 1, 1, 1), (1, 1, 1, 2)))"
+    """
+    return repr(key)
+
+
+class SharedStore:
+    """
+    Size-bounded key-value store in a SQLite file, safe to use from many threads and processes.
+
+    Parameters
+    ----------
+    path : str
+        The SQLite file, created if missing. Every process that opens the same path shares
+        its entries.
+    max_bytes : int
+        Budget for the stored values. A single value larger than this is never stored.
+
+    Examples
+    --------
+    >>> store = SharedStore(":memory:")
+    >>> store.get_or_compute(("solution", ((1, 2, 3, 4),)), lambda: "one", LABEL_CODEC)
+    'one'
+    >>> store.get_or_compute(("solution", ((1, 2, 3, 4),)), lambda: "two", LABEL_CODEC)
+    'one'
+    >>> store.stats().hits, store.stats().entries
+    (1, 1)
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid = None
+        self._counts = dict.fromkeys(("hits", "misses", "writes", "errors"), 0)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per process, shared by its threads under the lock. A forked child
+        # opens its own instead of using the parent's.
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get(self, key: Hashable) -> bytes | None:
+        """
+        Returns the stored bytes for ``key`` and marks them as recently read, or None.
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute("SELECT value, accessed FROM results WHERE key = ?", (store_key(key),)).fetchone()
+                # Reads only write back now and then, so hot entries do not queue on the write lock.
+                if row is not None and now - row[1] > TOUCH_INTERVAL:
+                    connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, store_key(key)))
+            except sqlite3.Error:
+                self._counts["errors"] += 1
+                return None
+            self._counts["hits" if row is not None else "misses"] += 1
+            return row[0] if row is not None else None
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        """
+        Stores ``data`` under ``key`` and evicts the least recently read entries beyond ``max_bytes``.
+        """
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO results (key, value, nbytes, accessed) VALUES (?, ?, ?, ?)",
+                        (store_key(key), data, len(data), time.time()),
+                    )
+                    connection.execute(_EVICT, (self.max_bytes,))
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error:
+                self._counts["errors"] += 1
+                return
+            self._counts["writes"] += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], codec: Codec) -> Any:
+        """
+        Returns the stored value for ``key``, or computes, stores and returns it.
+
+        As with `core.cache.LRUCache.get_or_compute`, two processes missing the same key at
+        once may both compute it, and the second write replaces the first.
+        """
+        data = self.get(key)
+        if data is not None:
+            return codec.decode(data)
+        value = compute()
+        self.put(key, codec.encode(value))
+        return value
+
+    def stats(self) -> StoreStats:
+        with self._lock:
+            try:
+                entries, nbytes = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM results").fetchone()
+            except sqlite3.Error:
+                entries = nbytes = 0
+            return StoreStats(**self._counts, entries=entries, nbytes=nbytes)
+
+    def clear(self) -> None:
+        """
+        Deletes every entry, for all processes, and resets the counters of this one.
+        """
+        with self._lock:
+            self._connect().execute("DELETE FROM results")
+            self._counts = dict.fromkeys(self._counts, 0)
+
+
+_STORES: dict[str, SharedStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def shared_store() -> SharedStore | None:
+    """
+    The store at the path in ``LSV_STORE``, opened once per process, or None when it is unset.
+    """
+    path = os.environ.get(STORE_ENV, "").strip()
+    if not path:
+        return None
+    with _STORES_LOCK:
+        if path not in _STORES:
+            mb = os.environ.get(STORE_MB_ENV, "").strip()
+            _STORES[path] = SharedStore(path, int(float(mb) * 1024 * 1024) if mb else DEFAULT_MAX_BYTES)
+        return _STORES[path]
+
+
+def shared(key: Hashable, compute: Callable[[], Any], codec: Codec) -> Any:
+    """
+    Looks ``key`` up in the shared store when one is enabled, and otherwise just computes it.
+    """
+    store = shared_store()
+    if store is None:
+        return compute()
+    return store.get_or_compute(key, compute, codec)
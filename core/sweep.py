@@ -0,0 +1,106 @@
+"""
+Parameter sweeps: one coefficient of a 3x3 system varied over a range, all frames at once.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.geometry import DEFAULT_BOUNDS, clip_planes
+from core.planes import DEFAULT_RTOL, classify_planes
+
+
+@dataclass(frozen=True)
+class Sweep:
+    """
+    Classification and plane geometry of every frame of a sweep.
+
+    Attributes
+    ----------
+    values : np.ndarray
+        Value of the swept coefficient in each frame, shape (F,).
+    systems : np.ndarray
+        Augmented matrices of each frame, shape (F, 3, 4).
+    kind : np.ndarray
+        Solution type of each frame, shape (F,).
+    vertices : np.ndarray
+        Clipped plane polygons, shape (F, 3, 6, 3), see `clip_planes`.
+    counts : np.ndarray
+        Valid vertices of each polygon, shape (F, 3).
+    """
+
+    values: np.ndarray
+    systems: np.ndarray
+    kind: np.ndarray
+    vertices: np.ndarray
+    counts: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def changes(self) -> np.ndarray:
+        """
+        Boolean mask of the frames whose solution type differs from the previous frame.
+        """
+        changed = np.zeros(len(self.kind), dtype=bool)
+        changed[1:] = self.kind[1:] != self.kind[:-1]
+        return changed
+
+
+def sweep_coefficient(coefficients, index: int, values, bounds=DEFAULT_BOUNDS, rtol: float = DEFAULT_RTOL) -> Sweep:
+    """
+    Varies one of the twelve coefficients and computes every frame in one vectorized pass.
+
+    Parameters
+    ----------
+    coefficients : array-like
+        The twelve coefficients ``a1, b1, c1, d1, ..., d3`` of the starting system.
+    index : int
+        Position of the swept coefficient in ``coefficients``.
+    values : array-like
+        Values the coefficient takes, one frame each.
+    bounds : tuple, optional
+        Viewing box the planes are clipped to.
+    rtol : float, optional
+        Relative tolerance of the float classifier, used for the frames that are not integral.
+
+    Returns
+    -------
+    Sweep
+        Per-frame systems, solution types and plane polygons.
+
+    Raises
+    ------
+    ValueError
+        If ``index`` is out of range or the input is not numeric.
+
+    Examples
+    --------
+    >>> sweep = sweep_coefficient([1, 1, 1, 1, 1, 1, 1, 2, 1, 2, 1, 3], 7, [0, 1, 2])
+    >>> sweep.kind.tolist(), sweep.changes.tolist()
+    ([0, 2, 0], [False, True, True])
+
+    Notes
+    -----
+    All frames are classified with a single batched call, each frame exactly when its
+    coefficients are integers, and all 3F planes are clipped with a single `clip_planes` call.
+    """
+    base = np.asarray(coefficients, dtype=float).reshape(12)
+    if not 0 <= index < 12:
+        raise ValueError(f"Coefficient index must be between 0 and 11, got {index}.")
+    values = np.asarray(values, dtype=float).reshape(-1)
+
+    flat = np.repeat(base[np.newaxis, :], len(values), axis=0)
+    flat[:, index] = values
+    systems = flat.reshape(-1, 3, 4)
+
+    kind = classify_planes(systems, rtol=rtol, method="auto").kind
+
+    vertices, counts = clip_planes(systems.reshape(-1, 4), bounds)
+    return Sweep(
+        values=values,
+        systems=systems,
+        kind=kind,
+        vertices=vertices.reshape(len(values), 3, -1, 3),
+        counts=counts.reshape(len(values), 3),
+    )
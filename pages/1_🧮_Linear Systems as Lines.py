@@ -1,19 +1,28 @@
-import streamlit as st
-import matplotlib.pyplot as plt
+from collections import deque
+
 import numpy as np
+import streamlit as st
+
+from core.assets import LOGO_WIDTH, image_bytes
+from core.exact import classify_exact, fraction_latex, is_integral, row_reduction_steps
+from core.export import export_html
+from core.figures import DEFAULT_POINT_BUDGET, plot_line_set, plot_lines
+from core.general import DEFAULT_RTOL, classify_system, parse_matrix
+from core.geometry import DEFAULT_VIEWPORT
+from core.kinds import INFINITE_SOLUTIONS, LINE_LABELS, NO_SOLUTION, ONE_SOLUTION
+from core.lines import least_squares_point, pairwise_intersections
+from core.profiling import profile_run, profiling_requested, span
 
 st.set_page_config(
     page_title="Linear Systems",
     page_icon="🧮",
     layout='wide',
 )
-
-st.logo("images/rudra.png")
    
 
-def plot_lines(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int) -> None:
+def determine_solution(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int, rtol: float = DEFAULT_RTOL, method: str = "auto") -> str:
     """
-    Plots two lines representing the system of linear equations.
+    Determines the type of solution for a system of two linear equations.
 
     Parameters
     ----------
@@ -29,149 +38,291 @@ def plot_lines(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int) -> None:
         Coefficient of y in the second equation (a2*x + b2*y = c2).
     c2 : int
         Constant term in the second equation (a2*x + b2*y = c2).
+    rtol : float, optional
+        Relative tolerance of the rank decisions, by default that of ``np.linalg.matrix_rank``
+        (see `core.general.matrix_ranks`).
+    method : str, optional
+        "exact" for fraction-free integer elimination, "float" for the tolerance-based kernel,
+        or "auto" (default) to use the exact engine whenever every coefficient is an integer.
 
     Returns
     -------
-    None
-        Displays the plot using Streamlit's `st.pyplot`.
+    str
+        A string indicating the type of solution: "One Solution", "No Solution", or "Infinity Solution".
 
     Raises
     ------
     ValueError
-        If any of the input coefficients are not numeric.
+        If any of the input coefficients are not numeric, or "exact" is requested for non-integers.
 
     Examples
     --------
-    >>> plot_lines(1, 1, 1, 2, -1, 0)
+    >>> determine_solution(1, 1, 1, 2, 1, 2)
+    'One Solution'
+    >>> determine_solution(1, 1, 1, 1, 1, 2)
+    'No Solution'
+    >>> determine_solution(1, 1, 1, 2, 2, 2)
+    'Infinity Solution'
 
     Notes
     -----
-    This function generates a plot of two linear equations in the form ax + by = c.
-    It handles vertical lines (b1 or b2 = 0) by setting the corresponding y values to NaN and plotting vertical lines for x.
-    The plot includes a grid, axes lines, and a legend.
+    This function is a thin wrapper over the general m x n engine `core.general.classify_system`,
+    which finds the ranks of the coefficient matrix A and of the augmented matrix [A|b] by
+    fraction-free elimination for integer input and from singular values otherwise.
+    - If rank(A) = 2, the system has one unique solution.
+    - If rank(A) = rank([A|b]) < 2, the equations describe the same line and the system has infinite solutions.
+    - If rank(A) < rank([A|b]), the equations contradict each other and the system has no solution.
     """
-    x = np.linspace(-10, 10, 400)
+    return LINE_LABELS[classify_system([[a1, b1, c1], [a2, b2, c2]], rtol=rtol, method=method)]
 
-    if b1 == 0:
-        y1 = np.full_like(x, np.nan)
-        x1 = np.full_like(x, -c1 / a1)
-    else:
-        y1 = (-c1 - a1 * x) / b1
-        x1 = x
+def show_row_reduction(system: list[list[float]]) -> None:
+    """
+    Shows the exact solution and every fraction-free row operation of an integer system.
+
+    Parameters
+    ----------
+    system : list[list[float]]
+        Augmented matrix [[a1, b1, c1], [a2, b2, c2]].
 
-    if b2 == 0:
-        y2 = np.full_like(x, np.nan)
-        x2 = np.full_like(x, -c2 / a2)
+    Returns
+    -------
+    None
+        Writes the solution and the steps to the page.
+    """
+    if not is_integral(system):
+        st.info("Step-by-step reduction is available for integer coefficients.")
+        return
+    result = classify_exact(system)
+    solution = result.solution(0)
+    if result.kind[0] == ONE_SOLUTION:
+        st.latex(rf"x = {fraction_latex(solution[0])}, \quad y = {fraction_latex(solution[1])}")
+    elif result.kind[0] == NO_SOLUTION:
+        st.markdown("A row reduces to 0 = non-zero, so the equations contradict each other.")
     else:
-        y2 = (-c2 - a2 * x) / b2
-        x2 = x
+        st.markdown("Both equations reduce to the same line, so every point on it is a solution.")
+    for step in row_reduction_steps(system):
+        st.markdown(f"**{step.description}**")
+        st.latex(step.latex())
 
-    fig, ax = plt.subplots(figsize=(10, 8))
-    ax.plot(x1, y1, color=color1, label=f"{a1}x + {b1}y = {c1}", linewidth=2)
-    ax.plot(x2, y2, color=color2, label=f"{a2}x + {b2}y = {c2}", linewidth=2)
-    ax.grid(True)
-    ax.axhline(0, color='black', linewidth=0.5)
-    ax.axvline(0, color='black', linewidth=0.5)
-    ax.legend(fontsize='large')
+PRESETS = {
+    "❌ No Solution": [1, 1, 1, 1, 1, 2],
+    "♾️ Infinity Solution": [1, 1, 1, 2, 2, 2],
+    "1️⃣ One Solution": [1, 1, 1, 2, 1, 2],
+}
+COEFFICIENT_NAMES = ("a1", "b1", "c1", "a2", "b2", "c2")
 
-    st.pyplot(fig)
+def apply_preset(coefficients: list[int]) -> None:
+    """
+    Writes a preset into the session state behind the coefficient inputs.
+    """
+    for name, value in zip(COEFFICIENT_NAMES, coefficients):
+        st.session_state[f"coef_{name}"] = value
 
-def determine_solution(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int) -> str:
+def coefficient_inputs() -> None:
     """
-    Determines the type of solution for a system of two linear equations.
+    Renders the six coefficient inputs, one column per equation, bound to the session state.
+    """
+    columns = st.columns(2)
+    for index, name in enumerate(COEFFICIENT_NAMES):
+        with columns[index // 3]:
+            if index % 3 == 0:
+                st.subheader(f"Equation {index // 3 + 1}")
+            st.number_input(name, step=1, key=f"coef_{name}")
 
-    Parameters
-    ----------
-    a1 : int
-        Coefficient of x in the first equation (a1*x + b1*y = c1).
-    b1 : int
-        Coefficient of y in the first equation (a1*x + b1*y = c1).
-    c1 : int
-        Constant term in the first equation (a1*x + b1*y = c1).
-    a2 : int
-        Coefficient of x in the second equation (a2*x + b2*y = c2).
-    b2 : int
-        Coefficient of y in the second equation (a2*x + b2*y = c2).
-    c2 : int
-        Constant term in the second equation (a2*x + b2*y = c2).
+def current_coefficients() -> list[float]:
+    """
+    Returns the six coefficients from the session state, in `COEFFICIENT_NAMES` order.
+    """
+    return [st.session_state[f"coef_{name}"] for name in COEFFICIENT_NAMES]
 
-    Returns
-    -------
-    str
-        A string indicating the type of solution: "One Solution", "No Solution", or "Infinity Solution".
+def solution_panel(coefficients: list[float]) -> None:
+    """
+    Shows the solution type and the step-by-step reduction of the current system.
+    """
+    a1, b1, c1, a2, b2, c2 = coefficients
+    st.subheader("🔍 Solution Type")
+    with span("classification"):
+        solution_type = determine_solution(a1, b1, c1, a2, b2, c2)
+    st.success(f"Solution Type: {solution_type}")
 
-    Raises
-    ------
-    ValueError
-        If any of the input coefficients are not numeric.
+    with st.expander("🧾 Step-by-step Solution"), span("row_reduction"):
+        show_row_reduction([[a1, b1, c1], [a2, b2, c2]])
 
-    Examples
-    --------
-    >>> determine_solution(1, 1, 1, 2, 1, 2)
-    'One Solution'
-    >>> determine_solution(1, 1, 1, 1, 1, 2)
-    'No Solution'
-    >>> determine_solution(1, 1, 1, 2, 2, 2)
-    'Infinity Solution'
+def profiling_enabled() -> bool:
+    """
+    Profiling is on when ``LSV_PROFILE=1`` is set, or when ``LSV_PROFILE=query`` is set and
+    the page is opened with ``?profile=1``.
+    """
+    return profiling_requested(st.query_params.get("profile"))
 
-    Notes
-    -----
-    This function calculates the determinant of the coefficients to determine the solution type.
-    - If the determinant is non-zero, the system has one unique solution.
-    - If the determinant is zero and the ratios of coefficients and constants are equal, the system has infinite solutions.
-    - If the determinant is zero and the ratios are not equal, the system has no solution.
-    """
-    det = a1 * b2 - a2 * b1
-    if det == 0:
-        if (c1 * b2 - c2 * b1) == 0 and (a1 * c2 - a2 * c1) == 0:
-            return "Infinity Solution"
-        else:
-            return "No Solution"
-    else:
-        return "One Solution"
+def profiled(run: str):
+    """
+    Profiles one page or fragment run with `core.profiling.profile_run`, keeping the last
+    runs of this session for `timing_panel`.
+    """
+    enabled = profiling_enabled()
+    history = st.session_state.setdefault("profile_runs", deque(maxlen=20)) if enabled else None
+    return profile_run(run, enabled, history)
 
-st.title("📊 System of Linear Equations Visualizer")
-st.markdown("Use this tool to visualize the solution of a system of two linear equations.")
+def timing_panel() -> None:
+    """
+    Shows the spans of the latest profiled runs in the sidebar. Runs of a fragment on its
+    own appear here after the next full rerun.
+    """
+    with st.sidebar.expander("⏱️ Timing", expanded=True):
+        for profile in reversed(st.session_state.get("profile_runs", ())):
+            st.markdown(f"**{profile.run}**")
+            st.dataframe(
+                [{"stage": " " * s.depth + s.name, "ms": round(s.seconds * 1000, 2), "blocks": s.blocks} for s in profile.spans],
+                hide_index=True, use_container_width=True,
+            )
 
-big_col1, big_col2 = st.columns([1, 3])
+@st.fragment
+def chart_panel(coefficients: list[float]) -> None:
+    """
+    Color pickers, renderer choice and the chart. Changing any of them reruns only this fragment.
+    """
+    with profiled("lines/chart_panel"):
+        with span("widgets"), st.expander("📐 Customization"):
+            col1, col2, col3 = st.columns(3)
+            color1 = col1.color_picker("Pick color for Equation 1", "#5e17eb")
+            color2 = col2.color_picker("Pick color for Equation 2", "#ff3b3b")
+            renderer = col3.radio("Renderer", ["Matplotlib", "Plotly (vector)"], horizontal=True)
 
-with big_col1:
+        if renderer == "Matplotlib":
+            fig = plot_lines(*coefficients, color1, color2)
+            with span("serialization"):
+                st.pyplot(fig)
+        else:
+            fig = plot_lines(*coefficients, color1, color2, backend="plotly")
+            with span("serialization"):
+                st.plotly_chart(fig, use_container_width=True)
+        # Built only when clicked: a single HTML file that solves and draws in the browser.
+        st.download_button(
+            "⬇️ Offline page (HTML)", lambda: export_html("lines", coefficients, (color1, color2)),
+            file_name="lines.html", mime="text/html", on_click="ignore",
+            help="A standalone page for classrooms without a connection: edits are solved in the browser.",
+        )
 
-    with st.expander("🎯 Choose a Preset System", expanded=True):
-        col1, col2, col3 = st.columns(3)
-        # Initialize variables with default values
-        a1, b1, c1, a2, b2, c2 = 1, 1, 1, 1, 1, 2
+LINE_SET_EXAMPLE = "1 1 3\n1 -1 -1\n2 1 4.2\n0 1 1.8\n1 0 1.1"
 
-        if col1.button("❌ No Solution"):
-            a1, b1, c1, a2, b2, c2 = 1, 1, 1, 1, 1, 2
-        if col2.button("♾️ Infinity Solution"):
-            a1, b1, c1, a2, b2, c2 = 1, 1, 1, 2, 2, 2
-        if col3.button("1️⃣ One Solution"):
-            a1, b1, c1, a2, b2, c2 = 1, 1, 1, 2, 1, 2
+def random_lines(count: int, noise: float, seed: int = 0) -> np.ndarray:
+    """
+    Returns ``count`` lines in random directions passing near (1, 2), each shifted by a normal
+    offset with standard deviation ``noise``.
+    """
+    rng = np.random.default_rng(seed)
+    angle = rng.uniform(0, np.pi, count)
+    a, b = np.cos(angle), np.sin(angle)
+    return np.column_stack((a, b, a * 1 + b * 2 + rng.normal(scale=noise, size=count)))
 
-    with st.expander("✏️ Input Equations", expanded=False):
-        col1, col2 = st.columns(2)
+@st.fragment
+def line_set_panel() -> None:
+    """
+    Draws many lines at once with their pairwise intersections and least-squares point.
+    Editing it reruns only this fragment.
+    """
+    with profiled("lines/line_set"):
+        col1, col2 = st.columns([1, 3])
         with col1:
-            st.subheader("Equation 1")
-            a1 = st.number_input("a1", value=a1)
-            b1 = st.number_input("b1", value=b1) 
-            c1 = st.number_input("c1", value=c1)
+            source = st.radio("Lines", ["Type equations", "Random lines"], horizontal=True)
+            if source == "Type equations":
+                text = st.text_area("One equation a b c per line (ax + by = c)", LINE_SET_EXAMPLE, height=150)
+                try:
+                    lines = parse_matrix(text)
+                except ValueError as error:
+                    st.error(str(error))
+                    return
+                if lines.shape[1] != 3:
+                    st.error("Enter three numbers a b c per line.")
+                    return
+            else:
+                count = st.number_input("Number of lines", min_value=2, max_value=10_000, value=1_000, step=500)
+                noise = st.slider("Offset noise", 0.0, 3.0, 0.5)
+                lines = random_lines(count, noise)
+            renderer = st.radio("Renderer", ["Matplotlib", "Plotly (vector)"], index=1, horizontal=True, key="line_set_renderer", help="Matplotlib rasterizes every line on the server, which takes seconds for thousands of lines.")
+
+            with span("intersections"):
+                meeting = pairwise_intersections(lines, viewport=DEFAULT_VIEWPORT, max_points=DEFAULT_POINT_BUDGET)
+            with span("least_squares"):
+                try:
+                    point, rms, solution = least_squares_point(lines)
+                except ValueError as error:
+                    st.error(str(error))
+                    return
+            m = len(lines)
+            st.markdown(f"{meeting.total:,} of {m * (m - 1) // 2:,} pairs cross inside the view.")
+            if solution.kind == ONE_SOLUTION:
+                st.success(f"All lines meet at ({point[0]:.4g}, {point[1]:.4g}).")
+            elif solution.kind == INFINITE_SOLUTIONS:
+                st.success("All lines are the same line.")
+            else:
+                st.info(f"Least-squares point ({point[0]:.4g}, {point[1]:.4g}), RMS distance to the lines {rms:.3g}.")
+
         with col2:
-            st.subheader("Equation 2")
-            a2 = st.number_input("a2", value=a2)
-            b2 = st.number_input("b2", value=b2)
-            c2 = st.number_input("c2", value=c2)
+            if renderer == "Matplotlib":
+                fig = plot_line_set(lines, meeting, point)
+                with span("serialization"):
+                    st.pyplot(fig)
+            else:
+                fig = plot_line_set(lines, meeting, point, backend="plotly")
+                with span("serialization"):
+                    st.plotly_chart(fig, use_container_width=True)
 
-    # Sidebar for color customization
-    with st.expander("📐 Customization"):
-        color1 = st.color_picker("Pick color for Equation 1", "#5e17eb")
-        color2 = st.color_picker("Pick color for Equation 2", "#ff3b3b")
+@st.fragment
+def system_workspace(form_mode: bool) -> None:
+    """
+    Presets, coefficient inputs, solution and chart.
 
-    st.markdown("---")
-    st.subheader("🔍 Solution Type")
-    solution_type = determine_solution(a1, b1, c1, a2, b2, c2)
-    st.success(f"Solution Type: {solution_type}")
+    Editing a coefficient reruns only this fragment, and the nested `chart_panel` reruns on its
+    own for color and renderer changes. In form mode the inputs only rerun it when the form is
+    submitted.
+    """
+    with profiled("lines/workspace"):
+        big_col1, big_col2 = st.columns([1, 3])
+
+        with big_col1, span("widgets"):
+            with st.expander("🎯 Choose a Preset System", expanded=True):
+                columns = st.columns(3)
+                for column, (label, coefficients) in zip(columns, PRESETS.items()):
+                    column.button(label, on_click=apply_preset, args=(coefficients,))
+
+            with st.expander("✏️ Input Equations", expanded=False):
+                if form_mode:
+                    with st.form("coefficients_form", border=False):
+                        coefficient_inputs()
+                        st.form_submit_button("Apply", use_container_width=True)
+                else:
+                    coefficient_inputs()
+
+        with big_col1:
+            st.markdown("---")
+            coefficients = current_coefficients()
+            solution_panel(coefficients)
+
+        with big_col2:
+            st.header("📈 Graphical Representation of Linear Systems as Lines")
+            chart_panel(coefficients)
+
+def main():
+    with profiled("lines"):
+        with span("image_loading"):
+            st.logo(image_bytes("images/rudra.png", LOGO_WIDTH))
+        st.title("📊 System of Linear Equations Visualizer")
+        st.markdown("Use this tool to visualize the solution of a system of two linear equations.")
+
+        if "coef_a1" not in st.session_state:
+            apply_preset(PRESETS["❌ No Solution"])
+
+        form_mode = st.toggle("📝 Submit all coefficients at once", help="Edit the coefficients freely and redraw only when you press Apply.")
+        system_workspace(form_mode)
+
+        st.markdown("---")
+        st.header("🕸️ Many Lines")
+        line_set_panel()
+
+    if profiling_enabled():
+        timing_panel()
 
-with big_col2:
-    st.header("📈 Graphical Representation of Linear Systems as Lines")
-    plot_lines(a1, b1, c1, a2, b2, c2)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
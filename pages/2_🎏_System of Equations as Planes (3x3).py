@@ -1,136 +1,32 @@
+import io
+from collections import deque
+
 import streamlit as st
-import plotly.graph_objects as go
 import numpy as np
 
+from core.assets import LOGO_WIDTH, image_bytes
+from core.bulk import DEFAULT_CHUNK_ROWS, FORMATS, classify_file, input_errors
+from core.cache import SYSTEM_CACHE, canonical_system
+from core.exact import classify_exact, fraction_latex, is_integral, row_reduction_steps
+from core.export import export_html
+from core.figures import plot_3_planes, plot_solution_set, plot_sweep
+from core.kinds import NO_SOLUTION, ONE_SOLUTION, PLANE_LABELS
+from core.payload import payload_nbytes
+from core.general import classify_system, parse_matrix, project_solution, slice_system, solve_system
+from core.geometry import DEFAULT_PLANE_BUDGET
+from core.planes import DEFAULT_RTOL
+from core.prefetch import PREFETCHER, last_edited, neighbours, warm_plane_system
+from core.prefetch import env_enabled as prefetch_enabled
+from core.profiling import profile_run, profiling_requested, span
+from core.store import FIGURE_CODEC, LABEL_CODEC, shared, shared_store
+
 st.set_page_config(
     page_title="System of Equations as Planes (3x3)",
     page_icon="🎏",
     layout='wide',
 )
 
-st.logo("images/rudra.png")
-
-def create_plane_data(a: float, b: float, c: float, d: float, x_range: np.ndarray, y_range: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-    """
-    Creates a meshgrid representation of a plane in 3D space.
-
-    Parameters
-    ----------
-    a : float
-        Coefficient of x in the plane equation (ax + by + cz = d).
-    b : float
-        Coefficient of y in the plane equation (ax + by + cz = d).
-    c : float
-        Coefficient of z in the plane equation (ax + by + cz = d).
-    d : float
-        Constant term in the plane equation (ax + by + cz = d).
-    x_range : np.ndarray
-        Array representing the range of x values.
-    y_range : np.ndarray
-        Array representing the range of y values.
-
-    Returns
-    -------
-    tuple[np.ndarray, np.ndarray, np.ndarray]
-        A tuple containing X, Y, and Z meshgrid arrays representing the plane.
-
-    Raises
-    ------
-    ValueError
-        If any of the input coefficients are not numeric.
-
-    Examples
-    --------
-    >>> x_range = np.linspace(-10, 10, 10)
-    >>> y_range = np.linspace(-10, 10, 10)
-    >>> X, Y, Z = create_plane_data(1, 1, 1, 1, x_range, y_range)
-
-    Notes
-    -----
-    This function generates a 3D meshgrid representing a plane defined by the equation ax + by + cz = d.
-    If c is zero, the Z values are set to zero, indicating a plane parallel to the xy-plane.
-    """
-    X, Y = np.meshgrid(x_range, y_range)
-    Z = np.zeros_like(X) if c == 0 else (d - a * X - b * Y) / c
-    return X, Y, Z
-
-def plot_3_planes(a1: float, b1: float, c1: float, d1: float, a2: float, b2: float, c2: float, d2: float, a3: float, b3: float, c3: float, d3: float, color1: str, color2: str, color3: str) -> go.Figure:
-    """
-    Plots three 3D planes.
-
-    Parameters
-    ----------
-    a1 : float
-        Coefficient of x in the first plane equation.
-    b1 : float
-        Coefficient of y in the first plane equation.
-    c1 : float
-        Coefficient of z in the first plane equation.
-    d1 : float
-        Constant term in the first plane equation.
-    a2 : float
-        Coefficient of x in the second plane equation.
-    b2 : float
-        Coefficient of y in the second plane equation.
-    c2 : float
-        Coefficient of z in the second plane equation.
-    d2 : float
-        Constant term in the second plane equation.
-    a3 : float
-        Coefficient of x in the third plane equation.
-    b3 : float
-        Coefficient of y in the third plane equation.
-    c3 : float
-        Coefficient of z in the third plane equation.
-    d3 : float
-        Constant term in the third plane equation.
-    color1 : str
-        Color of the first plane.
-    color2 : str
-        Color of the second plane.
-    color3 : str
-        Color of the third plane.
-
-    Returns
-    -------
-    go.Figure
-        A Plotly Figure object containing the 3D plot of the planes.
-
-    Raises
-    ------
-    ValueError
-        If any of the input coefficients are not numeric.
-
-    Examples
-    --------
-    >>> fig = plot_3_planes(1, 1, 1, 1, 2, 1, 1, 2, 1, 2, 1, 3, "#5e17eb", "#ff3b3b", "#1BFF00")
-
-    Notes
-    -----
-    This function generates a 3D plot of three planes using Plotly.
-    It takes coefficients and colors for each plane and creates a 3D surface plot.
-    """
-    x_range = np.linspace(-15, 15, 100)
-    y_range = np.linspace(-15, 15, 100)
-
-    X1, Y1, Z1 = create_plane_data(a1, b1, c1, d1, x_range, y_range)
-    X2, Y2, Z2 = create_plane_data(a2, b2, c2, d2, x_range, y_range)
-    X3, Y3, Z3 = create_plane_data(a3, b3, c3, d3, x_range, y_range)
-
-    fig = go.Figure()
-
-    fig.add_trace(go.Surface(x=X1, y=Y1, z=Z1, colorscale=[[0, color1], [1, color1]], showscale=False))
-    fig.add_trace(go.Surface(x=X2, y=Y2, z=Z2, colorscale=[[0, color2], [1, color2]], showscale=False))
-    fig.add_trace(go.Surface(x=X3, y=Y3, z=Z3, colorscale=[[0, color3], [1, color3]], showscale=False))
-
-    fig.update_layout(
-        scene=dict(xaxis_title="X", yaxis_title="Y", zaxis_title="Z"),
-        margin=dict(l=0, r=0, t=20, b=20)  # Adjust margins for better layout
-    )
-    
-    return fig
-
-def determine_solution_3v(a1: float, b1: float, c1: float, d1: float, a2: float, b2: float, c2: float, d2: float, a3: float, b3: float, c3: float, d3: float) -> str:
+def determine_solution_3v(a1: float, b1: float, c1: float, d1: float, a2: float, b2: float, c2: float, d2: float, a3: float, b3: float, c3: float, d3: float, rtol: float = DEFAULT_RTOL, method: str = "auto") -> str:
     """
     Determines the type of solution for a system of 3 linear equations.
 
@@ -160,6 +56,11 @@ def determine_solution_3v(a1: float, b1: float, c1: float, d1: float, a2: float,
         Coefficient of z in the third equation.
     d3 : float
         Constant term in the third equation.
+    rtol : float, optional
+        Relative tolerance for the rank decisions (see `core.general.solve_system`).
+    method : str, optional
+        "exact" for fraction-free integer elimination, "float" for the SVD kernel,
+        or "auto" (default) to use the exact engine whenever every coefficient is an integer.
 
     Returns
     -------
@@ -169,7 +70,7 @@ def determine_solution_3v(a1: float, b1: float, c1: float, d1: float, a2: float,
     Raises
     ------
     ValueError
-        If any of the input coefficients are not numeric.
+        If any of the input coefficients are not numeric, or "exact" is requested for non-integers.
 
     Examples
     --------
@@ -180,72 +81,414 @@ def determine_solution_3v(a1: float, b1: float, c1: float, d1: float, a2: float,
     -----
     This function analyzes the coefficients of the three linear equations to determine the solution type.
     It calculates the rank of the coefficient matrix and the augmented matrix to identify whether the system has no, one, or infinite solutions.
+    It is a thin wrapper over the general m x n engine `core.general.classify_system`: integer
+    systems are classified exactly by fraction-free elimination, otherwise the ranks come from
+    the singular values of the coefficient and augmented matrices.
+    """
+    system = [[a1, b1, c1, d1], [a2, b2, c2, d2], [a3, b3, c3, d3]]
+    return PLANE_LABELS[classify_system(system, rtol=rtol, method=method)]
+
+def show_row_reduction(system: list[list[float]]) -> None:
     """
-    A = np.array([[a1, b1, c1], [a2, b2, c2], [a3, b3, c3]])
-    B = np.array([d1, d2, d3])
-    rank_A = np.linalg.matrix_rank(A)
-    rank_AB = np.linalg.matrix_rank(np.column_stack((A, B)))
+    Shows the exact solution and every fraction-free row operation of an integer system.
+
+    Parameters
+    ----------
+    system : list[list[float]]
+        Augmented matrix [[a1, b1, c1, d1], [a2, b2, c2, d2], [a3, b3, c3, d3]].
 
-    if rank_A < rank_AB:
-        return "❌ No Solution"
-    elif rank_A == 3:
-        return "✅ One Unique Solution"
+    Returns
+    -------
+    None
+        Writes the solution and the steps to the page.
+    """
+    if not is_integral(system):
+        st.info("Step-by-step reduction is available for integer coefficients.")
+        return
+    result = classify_exact(system)
+    if result.kind[0] == ONE_SOLUTION:
+        x, y, z = (fraction_latex(v) for v in result.solution(0))
+        st.latex(rf"x = {x}, \quad y = {y}, \quad z = {z}")
+    elif result.kind[0] == NO_SOLUTION:
+        st.markdown("A row reduces to 0 = non-zero, so the planes share no common point.")
+    elif result.rank_A[0] == 2:
+        point = ", ".join(fraction_latex(v) for v in result.solution(0))
+        direction = ", ".join(str(v) for v in result.direction[0])
+        st.latex(rf"(x, y, z) = ({point}) + t\,({direction})")
     else:
-        return "♾️ Infinite Solutions"
+        st.markdown("The planes coincide, so every point of that plane is a solution.")
+    for step in row_reduction_steps(system):
+        st.markdown(f"**{step.description}**")
+        st.latex(step.latex())
+
+PRESETS = {
+    "❌ No Solution": [1, 1, 1, 1, 1, 1, 1, 2, 1, 1, 1, 3],
+    "♾️ Infinite Solutions": [1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3],
+    "✅ One Solution": [1, 1, 1, 1, 2, 1, 1, 2, 1, 2, 1, 3],
+}
+COEFFICIENT_NAMES = ("a1", "b1", "c1", "d1", "a2", "b2", "c2", "d2", "a3", "b3", "c3", "d3")
+GENERAL_EXAMPLE = "1 1 1 1 4\n1 -1 0 2 1\n0 2 1 -1 3"
+
+def apply_preset(coefficients: list[int]) -> None:
+    """
+    Writes a preset into the session state behind the coefficient inputs.
+    """
+    for name, value in zip(COEFFICIENT_NAMES, coefficients):
+        st.session_state[f"coef_{name}"] = value
 
-def main():
-    st.title("🔢 System of Linear Equations (3 Variables)")
+def coefficient_inputs() -> None:
+    """
+    Renders the twelve coefficient inputs, one column per plane, bound to the session state.
+    """
+    st.markdown("a1 is Blue Plane")
+    columns = st.columns(3)
+    for index, name in enumerate(COEFFICIENT_NAMES):
+        with columns[index // 4]:
+            st.number_input(name, step=1, key=f"coef_{name}")
+
+def current_coefficients() -> list[float]:
+    """
+    Returns the twelve coefficients from the session state, in `COEFFICIENT_NAMES` order.
+    """
+    return [st.session_state[f"coef_{name}"] for name in COEFFICIENT_NAMES]
 
-    if "coefficients" not in st.session_state:
-        st.session_state.coefficients = [1, 1, 1, 1, 1, 1, 1, 2, 1, 1, 1, 3]
+def solution_panel(coefficients: list[float]) -> None:
+    """
+    Shows the solution type and the step-by-step reduction of the current system.
+    """
+    a1, b1, c1, d1, a2, b2, c2, d2, a3, b3, c3, d3 = coefficients
+    with span("classification"):
+        key, _ = canonical_system([[a1, b1, c1, d1], [a2, b2, c2, d2], [a3, b3, c3, d3]])
+        # Classified from the canonical rows, as the chart overlay is (core.figures.build_plane_geometry).
+        solution_type = SYSTEM_CACHE.get_or_compute(("solution", key), lambda: shared(
+            ("solution", key), lambda: determine_solution_3v(*(v for row in key for v in row)), LABEL_CODEC,
+        ))
+    st.subheader("🔍 Solution Type")
+    st.success(f"Solution: {solution_type}")
+
+    with st.expander("🧾 Step-by-step Solution"), span("row_reduction"):
+        show_row_reduction([[a1, b1, c1, d1], [a2, b2, c2, d2], [a3, b3, c3, d3]])
+
+def profiling_enabled() -> bool:
+    """
+    Profiling is on when ``LSV_PROFILE=1`` is set, or when ``LSV_PROFILE=query`` is set and
+    the page is opened with ``?profile=1``.
+    """
+    return profiling_requested(st.query_params.get("profile"))
 
-    big_col1, big_col2 = st.columns([1, 3])
+def profiled(run: str):
+    """
+    Profiles one page or fragment run with `core.profiling.profile_run`, keeping the last
+    runs of this session for `timing_panel`.
+    """
+    enabled = profiling_enabled()
+    history = st.session_state.setdefault("profile_runs", deque(maxlen=20)) if enabled else None
+    return profile_run(run, enabled, history)
 
-    with big_col1:
-        with st.expander("🎯 Preset Scenarios", expanded=True):
-            col1, col2, col3 = st.columns(3)
-            if col1.button("❌ No Solution"):
-                st.session_state.coefficients = [1, 1, 1, 1, 1, 1, 1, 2, 1, 1, 1, 3]
-            if col2.button("♾️ Infinite Solutions"):
-                st.session_state.coefficients = [1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3]
-            if col3.button("✅ One Solution"):
-                st.session_state.coefficients = [1, 1, 1, 1, 2, 1, 1, 2, 1, 2, 1, 3]
-
-        with st.expander("✏️ Enter Coefficients", expanded=False):
-            st.markdown("a1 is Blue Plane")
+def timing_panel() -> None:
+    """
+    Shows the spans of the latest profiled runs in the sidebar. Runs of a fragment on its
+    own appear here after the next full rerun.
+    """
+    with st.sidebar.expander("⏱️ Timing", expanded=True):
+        for profile in reversed(st.session_state.get("profile_runs", ())):
+            st.markdown(f"**{profile.run}**")
+            st.dataframe(
+                [{"stage": " " * s.depth + s.name, "ms": round(s.seconds * 1000, 2), "blocks": s.blocks} for s in profile.spans],
+                hide_index=True, use_container_width=True,
+            )
+
+def chart_figure(coefficients: list[float], style: tuple):
+    """
+    Draws the 3D chart of ``coefficients`` in ``style``, served from the shared result store
+    (`core.store`) when another server process has drawn it already.
+
+    Returns the figure and its payload size, which is measured once per chart and then kept
+    in `SYSTEM_CACHE`.
+    """
+    color1, color2, color3, compact, overlay = style
+    key, order = canonical_system([coefficients[0:4], coefficients[4:8], coefficients[8:12]])
+    fig = shared(
+        ("figure", key, order, style),
+        lambda: plot_3_planes(*coefficients, color1, color2, color3, compact=compact, intersections=overlay), FIGURE_CODEC,
+    )
+    return fig, SYSTEM_CACHE.get_or_compute(("payload", key, order, style), lambda: payload_nbytes(fig))
+
+def store_panel() -> None:
+    """
+    Shows the size of the shared result store and how often this server process found a result in it.
+    """
+    stats = shared_store().stats()
+    with st.sidebar.expander("🗄️ Shared results"):
+        st.metric("Hit rate", f"{stats.hit_rate:.0%}", help=f"{stats.hits} of {stats.hits + stats.misses} lookups by this server process.")
+        st.dataframe(
+            [{"entries": stats.entries, "MB": round(stats.nbytes / 2**20, 2), "writes": stats.writes, "errors": stats.errors}],
+            hide_index=True,
+        )
+
+def prefetch_panel() -> None:
+    """
+    Shows how often a nudge found its chart prefetched, across every session of this server.
+    """
+    stats = PREFETCHER.stats()
+    with st.sidebar.expander("⚡ Prefetch"):
+        st.metric("Hit rate", f"{stats.hit_rate:.0%}", help=f"{stats.hits} of {stats.hits + stats.misses} edits found their chart ready.")
+        st.dataframe(
+            [{"completed": stats.completed, "cancelled": stats.cancelled, "throttled": stats.throttled, "failed": stats.failed, "CPU s": round(stats.cpu_seconds, 2)}],
+            hide_index=True,
+        )
+
+def take_prefetched(coefficients: list[float], style: tuple):
+    """
+    Returns the figure and payload size prefetched for ``coefficients`` drawn in ``style``, or None. A chart
+    for new coefficients counts as a prefetch hit or miss.
+
+    The jobs of the previous chart that have not started yet are cancelled: this chart is
+    built now either way.
+    """
+    if "prefetch_batch" in st.session_state:
+        PREFETCHER.cancel(st.session_state["prefetch_batch"])
+    chart = st.session_state.get("prefetched_figures", {}).pop((tuple(coefficients), style), None)
+    if st.session_state.get("prefetch_last", coefficients) != coefficients:
+        PREFETCHER.record(chart is not None)
+    return chart
+
+def prefetch_neighbours(coefficients: list[float], style: tuple) -> None:
+    """
+    Prefetches the systems one step either side of the last edited coefficient: their
+    solution type and plane geometry into `SYSTEM_CACHE`, and their figures drawn in
+    ``style`` into this session. Scheduling cancels the jobs of the previous chart.
+    """
+    index = last_edited(st.session_state.get("prefetch_last"), coefficients)
+    if index is None:
+        index = st.session_state.get("prefetch_index")  # A preset keeps the coefficient being nudged.
+    st.session_state["prefetch_last"] = coefficients
+    if index is None or st.session_state.get("prefetch_scheduled") == (coefficients, style, index):
+        return
+    # Figures are mutable, so they stay in the session that asked for them. Jobs of the
+    # previous batch that are still running fill the dict this one replaces.
+    figures = {}
+
+    def job(system):
+        warm_plane_system(system)
+        figures[(tuple(system), style)] = chart_figure(system, style)
+
+    jobs = [lambda system=system: job(system) for system in neighbours(coefficients, index)]
+    st.session_state["prefetched_figures"] = figures
+    st.session_state["prefetch_index"] = index
+    st.session_state["prefetch_scheduled"] = (coefficients, style, index)
+    st.session_state["prefetch_batch"] = PREFETCHER.schedule(jobs, previous=st.session_state.get("prefetch_batch"))
+
+@st.fragment
+def chart_panel(coefficients: list[float]) -> None:
+    """
+    Color pickers, sweep settings and the 3D chart. Changing any of them reruns only this fragment.
+    """
+    with profiled("planes/chart_panel"):
+        with span("widgets"), st.expander("📐 Customization"):
             col1, col2, col3 = st.columns(3)
-            coefficients = st.session_state.coefficients
-            with col1:
-                a1 = st.number_input("a1", value=coefficients[0])
-                b1 = st.number_input("b1", value=coefficients[1])
-                c1 = st.number_input("c1", value=coefficients[2])
-                d1 = st.number_input("d1", value=coefficients[3])
-            with col2:
-                a2 = st.number_input("a2", value=coefficients[4])
-                b2 = st.number_input("b2", value=coefficients[5])
-                c2 = st.number_input("c2", value=coefficients[6])
-                d2 = st.number_input("d2", value=coefficients[7])
-            with col3:
-                a3 = st.number_input("a3", value=coefficients[8])
-                b3 = st.number_input("b3", value=coefficients[9])
-                c3 = st.number_input("c3", value=coefficients[10])
-                d3 = st.number_input("d3", value=coefficients[11])
-
-        # Sidebar for color customization
-        with st.expander("📐 Customization"):
-            color1 = st.color_picker("Pick color for Plane 1", "#5e17eb")
-            color2 = st.color_picker("Pick color for Plane 2", "#ff3b3b")
-            color3 = st.color_picker("Pick color for Plane 3", "#1BFF00")
+            color1 = col1.color_picker("Pick color for Plane 1", "#5e17eb")
+            color2 = col2.color_picker("Pick color for Plane 2", "#ff3b3b")
+            color3 = col3.color_picker("Pick color for Plane 3", "#1BFF00")
+            compact = st.toggle("Compact chart payload", value=True, help="Send one float32 mesh without a template instead of one float64 mesh per plane.")
+            overlay = st.toggle("Show intersections", value=True, help="Draw where each pair of planes meets and the common point or line.")
+
+        with span("widgets"), st.expander("🎞️ Sweep a Coefficient"):
+            sweep = st.toggle("Animate a coefficient over a range")
+            col1, col2, col3, col4 = st.columns(4)
+            index = col1.selectbox("Coefficient", range(len(COEFFICIENT_NAMES)), format_func=COEFFICIENT_NAMES.__getitem__)
+            start = col2.number_input("From", value=-5.0)
+            stop = col3.number_input("To", value=5.0)
+            frames = col4.number_input("Frames", min_value=2, max_value=201, value=21)
+
+        style = (color1, color2, color3, compact, overlay)
+        prefetch = prefetch_enabled() and not sweep
+        if sweep:
+            fig = plot_sweep(coefficients, index, np.linspace(start, stop, frames), color1, color2, color3)
+            sweep_key = ("sweep_payload", tuple(coefficients), index, start, stop, frames, color1, color2, color3)
+            nbytes = SYSTEM_CACHE.get_or_compute(sweep_key, lambda: payload_nbytes(fig))
+        else:
+            chart = take_prefetched(coefficients, style) if prefetch else None
+            fig, nbytes = chart if chart is not None else chart_figure(coefficients, style)
+        with span("serialization"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Chart payload: {nbytes:,} bytes")
+        # Built only when clicked: a single HTML file that solves and draws in the browser.
+        st.download_button(
+            "⬇️ Offline page (HTML)", lambda: export_html("planes", coefficients, (color1, color2, color3)),
+            file_name="planes.html", mime="text/html", on_click="ignore",
+            help="A standalone page for classrooms without a connection: edits are solved in the browser.",
+        )
+        if prefetch:
+            prefetch_neighbours(coefficients, style)
+
+@st.fragment
+def general_system_panel() -> None:
+    """
+    Solves a system of m equations in n unknowns and draws a 3-variable projection or slice
+    of its solution set. Editing it reruns only this fragment.
+    """
+    with profiled("planes/general"):
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            text = st.text_area("Augmented matrix [A | b], one equation per line", GENERAL_EXAMPLE, height=150)
+            try:
+                augmented = parse_matrix(text)
+            except ValueError as error:
+                st.error(str(error))
+                return
+            n = augmented.shape[1] - 1
+            names = [f"x{i + 1}" for i in range(n)]
+            with span("classification"):
+                solution = solve_system(augmented, method="auto")
+            st.success(f"Solution: {PLANE_LABELS[solution.kind]}")
+            st.markdown(
+                f"rank(A) = {solution.rank_A}, rank([A|b]) = {solution.rank_Ab}, "
+                f"{solution.null_space.shape[1]} free direction(s), residual {solution.residual_norm:.3g}"
+            )
+            if n < 3:
+                st.info("Enter at least three unknowns to draw the solution set in 3D.")
+                return
+            variables = st.multiselect("Unknowns to show", range(n), default=[0, 1, 2], format_func=names.__getitem__, max_selections=3)
+            if len(variables) != 3:
+                st.info("Pick exactly three unknowns.")
+                return
+            mode = st.radio("View", ["Projection", "Slice"], horizontal=True, help="Projection shows the shadow of the whole solution set; Slice fixes the other unknowns.")
+            fixed = []
+            if mode == "Slice":
+                for i in range(n):
+                    if i not in variables:
+                        fixed.append(st.number_input(f"{names[i]} =", value=0.0, key=f"fixed_{i}"))
+            budget = st.number_input("Most planes to draw", min_value=1, max_value=50_000, value=DEFAULT_PLANE_BUDGET, step=500, help="Above this many equations, only the planes nearest the solution are drawn, all in one mesh.")
+
+        with col2:
+            axis_titles = tuple(names[i] for i in variables)
+            if mode == "Projection":
+                point, basis = project_solution(solution, variables)
+                planes = augmented[:, variables + [n]] if n == 3 else None
+                empty = solution.kind == NO_SOLUTION
+            else:
+                planes = slice_system(augmented, variables, fixed)
+                sliced = solve_system(planes)
+                point, basis = sliced.particular, sliced.null_space
+                empty = sliced.kind == NO_SOLUTION
+            if empty:
+                st.warning("The solution set is empty here.")
+            if planes is not None and len(planes) > budget:
+                st.caption(f"Drawing at most {budget:,} of {len(planes):,} equation planes, those nearest the solution.")
+            fig = plot_solution_set(None if empty else point, basis, planes, axis_titles, plane_budget=budget, focus=point)
+            with span("serialization"):
+                st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def bulk_panel() -> None:
+    """
+    Classifies an uploaded CSV or Parquet file of systems chunk by chunk with a progress bar
+    and offers the results for download. Using it reruns only this fragment.
+    """
+    with profiled("planes/bulk"):
+        upload = st.file_uploader("CSV or Parquet file with the columns a1 … d3 (or a1 … c2 for lines)", type=list(FORMATS))
+        col1, col2 = st.columns(2)
+        chunk_rows = col1.number_input("Rows per chunk", min_value=1_000, max_value=1_000_000, value=DEFAULT_CHUNK_ROWS, step=10_000)
+        out_format = col2.radio("Results as", FORMATS, horizontal=True)
+        if upload is None:
+            return
+        key = (upload.file_id, chunk_rows, out_format)
+
+        if st.button("Classify", type="primary"):
+            bar = st.progress(0.0, text="Classifying…")
+
+            def show(chunk):
+                bar.progress(chunk.progress or 0.0, text=f"Chunk {chunk.index + 1}: {chunk.rows:,} rows at {chunk.rows_per_second:,.0f} rows/s")
+
+            output = io.BytesIO()
+            try:
+                with span("classification"):
+                    report = classify_file(upload, output, chunk_rows, out_format=out_format, progress=show)
+            except input_errors() as error:
+                bar.empty()
+                st.error(str(error))
+                return
+            bar.progress(1.0, text=f"Classified {report.rows:,} rows in {report.seconds:.2f} s ({report.rows_per_second:,.0f} rows/s)")
+            # Kept in the session so the download survives the reruns of other widgets.
+            st.session_state["bulk_result"] = (key, report, output.getvalue())
+
+        saved = st.session_state.get("bulk_result")
+        if saved is None or saved[0] != key:
+            return
+        _, report, data = saved
+        st.dataframe([{"solution type": label, "rows": count} for label, count in report.counts.items()], hide_index=True)
+        with st.expander("Per-chunk throughput"):
+            st.dataframe(
+                [{"chunk": c.index + 1, "rows": c.rows, "invalid": c.invalid, "ms": round(c.seconds * 1000, 1), "rows/s": round(c.rows_per_second)} for c in report.chunks],
+                hide_index=True, use_container_width=True,
+            )
+        name = upload.name.rsplit(".", 1)[0]
+        st.download_button(
+            f"⬇️ Download {out_format.upper()}", data, file_name=f"{name}_classified.{out_format}",
+            mime="text/csv" if out_format == "csv" else "application/vnd.apache.parquet", on_click="ignore",
+        )
+
+@st.fragment
+def system_workspace(form_mode: bool) -> None:
+    """
+    Presets, coefficient inputs, solution and chart.
+
+    Editing a coefficient reruns only this fragment, and the nested `chart_panel` reruns on its
+    own for color changes. In form mode the inputs only rerun it when the form is submitted.
+    """
+    with profiled("planes/workspace"):
+        big_col1, big_col2 = st.columns([1, 3])
+
+        with big_col1, span("widgets"):
+            with st.expander("🎯 Preset Scenarios", expanded=True):
+                columns = st.columns(3)
+                for column, (label, coefficients) in zip(columns, PRESETS.items()):
+                    column.button(label, on_click=apply_preset, args=(coefficients,))
+
+            with st.expander("✏️ Enter Coefficients", expanded=False):
+                if form_mode:
+                    with st.form("coefficients_form", border=False):
+                        coefficient_inputs()
+                        st.form_submit_button("Apply", use_container_width=True)
+                else:
+                    coefficient_inputs()
+
+        with big_col1:
+            st.markdown("---")
+            coefficients = current_coefficients()
+            solution_panel(coefficients)
+
+        with big_col2:
+            st.header("🎨 3D Representation of Linear Equations")
+            chart_panel(coefficients)
+
+def main():
+    with profiled("planes"):
+        with span("image_loading"):
+            st.logo(image_bytes("images/rudra.png", LOGO_WIDTH))
+        st.title("🔢 System of Linear Equations (3 Variables)")
+
+        if "coef_a1" not in st.session_state:
+            apply_preset(PRESETS["❌ No Solution"])
+
+        form_mode = st.toggle("📝 Submit all coefficients at once", help="Edit the coefficients freely and redraw only when you press Apply.")
+        system_workspace(form_mode)
+
+        st.markdown("---")
+        st.header("🧮 General m × n Systems")
+        general_system_panel()
 
         st.markdown("---")
-        solution_type = determine_solution_3v(a1, b1, c1, d1, a2, b2, c2, d2, a3, b3, c3, d3)
-        st.subheader("🔍 Solution Type")
-        st.success(f"Solution: {solution_type}")
-
-    with big_col2:
-        st.header("🎨 3D Representation of Linear Equations")
-        fig = plot_3_planes(a1, b1, c1, d1, a2, b2, c2, d2, a3, b3, c3, d3, color1, color2, color3)
-        st.plotly_chart(fig, use_container_width=True)
+        st.header("📂 Classify a File")
+        bulk_panel()
+
+    if profiling_enabled():
+        timing_panel()
+    if prefetch_enabled():
+        prefetch_panel()
+    if shared_store() is not None:
+        store_panel()
 
 if __name__ == "__main__":
     main()
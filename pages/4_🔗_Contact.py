@@ -1,5 +1,8 @@
+from html import escape
+
 import streamlit as st
-import pandas as pd
+
+from core.assets import LOGO_WIDTH, PROFILE_WIDTH, image_bytes
 
 def main():
     
@@ -9,14 +12,14 @@ def main():
     layout='centered',
     )
     
-    st.logo("images/rudra.png")
+    st.logo(image_bytes("images/rudra.png", LOGO_WIDTH))
     
     st.title("My Social Media Links")
     
     col1, col2 = st.columns(2)
     with col1:
         # Display the image below the name
-        st.image("images/rudra.png", width=250, use_container_width=False)    
+        st.image(image_bytes("images/rudra.png", PROFILE_WIDTH), width=PROFILE_WIDTH)    
 
         # Profile Section
         st.markdown("""
@@ -35,18 +38,13 @@ def main():
             
         }
 
-        # Create a Pandas DataFrame from the dictionary
-        df = pd.DataFrame(list(social_media.items()), columns=["Social Media", "Link"])
-
         # Function to create clickable links in the table
         def make_clickable(link):
-            return f'<a target="_blank" href="{link}">Link</a>'
-
-        # Apply the make_clickable function to the 'Link' column
-        df['Link'] = df['Link'].apply(make_clickable)
+            return f'<a target="_blank" href="{escape(link)}">Link</a>'
 
-        # Display the table as HTML to render links
-        st.write(df.to_html(escape=False, index=False), unsafe_allow_html=True)
+        # Build the table as HTML to render links (a four-row table does not need pandas)
+        rows = "".join(f"<tr><td>{escape(name)}</td><td>{make_clickable(link)}</td></tr>" for name, link in social_media.items())
+        st.write(f'<table class="dataframe"><thead><tr><th>Social Media</th><th>Link</th></tr></thead><tbody>{rows}</tbody></table>', unsafe_allow_html=True)
         
         st.markdown("**Thank You 🙏**")
 
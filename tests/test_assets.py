@@ -0,0 +1,78 @@
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from core import assets
+from core.cache import LRUCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = LRUCache(max_entries=64, max_bytes=8 * 1024 * 1024)
+    monkeypatch.setattr(assets, "ASSET_CACHE", cache)
+    return cache
+
+
+def write_image(path, color, size=(200, 100), mtime_ns=None):
+    Image.new("RGB", size, color).save(path)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def pixel(variant):
+    with Image.open(BytesIO(variant.data)) as image:
+        return image.convert("RGB").getpixel((0, 0))
+
+
+def test_variants_are_shrunk_but_never_enlarged(tmp_path, cache):
+    path = write_image(tmp_path / "image.png", "red")
+    variant = assets.image_variant(path, 50)
+    assert (variant.width, variant.height) == (50, 25)
+    assert assets.image_variant(path, 500).width == 200
+    assert assets.image_variant(path, 50, "webp").data[8:12] == b"WEBP"
+
+
+def test_a_repeated_request_is_served_from_the_cache(tmp_path, cache):
+    path = write_image(tmp_path / "image.png", "red")
+    first = assets.image_variant(path, 50)
+    assert assets.image_variant(path, 50) is first
+    assert cache.stats().hits == 1 and cache.stats().misses == 1
+
+
+def test_an_edited_file_is_decoded_again(tmp_path, cache):
+    path = write_image(tmp_path / "image.png", "red", mtime_ns=1_000_000_000)
+    assert pixel(assets.image_variant(path, 50)) == (255, 0, 0)
+    write_image(path, "blue", mtime_ns=2_000_000_000)
+    assert pixel(assets.image_variant(path, 50)) == (0, 0, 255)
+    # The old variant stays keyed by its own modification time until it is evicted.
+    assert len(cache) == 2
+
+
+def test_one_decode_fills_every_page_width_of_the_file(tmp_path, cache, monkeypatch):
+    path = write_image(tmp_path / "image.png", "red")
+    monkeypatch.setattr(assets, "PAGE_ASSETS", ((str(path), 20), (str(path), 80)))
+    assets.image_variant(path, 50)
+    assert sorted(key[2] for key in cache._data) == [20, 50, 80]
+    misses = cache.stats().misses
+    assets.image_variant(path, 80)
+    assert cache.stats().misses == misses
+
+
+def test_the_cache_stays_within_its_entry_bound(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "ASSET_CACHE", LRUCache(max_entries=3))
+    path = write_image(tmp_path / "image.png", "red")
+    for width in range(10, 100, 10):
+        assets.image_variant(path, width)
+    assert len(assets.ASSET_CACHE) == 3
+    assert assets.ASSET_CACHE.stats().evictions == 6
+    assert sorted(key[2] for key in assets.ASSET_CACHE._data) == [70, 80, 90]
+
+
+def test_unknown_format_or_missing_file_is_rejected(tmp_path, cache):
+    with pytest.raises(ValueError):
+        assets.image_variant(write_image(tmp_path / "image.png", "red"), 50, "gif")
+    with pytest.raises(OSError):
+        assets.image_variant(tmp_path / "missing.png", 50)
@@ -0,0 +1,94 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import bulk
+from core.bulk import INVALID_LABEL, classify_batch, classify_file, classify_frame
+from core.general import classify_system
+from core.kinds import INFINITE_SOLUTIONS, LINE_LABELS, NO_SOLUTION, ONE_SOLUTION
+
+# Integer systems with det = 1 whose float ranks come out one short.
+ILL_CONDITIONED_LINES = [1e8, 1e8 + 1, 1, 1e8 - 1, 1e8, 2]
+ILL_CONDITIONED_PLANES = [1, 0, 0, 1, 0, 1e8, 1e8 + 1, 1, 0, 1e8 - 1, 1e8, 1]
+
+HEADER = "a1,b1,c1,a2,b2,c2\n"
+
+
+@pytest.mark.parametrize("sink", ["path", "buffer"])
+def test_malformed_cell_raises_value_error_naming_row_and_column(tmp_path, sink):
+    source = tmp_path / "systems.csv"
+    source.write_text(HEADER + "1,1,3,2,1,4\n1,x,3,2,1,4\n")
+    out = tmp_path / "out.csv" if sink == "path" else io.BytesIO()
+    with pytest.raises(ValueError, match=r"Row 2, column 'b1': 'x' is not a number"):
+        classify_file(source, out, out_format="csv")
+
+
+def test_malformed_cell_in_later_chunk_names_its_file_row(tmp_path):
+    source = tmp_path / "systems.csv"
+    source.write_text(HEADER + "1,1,3,2,1,4\n" * 5 + "1,1,3,2,1,oops\n")
+    with pytest.raises(ValueError, match=r"Row 6, column 'c2'"):
+        classify_file(source, io.BytesIO(), chunk_rows=2, out_format="csv")
+
+
+def test_malformed_cell_in_parquet_chunk_names_its_file_row(tmp_path):
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "systems.parquet"
+    frame = pd.DataFrame({name: ["1"] * 5 for name in HEADER.strip().split(",")})
+    frame.loc[4, "a2"] = "?"
+    frame.to_parquet(source)
+    with pytest.raises(ValueError, match=r"Row 5, column 'a2'"):
+        classify_file(source, io.BytesIO(), chunk_rows=2, out_format="csv")
+
+
+def test_missing_cell_is_reported_as_invalid_row(tmp_path):
+    source = tmp_path / "systems.csv"
+    source.write_text(HEADER + "1,1,3,2,1,4\n1,,3,2,1,4\n")
+    out = tmp_path / "out.csv"
+    report = classify_file(source, out, out_format="csv")
+    assert report.counts == {LINE_LABELS[ONE_SOLUTION]: 1, INVALID_LABEL: 1}
+    assert pd.read_csv(out)["solution_type"].tolist() == [LINE_LABELS[ONE_SOLUTION], INVALID_LABEL]
+
+
+@pytest.mark.parametrize("pyarrow", [True, False])
+def test_every_chunk_is_appended_to_a_csv_path(tmp_path, monkeypatch, pyarrow):
+    if pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(bulk, "pyarrow_installed", lambda: False)
+    source = tmp_path / "systems.csv"
+    source.write_text(HEADER + "1,1,3,2,1,4\n1,1,1,1,1,2\n" * 3)
+    out = tmp_path / "out.csv"
+    report = classify_file(source, out, chunk_rows=2, out_format="csv")
+    assert len(report.chunks) == 3
+    result = pd.read_csv(out)
+    assert result.columns.tolist()[:6] == HEADER.strip().split(",")
+    assert result["solution_type"].tolist() == [LINE_LABELS[ONE_SOLUTION], LINE_LABELS[NO_SOLUTION]] * 3
+
+
+def test_classify_frame_solves_integer_and_float_rows():
+    frame = pd.DataFrame({"a1": [1, 1.5], "b1": [1, 1], "c1": [3, 3], "a2": [2, 3], "b2": [1, 2], "c2": [4, 6]})
+    result = classify_frame(frame)
+    assert result["solution_type"].tolist() == [LINE_LABELS[ONE_SOLUTION], LINE_LABELS[INFINITE_SOLUTIONS]]
+    np.testing.assert_allclose(result[["x", "y"]].to_numpy()[0], [1.0, 2.0])
+
+
+@pytest.mark.parametrize("system", [ILL_CONDITIONED_LINES, ILL_CONDITIONED_PLANES])
+def test_row_result_does_not_depend_on_its_chunk(system):
+    alone_kind, alone_point = classify_batch(np.array([system]))
+    mixed_kind, mixed_point = classify_batch(np.array([system, np.full(len(system), 0.5) + np.arange(len(system))]))
+    assert alone_kind[0] == mixed_kind[0] == ONE_SOLUTION
+    np.testing.assert_array_equal(alone_point[0], mixed_point[0])
+
+
+@pytest.mark.parametrize("unknowns", [2, 3])
+def test_float_rows_match_classify_system(unknowns):
+    rng = np.random.default_rng(unknowns)
+    systems = rng.normal(size=(300, unknowns, unknowns + 1))
+    systems[:100, 1] = 0.3 * systems[:100, 0]
+    systems[100:200, 1, :unknowns] = 0.7 * systems[100:200, 0, :unknowns]
+    kind, point = classify_batch(systems.reshape(len(systems), -1))
+    assert kind.tolist() == [classify_system(system) for system in systems]
+    unique = kind == ONE_SOLUTION
+    np.testing.assert_allclose(point[unique], np.linalg.solve(systems[unique, :, :-1], systems[unique, :, -1:])[:, :, 0])
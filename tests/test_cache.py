@@ -0,0 +1,50 @@
+import pytest
+
+from core.cache import LRUCache, canonical_row, canonical_system
+from core.general import classify_system
+from core.kinds import INFINITE_SOLUTIONS, NO_SOLUTION
+from core.store import store_key
+
+
+def test_close_float_rows_get_different_keys():
+    assert canonical_row([1, 1, 1, 1.0000000000001]) != canonical_row([1, 1, 1, 1])
+    assert canonical_row([0.1, 0.2, 0.3, 0.4]) != canonical_row([0.1, 0.2, 0.3, 0.4 + 2**-54])
+
+
+def test_close_systems_are_cached_apart():
+    consistent = [[1, 1, 1, 1], [1, 1, 1, 1], [0, 0, 1, 0]]
+    inconsistent = [[1, 1, 1, 1], [1, 1, 1, 1.0000000000001], [0, 0, 1, 0]]
+    cache = LRUCache()
+    kinds = [cache.get_or_compute(("solution", canonical_system(rows)[0]), lambda: classify_system(rows))
+             for rows in (consistent, inconsistent)]
+    assert kinds == [INFINITE_SOLUTIONS, NO_SOLUTION]
+    assert store_key(canonical_system(consistent)[0]) != store_key(canonical_system(inconsistent)[0])
+
+
+@pytest.mark.parametrize("factor", [-3, 2, 7])
+def test_integer_rows_are_scale_invariant(factor):
+    assert canonical_row([factor * v for v in (2, -4, 6, 8)]) == (1, -2, 3, 4)
+
+
+@pytest.mark.parametrize("factor", [-1.0, 2.0, 0.125, 2.0**-600, 2.0**500])
+def test_float_rows_are_invariant_under_exact_scaling(factor):
+    row = [0.1, -0.7, 1.5, 3.3]
+    assert canonical_row([factor * v for v in row]) == canonical_row(row)
+
+
+def test_key_keeps_exact_values():
+    row = canonical_row([0.1, 0.2, 0.3, 0.4])
+    assert row == (2 * 0.1, 2 * 0.2, 2 * 0.3, 2 * 0.4)
+    assert eval(store_key(row)) == row
+
+
+def test_underflowing_row_keeps_its_scale():
+    row = [1e300, 5e-324, 0, 1]
+    assert canonical_row(row) == (1e300, 5e-324, 0.0, 1.0)
+    assert canonical_row(row) != canonical_row([1e300, 0, 0, 1])
+
+
+def test_canonical_system_maps_rows_back():
+    key, order = canonical_system([[0.5, 0, 0, 1.5], [2, 4, 2, 6], [1, 0, 0, 3]])
+    assert key == ((0.25, 0.0, 0.0, 0.75), (1, 0, 0, 3), (1, 2, 1, 3))
+    assert order == (0, 2, 1)
@@ -0,0 +1,48 @@
+import importlib.util
+import json
+
+import pytest
+
+from core.cli import main
+from core.kinds import ONE_SOLUTION, PLANE_LABELS
+
+LINES = '{"id": "lines", "a1": 1, "b1": 1, "c1": 3, "a2": 2, "b2": 1, "c2": 4}\n'
+# det = 1, but the float ranks of these integers come out one short.
+ILL_CONDITIONED = '{"id": "ill", "a1": 1, "b1": 0, "c1": 0, "d1": 1, "a2": 0, "b2": 100000000, "c2": 100000001, "d2": 1, "a3": 0, "b3": 99999999, "c3": 100000000, "d3": 1}\n'
+FLOAT_PLANES = '{"id": "float", "a1": 0.5, "b1": 1, "c1": 1, "d1": 1, "a2": 1, "b2": 0.5, "c2": 1, "d2": 1, "a3": 1, "b3": 1, "c3": 0.5, "d3": 1}\n'
+PLANES = '{"id": "planes", "a1": 1, "b1": 1, "c1": 1, "d1": 6, "a2": 0, "b2": 2, "c2": 5, "d2": -4, "a3": 2, "b3": 5, "c3": -1, "d3": 27}\n'
+
+
+def run(tmp_path, text, *options):
+    source = tmp_path / "systems.jsonl"
+    source.write_text(text)
+    manifest = tmp_path / "manifest.jsonl"
+    status = main([str(source), "--out", str(tmp_path / "out"), "--manifest", str(manifest), "--workers", "0", *options])
+    return status, [json.loads(line) for line in manifest.read_text().splitlines()]
+
+
+def test_default_formats_need_no_optional_packages(tmp_path):
+    status, entries = run(tmp_path, LINES + PLANES)
+    assert status == 0
+    assert [entry["output"][-4:] for entry in entries] == [".png", "html"]
+    assert entries[1]["solution"] == pytest.approx([5, 3, -2])
+
+
+def test_invalid_record_makes_the_run_fail(tmp_path):
+    status, entries = run(tmp_path, LINES + '{"id": "bad", "a1": 1}\n')
+    assert status == 1
+    assert "output" in entries[0] and "error" in entries[1]
+
+
+@pytest.mark.skipif(importlib.util.find_spec("kaleido") is not None, reason="kaleido is installed")
+def test_png_planes_without_kaleido_fail(tmp_path):
+    status, entries = run(tmp_path, PLANES, "--format", "png")
+    assert status == 1
+    assert "error" in entries[0]
+
+
+def test_classification_does_not_depend_on_the_chunk(tmp_path):
+    _, alone = run(tmp_path, ILL_CONDITIONED, "--chunk-size", "1")
+    _, mixed = run(tmp_path, FLOAT_PLANES + ILL_CONDITIONED, "--chunk-size", "2")
+    assert alone[0]["classification"] == mixed[1]["classification"] == PLANE_LABELS[ONE_SOLUTION]
+    assert alone[0]["solution"] == mixed[1]["solution"] == [1.0, -1.0, 1.0]
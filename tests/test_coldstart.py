@@ -0,0 +1,30 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("matplotlib", "plotly", "pandas", "pyarrow", "PIL", "streamlit")
+
+
+def run_child(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_core_modules_import_no_heavy_library():
+    loaded = run_child(
+        "import importlib, json, pkgutil, sys, core\n"
+        "for module in pkgutil.iter_modules(core.__path__):\n"
+        "    importlib.import_module(f'core.{module.name}')\n"
+        f"print(json.dumps(sorted(name for name in {HEAVY!r} if name in sys.modules)))"
+    )
+    assert loaded == []
+
+
+@pytest.mark.parametrize("page, allowed", [("planes", set()), ("lines", {"matplotlib"}), ("home", set())])
+def test_first_run_loads_only_the_plotting_library_it_draws_with(page, allowed):
+    report = run_child(f"import json; from benchmarks.coldstart import measure_child; print(json.dumps(measure_child({page!r})))")
+    assert not report["failed"]
+    # pandas and pyarrow wait for a file upload, matplotlib for a matplotlib chart.
+    assert set(report["loaded"]) - {"plotly.graph_objects"} <= allowed
@@ -0,0 +1,113 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from benchmarks.classify_3v import random_systems
+from core.exact import SMALL_ARRAY, SMALL_BATCH, classify_exact, exact_kind, integral_systems, is_integral, row_reduction_steps, use_exact
+from core.kinds import INFINITE_SOLUTIONS, NO_SOLUTION, ONE_SOLUTION
+
+
+def reference(system):
+    """
+    Ranks and the solution with free variables at zero, by Gauss-Jordan elimination on Fractions.
+    """
+    M = [[Fraction(int(v)) for v in row] for row in system]
+    m, k = len(M), len(M[0])
+    pivots, r = [], 0
+    for col in range(k):
+        source = next((i for i in range(r, m) if M[i][col] != 0), None)
+        if source is None:
+            continue
+        M[r], M[source] = M[source], M[r]
+        M[r] = [v / M[r][col] for v in M[r]]
+        for i in range(m):
+            if i != r:
+                M[i] = [a - M[i][col] * b for a, b in zip(M[i], M[r])]
+        pivots.append(col)
+        r += 1
+        if r == m:
+            break
+    n = k - 1
+    rank_A = sum(col < n for col in pivots)
+    solution = [Fraction(0)] * n
+    for row, col in enumerate(pivots):
+        if col < n:
+            solution[col] = M[row][n]
+    return rank_A, len(pivots), tuple(solution)
+
+
+def check(systems):
+    result = classify_exact(systems)
+    for i, system in enumerate(systems):
+        rank_A, rank_Ab, solution = reference(system)
+        n = len(system[0]) - 1
+        assert (result.rank_A[i], result.rank_Ab[i]) == (rank_A, rank_Ab)
+        kind = NO_SOLUTION if rank_A < rank_Ab else ONE_SOLUTION if rank_A == n else INFINITE_SOLUTIONS
+        assert result.kind[i] == kind
+        if kind != NO_SOLUTION:
+            assert result.solution(i) == solution
+        if kind == INFINITE_SOLUTIONS and rank_A == n - 1:
+            A = np.array(system, dtype=object)[:, :n]
+            assert any(result.direction[i]) and not any(A.dot(result.direction[i].astype(object)))
+
+
+@pytest.mark.parametrize("count", [SMALL_BATCH, 500])
+def test_batched_and_scalar_paths_match_fraction_elimination(count):
+    check(random_systems(count, seed=count).astype(int).tolist())
+
+
+@pytest.mark.parametrize("shape", [(4, 3), (2, 4), (3, 3), (1, 2)])
+def test_non_square_systems(shape):
+    rng = np.random.default_rng(sum(shape))
+    systems = rng.integers(-3, 4, size=(300, *shape))
+    systems[::3, -1] = systems[::3, 0] * 2  # Dependent rows make every kind appear.
+    check(systems.tolist())
+
+
+def test_large_entries_fall_back_to_python_ints():
+    big = 10**15
+    systems = [[[big, big + 1, 1], [big - 1, big, 1]]] * (SMALL_BATCH + 1)
+    result = classify_exact(systems)
+    assert result.numerator.dtype == object
+    assert result.kind.tolist() == [ONE_SOLUTION] * len(systems)
+    assert result.solution(0) == (Fraction(-1), Fraction(1))
+
+
+def test_ill_conditioned_integer_system_is_exact():
+    result = classify_exact([[10**8, 10**8 + 1, 1], [10**8 - 1, 10**8, 1]])
+    assert result.kind.tolist() == [ONE_SOLUTION]
+    assert result.solution(0) == (Fraction(-1), Fraction(1))
+
+
+def test_exact_kind_matches_the_batch_kernel():
+    systems = random_systems(200, seed=3).astype(int)
+    assert [exact_kind(system) for system in systems] == classify_exact(systems).kind.tolist()
+
+
+@pytest.mark.parametrize("size", [SMALL_ARRAY, SMALL_ARRAY + 1])
+@pytest.mark.parametrize("bad", [0.5, np.inf, np.nan, 2.0**53])
+def test_is_integral_agrees_on_small_and_large_arrays(size, bad):
+    values = np.arange(size, dtype=float)
+    assert is_integral(values)
+    values[-1] = bad
+    assert not is_integral(values)
+    assert integral_systems(values.reshape(1, 1, size)).tolist() == [False]
+
+
+def test_non_integral_input_is_rejected():
+    with pytest.raises(ValueError):
+        classify_exact([[1, 0.5, 1], [1, 1, 1]])
+    with pytest.raises(ValueError):
+        use_exact([[1.5]], method="exact")
+    with pytest.raises(ValueError):
+        use_exact([[1]], method="bareiss")
+    assert use_exact([[1.5]], method="auto") is False
+
+
+def test_row_reduction_steps_end_on_a_diagonal():
+    steps = row_reduction_steps([[2, 1, -1, 8], [-3, -1, 2, -11], [-2, 1, 2, -3]])
+    final = np.array(steps[-1].matrix)
+    d = final[0, 0]
+    np.testing.assert_array_equal(final[:, :3], d * np.eye(3, dtype=int))
+    assert [Fraction(int(v), int(d)) for v in final[:, 3]] == [2, 3, -1]
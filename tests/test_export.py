@@ -0,0 +1,63 @@
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from benchmarks.classify_3v import determine_solution_3v_reference, rank_deficient_float_systems
+from core.export import PAGES, cross_check, export_html, run_solver
+from core.kinds import INFINITE_SOLUTIONS, ONE_SOLUTION
+
+node = pytest.mark.skipif(shutil.which("node") is None, reason="the JavaScript port runs under Node.js")
+
+
+@node
+@pytest.mark.parametrize("page", sorted(PAGES))
+def test_port_agrees_with_python(page):
+    report = cross_check(page, count=1_000, seed=7)
+    assert report.ok, report.examples
+
+
+@node
+def test_port_matches_matrix_rank_on_rank_deficient_float_planes():
+    systems = rank_deficient_float_systems(2_000, seed=8)
+    expected = [determine_solution_3v_reference(s) for s in systems]
+    assert [result["kind"] for result in run_solver("planes", systems)] == expected
+
+
+@node
+def test_port_classifies_lines_with_large_constants():
+    results = run_solver("lines", [[[1.5, 2, 1e6], [2, 1, 1e6]], [[1, 1, 1e6], [2, 2, 2e6]]])
+    assert [result["kind"] for result in results] == [ONE_SOLUTION, INFINITE_SOLUTIONS]
+    np.testing.assert_allclose(results[0]["point"], np.linalg.solve([[1.5, 2], [2, 1]], [1e6, 1e6]))
+
+
+@node
+def test_port_solves_ill_conditioned_integer_systems_exactly():
+    results = run_solver("planes", [[[10**8, 10**8 + 1, 0, 1], [10**8 - 1, 10**8, 0, 1], [0, 0, 1, 0]]])
+    assert results[0]["kind"] == ONE_SOLUTION
+    assert results[0]["point"] == [-1, 1, 0]
+
+
+def test_export_is_deterministic_and_self_contained():
+    html = export_html("planes", [1, 1, 1, 6, 0, 2, 5, -4, 2, 5, -1, 27])
+    assert html == export_html("planes", [1.0, 1, 1, 6, 0, 2, 5, -4, 2, 5, -1, 27])
+    assert "<script src" not in html and "<link" not in html and "fetch(" not in html
+
+
+def test_export_escapes_the_state():
+    html = export_html("lines", [1, 1, 3, 2, 1, 4], ["</script><b>", "#ff3b3b"])
+    assert "</script><b>" not in html
+
+
+@pytest.mark.parametrize("page, coefficients", [("lines", [1, 2, 3]), ("cubes", [1] * 6)])
+def test_export_rejects_bad_input(page, coefficients):
+    with pytest.raises(ValueError):
+        export_html(page, coefficients)
+
+
+def test_export_does_not_pull_in_the_batch_renderer():
+    code = "import sys, core.export; print(sorted({'core.cli', 'core.bulk', 'concurrent.futures'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
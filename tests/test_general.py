@@ -0,0 +1,111 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from core.general import project_solution, read_chunks, slice_system, solve_streaming, solve_system
+from core.kinds import INFINITE_SOLUTIONS, NO_SOLUTION, ONE_SOLUTION
+
+
+def tall_system(kind, rows=3000, unknowns=5, seed=0):
+    rng = np.random.default_rng(seed)
+    A = rng.normal(size=(rows, unknowns))
+    if kind == INFINITE_SOLUTIONS:
+        A[:, -1] = A[:, 0] - 2 * A[:, 1]
+    b = A @ rng.normal(size=unknowns)
+    if kind == NO_SOLUTION:
+        b += rng.normal(size=rows)
+    return np.column_stack([A, b])
+
+
+@pytest.mark.parametrize("kind", [ONE_SOLUTION, INFINITE_SOLUTIONS, NO_SOLUTION])
+@pytest.mark.parametrize("chunk_rows", [1, 7, 1000, 5000])
+def test_streaming_matches_the_in_memory_solve(kind, chunk_rows):
+    aug = tall_system(kind, rows=600 if chunk_rows == 1 else 3000)
+    expected = solve_system(aug)
+    result = solve_streaming(aug[i:i + chunk_rows] for i in range(0, len(aug), chunk_rows))
+    assert (result.kind, result.rank_A, result.rank_Ab) == (kind, expected.rank_A, expected.rank_Ab)
+    np.testing.assert_allclose(result.particular, expected.particular, atol=1e-9)
+    np.testing.assert_allclose(result.residual_norm, expected.residual_norm, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(result.singular_values, expected.singular_values, atol=1e-9 * expected.singular_values[0])
+    projector = result.null_space @ result.null_space.T
+    np.testing.assert_allclose(projector, expected.null_space @ expected.null_space.T, atol=1e-9)
+
+
+def test_chunk_rows_option_streams():
+    aug = tall_system(NO_SOLUTION, rows=2000)
+    result = solve_system(aug, chunk_rows=256)
+    assert result.kind == NO_SOLUTION
+    np.testing.assert_allclose(result.residual_norm, np.linalg.norm(result.residuals(aug)), rtol=1e-9)
+
+
+def test_streaming_wide_blocks():
+    # Fewer rows than unknowns leaves a short triangular factor.
+    result = solve_streaming([[[1.0, 1, 1, 3]], [[1.0, -1, 0, 0]]])
+    assert (result.kind, result.rank_A, result.null_space.shape) == (INFINITE_SOLUTIONS, 2, (3, 1))
+
+
+def test_streaming_needs_a_block():
+    with pytest.raises(ValueError):
+        solve_streaming(iter(()))
+
+
+@pytest.mark.parametrize("suffix", [".npy", ".csv"])
+def test_read_chunks_round_trip(tmp_path, suffix):
+    aug = tall_system(ONE_SOLUTION, rows=1000)
+    path = tmp_path / f"system{suffix}"
+    if suffix == ".npy":
+        np.save(path, aug)
+    else:
+        np.savetxt(path, aug, delimiter=",", fmt="%.17g")
+    chunks = list(read_chunks(path, chunk_rows=300))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    np.testing.assert_array_equal(np.vstack(chunks), aug)
+    np.testing.assert_allclose(solve_streaming(chunks).particular, solve_system(aug).particular, atol=1e-10)
+
+
+def test_exact_method_overrides_an_ill_conditioned_float_rank():
+    system = [[10**8, 10**8 + 1, 1], [10**8 - 1, 10**8, 1]]
+    assert solve_system(system).kind == INFINITE_SOLUTIONS
+    result = solve_system(system, method="auto")
+    assert (result.kind, result.rank_A, result.null_space.shape) == (ONE_SOLUTION, 2, (2, 0))
+    assert result.particular.tolist() == [-1, 1]
+    assert result.residual_norm == 0
+
+
+@pytest.mark.parametrize("chunk_rows", [None, 1000])
+def test_tall_rank_override_needs_no_square_factor(chunk_rows):
+    rows = 20_000
+    system = np.array([[10**8, 10**8 + 1, 1], [10**8 - 1, 10**8, 1]] * (rows // 2), dtype=float)
+    tracemalloc.start()
+    try:
+        result = solve_system(system, method="auto", chunk_rows=chunk_rows)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert (result.kind, result.rank_A, result.null_space.shape) == (ONE_SOLUTION, 2, (2, 0))
+    np.testing.assert_allclose(result.particular, [-1, 1])
+    # A full U alone would be rows^2 floats (3.2 GB); the exact engine's rows dominate instead.
+    assert peak < 100 * system.nbytes
+
+
+def test_exact_particular_is_the_minimum_norm_solution():
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        aug = rng.integers(-4, 5, (3, 5)).astype(float)
+        aug[2] = aug[0] - aug[1]
+        exact, floating = solve_system(aug, method="exact"), solve_system(aug)
+        assert exact.kind == floating.kind
+        np.testing.assert_allclose(exact.particular, floating.particular, atol=1e-9)
+
+
+def test_slice_and_project_a_line_of_solutions():
+    solution = solve_system([[1, 0, 0, -1, 1], [0, 1, 0, 0, 2], [0, 0, 1, 0, 3]])
+    point, basis = project_solution(solution, [0, 1, 3])
+    assert basis.shape == (3, 1)
+    np.testing.assert_allclose(np.abs(basis[:, 0]), [1, 0, 1] / np.sqrt(2))
+    system = [[1, 0, 0, -1, 1], [0, 1, 0, 0, 2], [0, 0, 1, 0, 3]]
+    sliced = slice_system(system, [0, 1, 3], [3])
+    np.testing.assert_allclose(sliced, [[1, 0, -1, 1], [0, 1, 0, 2], [0, 0, 0, 0]])
+    assert solve_system(sliced).kind == INFINITE_SOLUTIONS
+    assert solve_system(slice_system(system, [0, 1, 3], [4])).kind == NO_SOLUTION
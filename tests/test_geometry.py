@@ -0,0 +1,145 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from core.geometry import DEFAULT_BOUNDS, DEFAULT_VIEWPORT, box_corners, clip_lines, clip_planes, fan_triangles
+
+CUBE = ((-1.0, 1.0),) * 3
+
+
+def brute_force_polygon(plane, bounds=CUBE):
+    """
+    The distinct points where a plane meets the edges of the box, from every pair of corners one unit apart.
+    """
+    normal, d = np.asarray(plane[:3], dtype=float), float(plane[3])
+    corners = box_corners(bounds)
+    points = []
+    for p, q in itertools.combinations(corners, 2):
+        if np.count_nonzero(p != q) != 1:
+            continue
+        fp, fq = normal @ p - d, normal @ q - d
+        if fp == 0:
+            points.append(p)
+        if fq == 0:
+            points.append(q)
+        if fp * fq < 0:
+            points.append(p + fp / (fp - fq) * (q - p))
+    return np.unique(np.round(points, 9), axis=0) if points else np.zeros((0, 3))
+
+
+def test_axis_plane_gives_the_square_cross_section():
+    vertices, counts = clip_planes([[0, 0, 1, 0]], CUBE)
+    assert counts.tolist() == [4]
+    np.testing.assert_allclose(sorted(map(tuple, vertices[0, :4])), [(-1, -1, 0), (-1, 1, 0), (1, -1, 0), (1, 1, 0)])
+    assert np.isnan(vertices[0, 4:]).all()
+
+
+def test_diagonal_plane_gives_a_hexagon():
+    vertices, counts = clip_planes([[1, 1, 1, 0]], CUBE)
+    assert counts.tolist() == [6]
+    np.testing.assert_allclose(vertices[0].sum(axis=1), 0, atol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "plane",
+    [
+        [1, 1, 1, 3],    # touches one corner
+        [1, 0, 0, 2],    # misses the box
+        [0, 0, 0, 0],    # no normal
+        [0, 0, 0, 1],
+    ],
+)
+def test_degenerate_cuts_are_not_drawn(plane):
+    vertices, counts = clip_planes([plane], CUBE)
+    assert counts.tolist() == [0]
+    assert np.isnan(vertices).all()
+
+
+def test_face_plane_keeps_its_four_corners_once():
+    vertices, counts = clip_planes([[1, 0, 0, 1]], CUBE)
+    assert counts.tolist() == [4]
+    assert len(np.unique(vertices[0, :4], axis=0)) == 4
+
+
+def test_random_planes_match_brute_force_and_are_convex():
+    rng = np.random.default_rng(0)
+    planes = np.column_stack([rng.normal(size=(500, 3)), rng.uniform(-2, 2, 500)])
+    vertices, counts = clip_planes(planes, CUBE)
+    for plane, polygon, count in zip(planes, vertices, counts):
+        expected = brute_force_polygon(plane)
+        if len(expected) < 3:
+            assert count == 0
+            continue
+        polygon = polygon[:count]
+        np.testing.assert_allclose(np.unique(np.round(polygon, 9), axis=0), expected, atol=1e-9)
+        np.testing.assert_allclose(polygon @ plane[:3], plane[3], atol=1e-9)
+        # Consecutive edges turn the same way around the normal: the polygon is convex and ordered.
+        edges = np.roll(polygon, -1, axis=0) - polygon
+        turns = np.cross(edges, np.roll(edges, -1, axis=0)) @ plane[:3]
+        assert (turns > 0).all() or (turns < 0).all()
+
+
+def test_default_box_is_used():
+    vertices, counts = clip_planes([[0, 1, 0, 0]])
+    assert counts.tolist() == [4]
+    np.testing.assert_allclose(np.abs(vertices[0, :4, [0, 2]]), DEFAULT_BOUNDS[0][1])
+
+
+@pytest.mark.parametrize("count", [3, 4, 6])
+def test_fan_triangles_cover_the_polygon(count):
+    i, j, k = fan_triangles(count)
+    assert len(i) == count - 2
+    assert set(np.concatenate([i, j, k])) == set(range(count))
+
+
+@pytest.mark.parametrize(
+    "line, segment",
+    [
+        ([0, 1, 3], [[-10, 3], [10, 3]]),      # horizontal, b only
+        ([1, 0, -4], [[-4, -10], [-4, 10]]),   # vertical, a only
+        ([1, -1, 0], [[-10, -10], [10, 10]]),  # through two corners
+        ([1, 1, 15], [[10, 5], [5, 10]]),      # cuts one corner off
+    ],
+)
+def test_clip_lines_to_the_viewport(line, segment):
+    segments, visible = clip_lines([line])
+    assert visible.tolist() == [True]
+    np.testing.assert_allclose(sorted(map(tuple, segments[0])), sorted(map(tuple, segment)))
+
+
+@pytest.mark.parametrize("line", [[1, 1, 20], [1, 0, 11], [0, 0, 1], [0, 0, 0]])
+def test_lines_outside_or_touching_a_corner_are_hidden(line):
+    segments, visible = clip_lines([line])
+    assert visible.tolist() == [False]
+    assert np.isnan(segments).all()
+
+
+def test_random_clipped_segments_lie_on_their_line_and_span_the_viewport():
+    rng = np.random.default_rng(1)
+    lines = np.column_stack([rng.normal(size=(1000, 2)), rng.uniform(-20, 20, 1000)])
+    segments, visible = clip_lines(lines)
+    (x0, x1), (y0, y1) = DEFAULT_VIEWPORT
+    grid = np.linspace(-1, 1, 4001)[:, np.newaxis]
+    for (a, b, c), segment, shown in zip(lines, segments, visible):
+        # Dense samples of the line inside the viewport decide whether it should be visible.
+        direction = np.array([-b, a]) / np.hypot(a, b)
+        base = np.array([a, b]) * c / (a * a + b * b)
+        samples = base + grid * 30 * direction
+        inside = samples[(samples[:, 0] > x0) & (samples[:, 0] < x1) & (samples[:, 1] > y0) & (samples[:, 1] < y1)]
+        assert shown == (len(inside) > 1)
+        if shown:
+            np.testing.assert_allclose(segment @ [a, b], c, atol=1e-9)
+            along = (segment - base) @ direction
+            assert along.min() <= ((inside - base) @ direction).min() + 1e-9
+            assert along.max() >= ((inside - base) @ direction).max() - 1e-9
+
+
+def test_plot_lines_leaves_no_pyplot_figures():
+    plt = pytest.importorskip("matplotlib.pyplot")
+    from core.figures import plot_lines
+
+    before = plt.get_fignums()
+    for _ in range(5):
+        plot_lines(1, 1, 1, 2, -1, 0)
+    assert plt.get_fignums() == before
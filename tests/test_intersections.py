@@ -0,0 +1,40 @@
+import numpy as np
+
+from benchmarks.classify_3v import random_systems, rank_deficient_float_systems
+from core.figures import build_plane_geometry
+from core.general import classify_system
+from core.intersections import plane_intersections
+from core.kinds import INFINITE_SOLUTIONS, ONE_SOLUTION
+
+# Exactly one solution, (-1, 1, 0), but A is too ill-conditioned for the float rank test.
+ILL_CONDITIONED = [[10**8, 10**8 + 1, 0, 1], [10**8 - 1, 10**8, 0, 1], [0, 0, 1, 0]]
+
+
+def test_overlay_of_integer_system_follows_the_exact_label():
+    assert classify_system(ILL_CONDITIONED, method="auto") == ONE_SOLUTION
+    result = plane_intersections([ILL_CONDITIONED])
+    assert result.kind.tolist() == [ONE_SOLUTION]
+    np.testing.assert_array_equal(result.point[0], [-1, 1, 0])
+    assert np.isnan(result.line).all()
+
+
+def test_float_method_keeps_the_svd_answer():
+    assert plane_intersections([ILL_CONDITIONED], method="float").kind.tolist() == [INFINITE_SOLUTIONS]
+
+
+def test_overlay_kind_matches_the_label_on_random_systems():
+    systems = np.concatenate([random_systems(300, seed=5), rank_deficient_float_systems(300, seed=6)])
+    for system in systems:
+        kind = classify_system(system, method="auto")
+        assert plane_intersections([system]).kind.tolist() == [kind]
+
+
+def test_exact_line_is_drawn_through_the_solution_set():
+    system = [[1, 1, 1, 3], [1, -1, 0, 0], [2, 0, 1, 3]]
+    _, _, meeting = build_plane_geometry(tuple(map(tuple, system)))
+    assert meeting.kind.tolist() == [INFINITE_SOLUTIONS]
+    A, b = np.array(system, dtype=float)[:, :3], np.array(system, dtype=float)[:, 3]
+    for end in meeting.line[0]:
+        np.testing.assert_allclose(A @ end, b, atol=1e-9)
+    direction = np.diff(meeting.line[0], axis=0)[0]
+    np.testing.assert_allclose(np.cross(direction, [1, 1, -2]), 0, atol=1e-9)
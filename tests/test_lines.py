@@ -0,0 +1,139 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from core import lines as lines_module
+from core.exact import classify_exact
+from core.kinds import INFINITE_SOLUTIONS, NO_SOLUTION, ONE_SOLUTION
+from core.lines import DEFAULT_TOL, classify_lines, least_squares_point, pairwise_intersections
+
+
+def brute_force_pairs(lines, viewport=None):
+    """
+    Every crossing pair i < j and its point, one 2x2 solve at a time.
+    """
+    pairs, points = [], []
+    for i, j in itertools.combinations(range(len(lines)), 2):
+        (a1, b1, c1), (a2, b2, c2) = lines[i], lines[j]
+        length = np.hypot(a1, b1) * np.hypot(a2, b2)
+        if length == 0 or abs(a1 * b2 - a2 * b1) / length <= DEFAULT_TOL:
+            continue
+        x, y = np.linalg.solve([[a1, b1], [a2, b2]], [c1, c2])
+        if viewport is not None:
+            (x0, x1), (y0, y1) = viewport
+            if not (x0 <= x <= x1 and y0 <= y <= y1):
+                continue
+        pairs.append((i, j))
+        points.append((x, y))
+    return np.array(pairs, dtype=int).reshape(-1, 2), np.array(points).reshape(-1, 2)
+
+
+def random_line_set(count, seed=0):
+    rng = np.random.default_rng(seed)
+    lines = rng.integers(-4, 5, (count, 3)).astype(float)
+    k = len(lines[1::7])
+    lines[0:7 * k:7] = 2 * lines[1::7]  # Parallel and coincident pairs.
+    return lines
+
+
+def test_large_constant_keeps_unique_solution():
+    result = classify_lines([[1, 2, 1e6, 2, 1, 1e6]])
+    assert result.kind.tolist() == [ONE_SOLUTION]
+    np.testing.assert_allclose([result.x[0], result.y[0]], [1e6 / 3, 1e6 / 3])
+
+
+def test_large_constant_parallel_lines_one_apart_are_distinct():
+    assert classify_lines([[1, 1, 1e6, 1, 1, 1e6 + 1]]).kind.tolist() == [NO_SOLUTION]
+
+
+@pytest.mark.parametrize(
+    "system, kind",
+    [
+        ([1, 1, 3, 2, 1, 4], ONE_SOLUTION),
+        ([1, 1, 1, 1, 1, 2], NO_SOLUTION),
+        ([1, 1, 1, 2, 2, 2], INFINITE_SOLUTIONS),
+        ([1, 1, 1, -2, -2, -2], INFINITE_SOLUTIONS),
+        ([0, 0, 1, 1, 1, 1], NO_SOLUTION),
+        ([0, 0, 0, 1, 1, 1], INFINITE_SOLUTIONS),
+        ([0.1, 0.3, 0.5, 0.2, 0.6, 1.0], INFINITE_SOLUTIONS),
+    ],
+)
+def test_known_systems(system, kind):
+    assert classify_lines([system]).kind.tolist() == [kind]
+
+
+def test_agrees_with_exact_engine_on_random_integers():
+    systems = np.random.default_rng(0).integers(-5, 6, (50_000, 6))
+    expected = classify_exact(systems.reshape(-1, 2, 3)).kind
+    np.testing.assert_array_equal(classify_lines(systems).kind, expected)
+
+
+def test_scaled_float_rows_agree_with_exact_engine():
+    rng = np.random.default_rng(1)
+    systems = rng.integers(-5, 6, (20_000, 6)).astype(float)
+    scaled = (systems.reshape(-1, 2, 3) * rng.uniform(0.01, 100, (20_000, 2, 1))).reshape(-1, 6)
+    expected = classify_exact(systems.reshape(-1, 2, 3)).kind
+    np.testing.assert_array_equal(classify_lines(scaled).kind, expected)
+
+
+def test_pairwise_intersections_with_large_constants():
+    result = pairwise_intersections([[1, 2, 1e6], [2, 1, 1e6], [1, 2, 0]])
+    assert result.pairs.tolist() == [[0, 1], [1, 2]]
+    np.testing.assert_allclose(result.points[0], [1e6 / 3, 1e6 / 3])
+
+
+@pytest.mark.parametrize("block_entries", [1, 7, 50, 1 << 16])
+@pytest.mark.parametrize("count", [1, 2, 9, 40])
+def test_pairwise_intersections_across_block_boundaries(monkeypatch, block_entries, count):
+    monkeypatch.setattr(lines_module, "PAIR_BLOCK_ENTRIES", block_entries)
+    lines = random_line_set(count)
+    pairs, points = brute_force_pairs(lines)
+    result = pairwise_intersections(lines)
+    assert result.pairs.tolist() == pairs.tolist()
+    assert result.total == len(pairs)
+    np.testing.assert_allclose(result.points, points, atol=1e-9)
+
+
+@pytest.mark.parametrize("max_points", [1, 5, 17, 10_000])
+def test_max_points_keeps_every_kth_crossing_and_counts_all(monkeypatch, max_points):
+    monkeypatch.setattr(lines_module, "PAIR_BLOCK_ENTRIES", 50)
+    lines = random_line_set(30, seed=1)
+    viewport = ((-np.sqrt(3), np.sqrt(2)), (-np.pi / 2, np.e / 2))  # No rational crossing lies on the edge.
+    pairs, _ = brute_force_pairs(lines, viewport)
+    result = pairwise_intersections(lines, viewport=viewport, max_points=max_points)
+    stride = max(1, -(-30 * 29 // 2 // max_points))
+    assert result.total == len(pairs)
+    assert result.pairs.tolist() == pairs[::stride].tolist()
+    assert len(result) <= max_points
+
+
+def test_least_squares_point_of_concurrent_lines_is_exact():
+    point, rms, solution = least_squares_point([[1, 1, 3], [1, -1, -1], [2, 1, 4], [0, 0, 0]])
+    assert solution.kind == ONE_SOLUTION
+    np.testing.assert_allclose(point, [1, 2])
+    assert rms == pytest.approx(0, abs=1e-12)
+
+
+def test_least_squares_point_minimizes_perpendicular_distances():
+    rng = np.random.default_rng(3)
+    lines = rng.normal(size=(50, 3))
+    point, rms, solution = least_squares_point(lines)
+    distance = lambda p: (lines[:, :2] @ p - lines[:, 2]) / np.hypot(lines[:, 0], lines[:, 1])  # noqa: E731
+    assert solution.kind == NO_SOLUTION
+    assert rms == pytest.approx(np.sqrt(np.mean(distance(point) ** 2)))
+    # Rescaling an equation does not move its line, so it must not move the point either.
+    scaled, _, _ = least_squares_point(lines * rng.uniform(0.1, 10, (50, 1)))
+    np.testing.assert_allclose(scaled, point, atol=1e-9)
+    for step in np.eye(2) * 1e-3:
+        assert np.mean(distance(point + step) ** 2) > np.mean(distance(point) ** 2)
+
+
+def test_least_squares_point_of_parallel_lines_is_a_line_of_solutions():
+    _, rms, solution = least_squares_point([[1, 1, 1], [2, 2, 2]])
+    assert solution.kind == INFINITE_SOLUTIONS and rms == pytest.approx(0, abs=1e-12)
+
+
+def test_least_squares_point_needs_a_line():
+    with pytest.raises(ValueError):
+        least_squares_point([[0, 0, 1], [0, 0, 0]])
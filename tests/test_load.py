@@ -0,0 +1,65 @@
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.load import main, percentiles, pick_action, rss_bytes
+
+
+class Widget:
+    def __init__(self, key=None, value=None):
+        self.key, self.value, self.calls = key, value, []
+
+    def click(self):
+        self.calls.append("click")
+
+    def set_value(self, value):
+        self.calls.append(value)
+
+
+def fake_app(**widgets):
+    return SimpleNamespace(**{name: widgets.get(name, []) for name in ("button", "number_input", "color_picker", "toggle")})
+
+
+def test_percentiles_are_in_milliseconds():
+    stats = percentiles([0.001 * i for i in range(1, 101)])
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == pytest.approx(50.5)
+    assert stats["max_ms"] == pytest.approx(100)
+    assert percentiles([]) == {}
+
+
+def test_rss_is_reported():
+    assert rss_bytes() > 2**20
+
+
+def test_a_page_without_widgets_is_rerun():
+    assert pick_action(fake_app(), "home", random.Random(0)) == "rerun"
+
+
+def test_edits_go_to_the_coefficient_inputs():
+    other, coefficient = Widget("line_count", 5), Widget("coef_a1", 1)
+    app = fake_app(number_input=[other, coefficient])
+    for seed in range(20):
+        assert pick_action(app, "lines", random.Random(seed)) == "edit"
+    assert not other.calls
+    assert len(coefficient.calls) == 20 and all(value in (-1, 0, 2, 3) for value in coefficient.calls)
+
+
+def test_home_page_inputs_are_never_edited():
+    toggle, edit = Widget(value=False), Widget("coef_a1", 1)
+    app = fake_app(number_input=[edit], toggle=[toggle])
+    assert {pick_action(app, "home", random.Random(seed)) for seed in range(20)} == {"toggle"}
+    assert not edit.calls and set(toggle.calls) == {True}
+
+
+def test_short_run_writes_a_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / "load.json"
+    assert main(["--sessions", "2", "--actions", "2", "--think", "0", "--pages", "lines", "--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["summary"]["reruns"] == len(report["samples"]) == 6
+    assert report["summary"]["failed"] == 0
+    assert {sample["action"] for sample in report["samples"]} >= {"open"}
+    assert report["rss"] and report["summary"]["latency"]["count"] == 6
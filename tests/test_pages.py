@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+PAGES = Path(__file__).resolve().parent.parent / "pages"
+LINES_PAGE = str(PAGES / "1_🧮_Linear Systems as Lines.py")
+PLANES_PAGE = str(PAGES / "2_🎏_System of Equations as Planes (3x3).py")
+NAMES = {LINES_PAGE: ("a1", "b1", "c1", "a2", "b2", "c2"), PLANES_PAGE: ("a1", "b1", "c1", "d1", "a2", "b2", "c2", "d2", "a3", "b3", "c3", "d3")}
+
+
+def open_page(path):
+    return AppTest.from_file(path, default_timeout=60).run()
+
+
+def coefficients(app, path):
+    return [app.session_state[f"coef_{name}"] for name in NAMES[path]]
+
+
+def solution(app):
+    return app.success[0].value
+
+
+@pytest.mark.parametrize("path", [LINES_PAGE, PLANES_PAGE])
+def test_preset_fills_the_inputs_and_later_edits_stick(path):
+    app = open_page(path)
+    assert not app.exception
+    assert "No Solution" in solution(app)
+    app.button[2].click().run()
+    assert "One" in solution(app)
+    preset = coefficients(app, path)
+    app.number_input(key="coef_a1").set_value(preset[0] + 1).run()
+    assert coefficients(app, path) == [preset[0] + 1, *preset[1:]]
+    # The button is not pressed again, so the preset does not overwrite the edit on later reruns.
+    app.run()
+    assert coefficients(app, path)[0] == preset[0] + 1
+
+
+def test_form_mode_applies_edits_only_on_submit():
+    app = open_page(LINES_PAGE)
+    app.button[2].click().run()
+    app.toggle[0].set_value(True).run()
+    app.number_input(key="coef_b2").set_value(2).run()
+    assert coefficients(app, LINES_PAGE)[4] == 1
+    assert solution(app) == "Solution Type: One Solution"
+    app.number_input(key="coef_b2").set_value(2)
+    app.button(key="FormSubmitter:coefficients_form-Apply").click().run()
+    assert coefficients(app, LINES_PAGE)[4] == 2
+    assert solution(app) == "Solution Type: Infinity Solution"
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from core.figures import plane_set_trace, plot_plane_set
+from core.geometry import clip_planes, select_planes
+
+
+def horizontal_planes(count, spacing=1.0):
+    return np.array([[0, 0, 1, (z - count // 2) * spacing] for z in range(count)], dtype=float)
+
+
+@pytest.mark.parametrize("count, budget", [(10, 4), (1000, 7), (5, 5), (3, 10)])
+def test_stride_keeps_evenly_spaced_planes_in_order(count, budget):
+    kept = select_planes(horizontal_planes(count), budget)
+    assert len(kept) == min(count, budget)
+    assert kept[0] == 0 and kept[-1] == count - 1
+    assert np.all(np.diff(kept) > 0)
+    if count > budget:
+        assert np.ptp(np.diff(kept)) <= 1
+
+
+def test_nearest_keeps_the_planes_closest_to_the_focus():
+    rng = np.random.default_rng(0)
+    planes = rng.normal(size=(500, 4))
+    planes[:10, :3] = 0  # No normal: never nearer than a real plane.
+    focus = np.array([0.5, -1.0, 2.0])
+    kept = select_planes(planes, 25, "nearest", focus)
+    distance = np.abs(planes[10:, :3] @ focus - planes[10:, 3]) / np.linalg.norm(planes[10:, :3], axis=1)
+    assert kept.tolist() == sorted((np.argsort(distance)[:25] + 10).tolist())
+
+
+@pytest.mark.parametrize("budget, strategy", [(0, "stride"), (5, "random")])
+def test_bad_budget_or_strategy_is_rejected(budget, strategy):
+    with pytest.raises(ValueError):
+        select_planes(horizontal_planes(10), budget, strategy)
+
+
+def test_planes_missing_the_box_are_dropped_before_the_budget():
+    planes = horizontal_planes(100)  # z from -50 to 49; the box only reaches |z| <= 15.
+    trace, kept = plane_set_trace(planes, budget=1000)
+    _, counts = clip_planes(planes)
+    assert kept.tolist() == np.flatnonzero(counts).tolist()
+    trace, kept = plane_set_trace(planes, budget=5)
+    assert len(kept) == 5 and np.all(counts[kept] > 0)
+    assert len(trace.x) == 4 * len(kept) and len(trace.i) == 2 * len(kept)
+
+
+def test_single_color_applies_to_the_whole_mesh():
+    trace, _ = plane_set_trace(horizontal_planes(5), colors="#123456")
+    assert trace.color == "#123456"
+    assert trace.vertexcolor is None and trace.intensity is None
+
+
+def test_per_plane_colors_follow_each_polygon():
+    planes = horizontal_planes(40)
+    colors = [f"#0000{i:02x}" for i in range(len(planes))]
+    trace, kept = plane_set_trace(planes, colors=colors, budget=8)
+    assert list(trace.vertexcolor) == [colors[i] for i in kept for _ in range(4)]
+    # Every vertex sits on the plane whose color it carries.
+    z = np.asarray(trace.z)
+    np.testing.assert_allclose(z, np.repeat(planes[kept, 3], 4))
+
+
+@pytest.mark.parametrize("values", [None, np.linspace(-3, 3, 20)])
+def test_values_become_vertex_intensities(values):
+    planes = horizontal_planes(20)
+    trace, kept = plane_set_trace(planes, values=values)
+    expected = np.arange(len(planes)) if values is None else values
+    np.testing.assert_allclose(trace.intensity, np.repeat(expected[kept], 4))
+    assert trace.intensitymode == "vertex" and trace.cmin == min(expected.min(), 0) and trace.cmax == max(expected.max(), 1)
+
+
+def test_title_counts_the_planes_left_out():
+    assert plot_plane_set(horizontal_planes(20)).layout.title.text is None
+    assert plot_plane_set(horizontal_planes(40)).layout.title.text == "Showing 31 of 40 planes"
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from benchmarks.classify_3v import determine_solution_3v_reference, random_systems, rank_deficient_float_systems
+from core.general import classify_system
+from core.kinds import INFINITE_SOLUTIONS, NO_SOLUTION, ONE_SOLUTION
+from core.planes import classify_planes
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_consistent_rank_two_float_systems_agree_with_matrix_rank(seed):
+    rng = np.random.default_rng(seed)
+    systems = rng.uniform(-5, 5, (20_000, 3, 4))
+    mix = rng.uniform(-2, 2, (20_000, 2, 1))
+    systems[:, 2] = (systems[:, :2] * mix).sum(axis=1)
+    expected = np.array([determine_solution_3v_reference(s) for s in systems])
+    np.testing.assert_array_equal(classify_planes(systems).kind, expected)
+
+
+def test_rank_deficient_float_systems_agree_with_matrix_rank():
+    systems = rank_deficient_float_systems(20_000, seed=3)
+    expected = np.array([determine_solution_3v_reference(s) for s in systems])
+    np.testing.assert_array_equal(classify_planes(systems).kind, expected)
+    assert [classify_system(s) for s in systems[:2_000]] == expected[:2_000].tolist()
+
+
+def test_integer_systems_agree_with_matrix_rank():
+    systems = random_systems(20_000, seed=4)
+    expected = np.array([determine_solution_3v_reference(s) for s in systems])
+    np.testing.assert_array_equal(classify_planes(systems).kind, expected)
+
+
+@pytest.mark.parametrize(
+    "system, kind",
+    [
+        ([[1, 1, 1, 6], [0, 2, 5, -4], [2, 5, -1, 27]], ONE_SOLUTION),
+        ([[1, 1, 1, 1], [2, 2, 2, 2], [3, 3, 3, 3]], INFINITE_SOLUTIONS),
+        ([[1, 1, 1, 1], [1, 1, 1, 2], [0, 0, 1, 0]], NO_SOLUTION),
+        ([[0.1, 0.2, 0.3, 0.4], [0.2, 0.4, 0.6, 0.8], [1, 0, 0, 1]], INFINITE_SOLUTIONS),
+        ([[0, 0, 0, 0]] * 3, INFINITE_SOLUTIONS),
+        ([[0, 0, 0, 1], [0, 0, 0, 0], [0, 0, 0, 0]], NO_SOLUTION),
+    ],
+)
+def test_known_systems(system, kind):
+    assert classify_planes([system]).kind.tolist() == [kind]
+    assert classify_system(system) == kind
+
+
+def test_unique_solution_point():
+    result = classify_planes([[[1, 1, 1, 6], [0, 2, 5, -4], [2, 5, -1, 27]]])
+    np.testing.assert_allclose(result.point[0], [5, 3, -2])
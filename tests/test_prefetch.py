@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from core.cache import LRUCache, canonical_system
+from core.prefetch import Prefetcher, last_edited, neighbours, warm_plane_system
+
+
+def wait(batch):
+    for future in batch.futures:
+        future.result(timeout=10)
+
+
+def busy(seconds):
+    start = time.thread_time()
+    while time.thread_time() - start < seconds:
+        pass
+
+
+@pytest.fixture
+def blocked():
+    """A one-worker prefetcher whose worker is held until the test releases it."""
+    prefetcher = Prefetcher(workers=1, delay=0, max_pending=100)
+    release = threading.Event()
+    started = threading.Event()
+    holder = prefetcher.schedule([lambda: started.set() or release.wait(10)])
+    assert started.wait(10)
+    yield prefetcher, release
+    release.set()
+    wait(holder)
+
+
+def test_cancelled_jobs_never_run(blocked):
+    prefetcher, release = blocked
+    ran = []
+    batch = prefetcher.schedule([lambda i=i: ran.append(i) for i in range(5)])
+    newer = prefetcher.schedule([lambda: ran.append("newer")], previous=batch)
+    release.set()
+    wait(newer)
+    assert ran == ["newer"]
+    assert all(future.cancelled() for future in batch.futures)
+    stats = prefetcher.stats()
+    assert (stats.cancelled, stats.completed) == (5, 2)
+    prefetcher.cancel(batch)
+    assert prefetcher.stats().cancelled == 5
+
+
+def test_cancelling_ends_the_delay_of_a_started_job():
+    prefetcher = Prefetcher(workers=1, delay=30)
+    ran = []
+    batch = prefetcher.schedule([lambda: ran.append(1)])
+    time.sleep(0.05)  # The worker has taken the job and is waiting out the delay.
+    start = time.monotonic()
+    prefetcher.cancel(batch)
+    wait(batch)
+    assert time.monotonic() - start < 5
+    assert ran == [] and prefetcher.stats().cancelled == 1
+
+
+def test_pending_jobs_are_bounded(blocked):
+    prefetcher, release = blocked
+    prefetcher.max_pending = 3  # The held job counts as one.
+    batch = prefetcher.schedule([lambda: None] * 5)
+    assert len(batch.futures) == 2
+    assert prefetcher.stats().throttled == 3
+    release.set()
+    wait(batch)
+    assert prefetcher._pending == 0
+    assert len(prefetcher.schedule([lambda: None] * 2).futures) == 2
+
+
+def test_jobs_are_skipped_once_the_cpu_budget_is_spent():
+    prefetcher = Prefetcher(workers=1, delay=0, cpu_budget=0, burst=0.01)
+    wait(prefetcher.schedule([lambda: busy(0.02)]))
+    ran = []
+    wait(prefetcher.schedule([lambda: ran.append(1)] * 3))
+    stats = prefetcher.stats()
+    assert ran == [] and (stats.completed, stats.throttled) == (1, 3)
+    assert stats.cpu_seconds >= 0.02
+
+
+def test_the_bucket_refills_at_the_budget_rate():
+    prefetcher = Prefetcher(workers=1, delay=0, cpu_budget=1.0, burst=0.01)
+    wait(prefetcher.schedule([lambda: busy(0.02)]))
+    time.sleep(0.05)
+    ran = []
+    wait(prefetcher.schedule([lambda: ran.append(1)]))
+    assert ran == [1]
+
+
+def test_failures_are_counted_and_not_raised():
+    prefetcher = Prefetcher(workers=1, delay=0)
+    wait(prefetcher.schedule([lambda: 1 / 0, lambda: None]))
+    stats = prefetcher.stats()
+    assert (stats.failed, stats.completed) == (1, 1)
+    prefetcher.record(True)
+    prefetcher.record(False)
+    assert prefetcher.stats().hit_rate == 0.5
+
+
+def test_neighbours_of_the_last_edit():
+    assert last_edited(None, [1, 2]) is None
+    assert last_edited([1, 2], [1, 2]) is None
+    assert neighbours([1, 2, 3], last_edited([1, 1, 3], [1, 2, 3]), 0.5) == [[1, 1.5, 3], [1, 2.5, 3]]
+
+
+def test_warming_fills_the_keys_the_page_reads():
+    cache = LRUCache()
+    system = [1, 1, 1, 1, 2, 1, 1, 2, 1, 2, 1, 3]
+    warm_plane_system(system, cache)
+    key, _ = canonical_system([system[0:4], system[4:8], system[8:12]])
+    assert "One" in cache.get(("solution", key))
+    assert ("planes", key) in cache
+    warm_plane_system(system, cache)
+    assert len(cache) == 2
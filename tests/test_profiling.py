@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from core.profiling import PROFILE_ENV, PROFILE_LOG_MB_ENV, Profile, append_log, profiling_requested
+
+
+@pytest.mark.parametrize(
+    "env, query, enabled",
+    [
+        ("", "1", False),
+        ("0", "1", False),
+        ("query", "1", True),
+        ("query", None, False),
+        ("1", None, True),
+    ],
+)
+def test_query_parameter_needs_the_operator_to_allow_it(monkeypatch, env, query, enabled):
+    monkeypatch.setenv(PROFILE_ENV, env)
+    assert profiling_requested(query) is enabled
+
+
+def test_log_is_rotated_at_its_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setenv(PROFILE_LOG_MB_ENV, str(1 / 1024))
+    path = tmp_path / "profile.jsonl"
+    for i in range(100):
+        append_log(Profile(f"run{i}"), str(path))
+    assert path.stat().st_size <= 1024
+    assert (tmp_path / "profile.jsonl.1").stat().st_size <= 1024
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["profile.jsonl", "profile.jsonl.1"]
+    assert json.loads(path.read_text().splitlines()[-1])["run"] == "run99"
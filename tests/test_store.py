@@ -0,0 +1,80 @@
+import json
+import multiprocessing
+
+import pytest
+
+from core.cache import canonical_system
+from core.store import LABEL_CODEC, STORE_ENV, SharedStore, shared, shared_store, store_key
+
+
+def label_in_child(path, key, value):
+    return SharedStore(path).get_or_compute(key, lambda: value, LABEL_CODEC)
+
+
+def test_get_or_compute_counts_hits_and_misses(tmp_path):
+    store = SharedStore(str(tmp_path / "store.sqlite"))
+    calls = []
+    for _ in range(3):
+        assert store.get_or_compute(("solution", 1), lambda: calls.append(1) or "one", LABEL_CODEC) == "one"
+    stats = store.stats()
+    assert (len(calls), stats.hits, stats.misses, stats.writes, stats.entries) == (1, 2, 1, 1, 1)
+
+
+def test_entries_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "store.sqlite")
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        assert pool.apply(label_in_child, (path, ("solution", 2), "from child")) == "from child"
+    assert SharedStore(path).get_or_compute(("solution", 2), lambda: "from parent", LABEL_CODEC) == "from child"
+
+
+def test_least_recently_read_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.store.TOUCH_INTERVAL", 0.0)
+    clock = iter(range(100))
+    monkeypatch.setattr("core.store.time.time", lambda: float(next(clock)))
+    store = SharedStore(str(tmp_path / "store.sqlite"), max_bytes=30)
+    for key in "abc":
+        store.put(key, b"x" * 10)
+    store.get("a")
+    store.put("d", b"x" * 10)
+    assert [store.get(key) is not None for key in "abcd"] == [True, False, True, True]
+    assert store.stats().nbytes == 30
+
+
+def test_oversized_values_are_not_stored(tmp_path):
+    store = SharedStore(str(tmp_path / "store.sqlite"), max_bytes=4)
+    assert store.get_or_compute("big", lambda: "too large", LABEL_CODEC) == "too large"
+    assert store.stats().entries == 0
+
+
+def test_unusable_file_falls_back_to_computing(tmp_path):
+    store = SharedStore(str(tmp_path))  # A directory cannot be opened as a database.
+    assert store.get_or_compute("key", lambda: "computed", LABEL_CODEC) == "computed"
+    assert store.stats().errors == 2
+
+
+def test_shared_uses_the_store_only_when_enabled(tmp_path, monkeypatch):
+    monkeypatch.delenv(STORE_ENV, raising=False)
+    assert shared_store() is None
+    assert shared("key", lambda: "one", LABEL_CODEC) == "one"
+    monkeypatch.setenv(STORE_ENV, str(tmp_path / "store.sqlite"))
+    assert shared("key", lambda: "two", LABEL_CODEC) == "two"
+    assert shared("key", lambda: "three", LABEL_CODEC) == "two"
+    assert shared_store().stats().hits == 1
+
+
+def test_close_systems_get_different_store_keys():
+    key, _ = canonical_system([[1, 1, 1, 1], [1, 1, 1, 1], [0, 0, 1, 0]])
+    close, _ = canonical_system([[1, 1, 1, 1], [1, 1, 1, 1.0000000000001], [0, 0, 1, 0]])
+    assert store_key(("solution", key)) != store_key(("solution", close))
+    assert eval(store_key(("solution", close))) == ("solution", close)
+
+
+def test_figures_round_trip():
+    pytest.importorskip("plotly")
+    from core.figures import plot_3_planes
+    from core.store import FIGURE_CODEC
+
+    fig = plot_3_planes(1, 1, 1, 6, 0, 2, 5, -4, 2, 5, -1, 27, "#5e17eb", "#ff3b3b", "#1BFF00", compact=True)
+    data = FIGURE_CODEC.encode(fig)
+    assert json.loads(FIGURE_CODEC.encode(FIGURE_CODEC.decode(data))) == json.loads(data)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from core.figures import PLANE_COLORS, plot_sweep
+from core.general import classify_system
+from core.geometry import clip_planes, triangulate_polygons
+from core.kinds import PLANE_LABELS
+from core.sweep import sweep_coefficient
+
+ONE_SOLUTION_SYSTEM = [1, 1, 1, 1, 2, 1, 1, 2, 1, 2, 1, 3]
+# det = 1, but the float ranks of these integers come out one short.
+ILL_CONDITIONED = [1, 0, 0, 1, 0, 1e8, 1e8 + 1, 1, 0, 1e8 - 1, 1e8, 1]
+
+
+def polygon_area(points):
+    return 0.5 * np.linalg.norm(sum(np.cross(points[i], points[(i + 1) % len(points)]) for i in range(len(points))))
+
+
+@pytest.mark.parametrize("index, values", [(0, np.arange(-3, 4)), (7, np.linspace(-2, 2, 9)), (10, [0, 1, 2])])
+def test_every_frame_matches_the_single_system_path(index, values):
+    sweep = sweep_coefficient(ONE_SOLUTION_SYSTEM, index, values)
+    assert len(sweep) == len(values)
+    for frame, value in enumerate(values):
+        system = np.array(ONE_SOLUTION_SYSTEM, dtype=float)
+        system[index] = value
+        np.testing.assert_array_equal(sweep.systems[frame], system.reshape(3, 4))
+        assert sweep.kind[frame] == classify_system(system.reshape(3, 4), method="auto")
+        vertices, counts = clip_planes(system.reshape(3, 4))
+        np.testing.assert_array_equal(sweep.counts[frame], counts)
+        np.testing.assert_array_equal(sweep.vertices[frame], vertices)
+
+
+def test_integer_frames_stay_exact_next_to_float_frames():
+    sweep = sweep_coefficient(ILL_CONDITIONED, 0, [1, 1.5])
+    assert sweep.kind.tolist() == [classify_system(system, method="auto") for system in sweep.systems]
+
+
+def test_changes_mark_the_frames_where_the_type_switches():
+    sweep = sweep_coefficient([1, 1, 1, 1, 1, 1, 1, 2, 1, 2, 1, 3], 7, [0, 1, 2, 3])
+    assert sweep.changes.tolist() == [False, True, True, False]
+
+
+@pytest.mark.parametrize("index", [-1, 12])
+def test_index_out_of_range_is_rejected(index):
+    with pytest.raises(ValueError):
+        sweep_coefficient(ONE_SOLUTION_SYSTEM, index, [0, 1])
+
+
+def test_triangulated_polygons_cover_each_polygon_once():
+    # A square, a hexagon, a plane missing the box and a triangle cutting off a corner.
+    planes = [[0, 0, 1, 0], [1, 1, 1, 0], [1, 0, 0, 20], [1, 1, 1, 27]]
+    vertices, counts = clip_planes(planes)
+    assert counts.tolist() == [4, 6, 0, 3]
+    points, triangles, owner = triangulate_polygons(vertices, counts)
+    assert len(points) == counts.sum()
+    assert owner.tolist() == [0] * 2 + [1] * 4 + [3]
+    first = np.cumsum(counts) - counts
+    for polygon in (0, 1, 3):
+        own = triangles[owner == polygon]
+        assert own.min() >= first[polygon] and own.max() < first[polygon] + counts[polygon]
+        area = sum(polygon_area(points[triangle]) for triangle in own)
+        np.testing.assert_allclose(area, polygon_area(vertices[polygon, :counts[polygon]]))
+
+
+def test_sweep_figure_has_a_frame_and_a_labelled_step_per_value():
+    values = np.arange(-1, 3)
+    fig = plot_sweep([1, 1, 1, 1, 1, 1, 1, 2, 1, 2, 1, 3], 7, values, *PLANE_COLORS)
+    sweep = sweep_coefficient([1, 1, 1, 1, 1, 1, 1, 2, 1, 2, 1, 3], 7, values)
+    assert len(fig.frames) == len(values)
+    assert [step["label"] for step in fig.layout.sliders[0].steps] == ["-1", "0", "◆ 1", "◆ 2"]
+    assert [frame.layout.title.text for frame in fig.frames] == [f"d2 = {v}: {PLANE_LABELS[k]}" for v, k in zip(values, sweep.kind)]
+    for frame, counts in zip(fig.frames, sweep.counts):
+        assert len(frame.data[0].i) == np.maximum(counts - 2, 0).sum()